@@ -0,0 +1,12 @@
+"""
+Benchmarks for the EX-HABridge protocol stack.
+
+The benchmarks import the Home Assistant independent client package
+(``custom_components/ex_habridge/excs``) on its own, so they run without
+Home Assistant installed.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[1] / "custom_components" / "ex_habridge"))
@@ -0,0 +1,81 @@
+"""
+Measure the setup of the client against a stand-in station, without Home Assistant.
+
+Every round creates a client, connects it and discovers the system info,
+roster, routes and turnouts of a stand-in station, then shuts it down.
+
+Run from the repository root:
+
+    python -m benchmarks.client_setup --locos 20 --turnouts 50 --rounds 20
+
+Use ``--latency-ms`` to delay the station like a WiFi link would, and
+``--cached`` to set up from the definitions discovered in the first round,
+like a restart with the definition cache does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from excs.excs_client import EXCSClient
+
+from .standin import StandInStation
+
+
+async def main(  # noqa: PLR0913
+    locos: int,
+    turnouts: int,
+    routes: int,
+    rounds: int,
+    latency_ms: float,
+    *,
+    cached: bool,
+) -> None:
+    """Set up clients one after another against the same stand-in station."""
+    station = StandInStation(locos, turnouts, routes, latency_ms / 1000)
+    server = await station.start()
+    port = server.sockets[0].getsockname()[1]
+
+    definitions = None
+    durations = []
+    for _ in range(rounds):
+        client = EXCSClient("127.0.0.1", port)
+        start = time.perf_counter()
+        await client.async_setup(definitions)
+        durations.append(time.perf_counter() - start)
+        if cached:
+            definitions = client.definitions
+        await client.async_shutdown()
+    if cached:
+        durations.pop(0)  # Discovered to fill the cache
+
+    print(
+        f"setup of {locos} locos, {turnouts} turnouts, {routes} routes: "
+        f"median {statistics.median(durations) * 1e3:7.2f} ms, "
+        f"max {max(durations) * 1e3:7.2f} ms"
+    )
+    await station.stop(server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locos", type=int, default=20)
+    parser.add_argument("--turnouts", type=int, default=50)
+    parser.add_argument("--routes", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--cached", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.locos,
+            args.turnouts,
+            args.routes,
+            args.rounds,
+            args.latency_ms,
+            cached=args.cached,
+        )
+    )
@@ -0,0 +1,123 @@
+"""
+Compare pushed message dispatch cost: broadcast versus opcode-indexed routing.
+
+The broadcast baseline mirrors the previous behavior, where every locomotive
+coordinator, turnout switch and the tracks power switch received each pushed
+message and filtered it with a ``startswith`` check.
+
+Run from the repository root:
+
+    python -m benchmarks.push_router --locos 120 --turnouts 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import TYPE_CHECKING
+
+from excs.commands import (
+    OPCODE_POWER,
+    OPCODE_THROTTLE,
+    OPCODE_TURNOUT_STATE,
+)
+from excs.messages import tokenize_message
+from excs.push_router import EXCSPushRouter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class _Counter:
+    """Count delivered messages so both strategies do comparable work."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.hits = 0
+
+    def hit(self, _message: object) -> None:
+        """Record a delivered message."""
+        self.hits += 1
+
+
+def _build_frames(locos: int, turnouts: int, count: int) -> list[str]:
+    """Build a burst of throttle, turnout and power messages."""
+    frames = []
+    for i in range(count):
+        match i % 3:
+            case 0:
+                frames.append(f"l {i % locos + 1} 0 130 0")
+            case 1:
+                frames.append(f"H {i % turnouts + 1} {i % 2}")
+            case _:
+                frames.append(f"p{i % 2}")
+    return frames
+
+
+def _broadcast_handlers(
+    locos: int, turnouts: int, counter: _Counter
+) -> list[Callable[[str], None]]:
+    """Create per-entity handlers that filter every message themselves."""
+
+    def loco_handler(prefix: str) -> Callable[[str], None]:
+        def handle(message: str) -> None:
+            if message.startswith(prefix):
+                counter.hit(message)
+
+        return handle
+
+    def power_handler(message: str) -> None:
+        if message in {"p0", "p1"}:
+            counter.hit(message)
+
+    handlers = [loco_handler(f"l {cab}") for cab in range(1, locos + 1)]
+    handlers += [loco_handler(f"H {tid}") for tid in range(1, turnouts + 1)]
+    handlers.append(power_handler)
+    return handlers
+
+
+def bench_broadcast(frames: list[str], locos: int, turnouts: int) -> tuple[float, int]:
+    """Deliver every frame to every handler."""
+    counter = _Counter()
+    handlers = _broadcast_handlers(locos, turnouts, counter)
+    start = time.perf_counter()
+    for frame in frames:
+        for handler in handlers:
+            handler(frame)
+    return time.perf_counter() - start, counter.hits
+
+
+def bench_router(frames: list[str], locos: int, turnouts: int) -> tuple[float, int]:
+    """Tokenize every frame once and deliver it through the router."""
+    counter = _Counter()
+    router = EXCSPushRouter()
+    for cab in range(1, locos + 1):
+        router.subscribe(OPCODE_THROTTLE, counter.hit, cab)
+    for tid in range(1, turnouts + 1):
+        router.subscribe(OPCODE_TURNOUT_STATE, counter.hit, tid)
+    router.subscribe(OPCODE_POWER, counter.hit)
+    start = time.perf_counter()
+    for frame in frames:
+        router.dispatch(tokenize_message(frame))
+    return time.perf_counter() - start, counter.hits
+
+
+def main() -> None:
+    """Run the benchmark and print the per-frame dispatch cost."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locos", type=int, default=120)
+    parser.add_argument("--turnouts", type=int, default=300)
+    parser.add_argument("--frames", type=int, default=30000)
+    args = parser.parse_args()
+
+    frames = _build_frames(args.locos, args.turnouts, args.frames)
+    for name, bench in (("broadcast", bench_broadcast), ("router", bench_router)):
+        elapsed, hits = bench(frames, args.locos, args.turnouts)
+        print(
+            f"{name:>9}: {elapsed / len(frames) * 1e6:8.2f} us/frame "
+            f"({len(frames) / elapsed:10.0f} frames/s, {hits} deliveries)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Replay recorded wire traffic through a client, without Home Assistant.
+
+Without a recording, a session is first recorded against a stand-in
+station: the client is set up, then drives every loco through a series of
+speed steps and throws the turnouts. The received frames are then replayed
+through a fresh, unconnected client at maximum speed and at the recorded
+speed, counting the pushed updates that would become state writes.
+
+Run from the repository root:
+
+    python -m benchmarks.replay --steps 20
+    python -m benchmarks.replay --recording /config/ex_habridge_20260101.excsrec
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from excs.excs_client import EXCSClient
+from excs.wire_recording import EXCSReplayStats, read_recording, replay_recording
+
+if TYPE_CHECKING:
+    from excs.messages import EXCSMessage
+    from excs.wire_trace import EXCSWireDirection
+
+from .standin import StandInStation
+
+PUSHED_OPCODES = ("l", "H", "p")
+PORT = 2560  # Replaying clients never connect
+
+
+async def record_session(path: Path, locos: int, turnouts: int, steps: int) -> None:
+    """Record the setup and a throttle session against a stand-in station."""
+    station = StandInStation(locos, turnouts)
+    server = await station.start()
+    port = server.sockets[0].getsockname()[1]
+
+    client = EXCSClient("127.0.0.1", port)
+    await client.start_recording(path)
+    await client.async_setup()
+    for step in range(steps):
+        for cab in station.roster:
+            await client.send_command(f"t {cab} {step * 6} 1")
+        for tid in station.turnouts:
+            await client.send_command(f"T {tid} {step % 2}")
+        await asyncio.sleep(0.01)
+    frames = await client.stop_recording()
+    await client.async_shutdown()
+    await station.stop(server)
+    print(f"recorded {frames} frames to {path}")
+
+
+async def replay_once(
+    records: list[tuple[float, EXCSWireDirection, str]], speed: float
+) -> tuple[EXCSReplayStats, int]:
+    """Replay the records through a fresh client and count the pushed updates."""
+    client = EXCSClient("127.0.0.1", PORT)
+    pushed = 0
+
+    def count_pushed(message: EXCSMessage) -> None:  # noqa: ARG001
+        nonlocal pushed
+        pushed += 1
+
+    for opcode in PUSHED_OPCODES:
+        client.register_push_handler(opcode, count_pushed)
+    stats = await replay_recording(client, records, speed)
+    return stats, pushed
+
+
+async def replay(path: Path, speeds: list[float]) -> None:
+    """Replay the received frames of a recording at each of the speeds."""
+    records = await asyncio.get_running_loop().run_in_executor(
+        None, read_recording, path
+    )
+    for speed in speeds:
+        stats, pushed = await replay_once(records, speed)
+        label = f"{speed:g}x" if speed else "max"
+        print(f"{label:>5}: {asdict(stats)}, pushed updates {pushed}")
+
+
+async def main(recording: Path | None, locos: int, turnouts: int, steps: int) -> None:
+    """Record a session if no recording is given, then replay it."""
+    if recording is not None:
+        await replay(recording, [0, 1])
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.excsrec"
+        await record_session(path, locos, turnouts, steps)
+        await replay(path, [0, 1, 10])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recording", type=Path)
+    parser.add_argument("--locos", type=int, default=20)
+    parser.add_argument("--turnouts", type=int, default=50)
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.recording, args.locos, args.turnouts, args.steps))
@@ -0,0 +1,95 @@
+"""
+Measure the state resync after reconnecting, without Home Assistant.
+
+A client is set up against a stand-in station, then every round changes the
+speed of every loco and the state of every turnout on the station while
+dropping the connection. The client reconnects and resyncs the states in
+one pass; the round checks that every loco and turnout is current.
+
+Run from the repository root:
+
+    python -m benchmarks.resync --locos 120 --turnouts 200 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+
+from excs.commands import OPCODE_THROTTLE
+from excs.const import SIGNAL_RESYNCED
+from excs.excs_client import EXCSClient
+from excs.turnout import EXCSTurnoutState
+
+from .standin import StandInStation
+
+
+def stale_objects(
+    client: EXCSClient, station: StandInStation, throttles: dict[int, str]
+) -> list[str]:
+    """Return the locos and turnouts whose state differs from the station."""
+    stale = [
+        f"loco {cab}"
+        for cab in station.roster
+        if throttles.get(cab) != station._throttle_state(cab)  # noqa: SLF001
+    ]
+    stale.extend(
+        f"turnout {turnout.id}"
+        for turnout in client.turnouts
+        if (turnout.state == EXCSTurnoutState.THROWN)
+        != bool(station.turnouts[turnout.id])
+    )
+    return stale
+
+
+async def main(locos: int, turnouts: int, rounds: int, latency_ms: float) -> None:
+    """Drop the connection of a set up client and time the resyncs."""
+    station = StandInStation(locos, turnouts, 0, latency_ms / 1000)
+    server = await station.start()
+    port = server.sockets[0].getsockname()[1]
+
+    client = EXCSClient("127.0.0.1", port)
+    await client.async_setup()
+    throttles: dict[int, str] = {}
+    for cab in station.roster:
+        client.register_push_handler(
+            OPCODE_THROTTLE,
+            lambda message: throttles.__setitem__(message.args[0], message.raw),
+            cab,
+        )
+    resynced = asyncio.Event()
+    client.register_signal_handler(SIGNAL_RESYNCED, resynced.set)
+
+    durations = []
+    for _ in range(rounds):
+        resynced.clear()
+        for cab in station.roster:
+            station.speed_bytes[cab] = random.randrange(256)  # noqa: S311
+        for tid in station.turnouts:
+            station.turnouts[tid] = random.randrange(2)  # noqa: S311
+        for writer in list(station.clients):
+            writer.close()
+        await asyncio.wait_for(resynced.wait(), 30)
+        durations.append(client.resync.last_duration_s)
+        if stale := stale_objects(client, station, throttles):
+            print(f"stale after resync: {', '.join(stale)}")
+
+    print(
+        f"resync of {locos} locos and {turnouts} turnouts: "
+        f"median {statistics.median(durations) * 1e3:7.2f} ms, "
+        f"max {max(durations) * 1e3:7.2f} ms, {client.resync.stats}"
+    )
+    await client.async_shutdown()
+    await station.stop(server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locos", type=int, default=120)
+    parser.add_argument("--turnouts", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    asyncio.run(main(args.locos, args.turnouts, args.rounds, args.latency_ms))
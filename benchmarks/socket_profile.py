@@ -0,0 +1,86 @@
+"""
+Measure command-to-echo latency with and without the low-latency socket profile.
+
+Every round sends an accessory command the station does not answer, followed
+in the next event loop iteration by a throttle command, and times the
+throttle echo from the stand-in station. Without ``TCP_NODELAY`` the second
+write waits for the acknowledgement of the first one (Nagle's algorithm),
+which the peer may delay. asyncio already enables ``TCP_NODELAY`` on its TCP
+transports, so the ``nagle`` run shows a plain socket for reference.
+
+Run from the repository root:
+
+    python -m benchmarks.socket_profile --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+
+from excs.socket_profile import (
+    EXCSSocketProfile,
+    apply_socket_profile,
+)
+from excs.stream_protocol import EXCSStreamProtocol
+
+from .standin import StandInStation
+
+IDLE_TIMEOUT = 150.0
+
+
+async def bench_profile(port: int, profile: str, rounds: int) -> list[float]:
+    """Return the command-to-echo latencies of one socket setup in seconds."""
+    loop = asyncio.get_running_loop()
+    echo: asyncio.Future[None] | None = None
+
+    def on_frame(frame: str) -> None:
+        if echo is not None and not echo.done() and frame.startswith("l 1 "):
+            echo.set_result(None)
+
+    transport, protocol = await loop.create_connection(
+        lambda: EXCSStreamProtocol(on_frame, IDLE_TIMEOUT), "127.0.0.1", port
+    )
+    sock = transport.get_extra_info("socket")
+    if profile == "nagle":
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+    else:
+        apply_socket_profile(sock, EXCSSocketProfile(profile))
+
+    latencies = []
+    for i in range(rounds):
+        echo = loop.create_future()
+        protocol.write(b"<a 10 1 1>\n")
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        protocol.write(f"<t 1 {i % 126} 1>\n".encode())
+        await echo
+        latencies.append(time.perf_counter() - start)
+
+    protocol.close()
+    return latencies
+
+
+async def main(rounds: int) -> None:
+    """Run every socket setup against the same stand-in station."""
+    station = StandInStation()
+    server = await station.start()
+    port = server.sockets[0].getsockname()[1]
+    for profile in ("nagle", *EXCSSocketProfile):
+        latencies = await bench_profile(port, profile, rounds)
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{profile:>11}: p50 {quantiles[49] * 1e6:8.1f} us, "
+            f"p99 {quantiles[98] * 1e6:8.1f} us, "
+            f"max {max(latencies) * 1e6:8.1f} us"
+        )
+    await station.stop(server)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=200)
+    asyncio.run(main(parser.parse_args().rounds))
@@ -0,0 +1,244 @@
+"""
+Stand-in EX-CommandStation for benchmarks and manual testing.
+
+Answers the subset of the DCC-EX protocol used by the integration: system
+info, roster, turnouts, routes, throttles, turnout and power commands and the
+keep-alive. Throttle, turnout and power changes are broadcast to all
+connected clients, like the real station does. Unknown commands (and
+commands the station does not answer, such as ``<a ...>`` accessories) are
+ignored.
+
+Run from the repository root to serve on the default port:
+
+    python -m benchmarks.standin --port 2560 --locos 10 --turnouts 20
+
+or, on Linux and macOS, to serve a pseudo-terminal standing in for the USB
+serial port of the station (the device path to configure is printed):
+
+    python -m benchmarks.standin --pty
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import os
+import tty
+from typing import Protocol
+
+LOCO_SLOTS = 50
+
+
+class _FrameWriter(Protocol):
+    """Connection the station writes frames to."""
+
+    def write(self, data: bytes) -> None:
+        """Write data to the connection."""
+
+
+class _PtyWriter:
+    """Writer to the controlling side of a pseudo-terminal."""
+
+    def __init__(self, fd: int) -> None:
+        """Initialize the writer with the file descriptor of the pty master."""
+        self.fd = fd
+
+    def write(self, data: bytes) -> None:
+        """Write data to the pty, dropping it when nobody reads the device."""
+        with contextlib.suppress(BlockingIOError):
+            os.write(self.fd, data)
+
+
+class StandInStation:
+    """State and command handling of the stand-in station."""
+
+    def __init__(
+        self, locos: int = 3, turnouts: int = 3, routes: int = 1, latency: float = 0.0
+    ) -> None:
+        """
+        Initialize the station with numbered locos, turnouts and routes.
+
+        ``latency`` delays the handling of data received over TCP by that many
+        seconds, like a slow (e.g. WiFi) link would.
+        """
+        self.latency = latency
+        self.roster = {cab: f"Loco {cab}" for cab in range(1, locos + 1)}
+        self.turnouts = dict.fromkeys(range(1, turnouts + 1), 0)
+        self.routes = list(range(100, 100 + routes))
+        self.speed_bytes = dict.fromkeys(self.roster, 128)  # Stopped, forward
+        self.power = 0
+        self.clients: set[_FrameWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._pty_slaves: dict[int, int] = {}
+
+    def reply(self, command: str) -> tuple[list[str], list[str]]:  # noqa: PLR0911, PLR0912
+        """Return the replies to the sender and the broadcasts for a command."""
+        tokens = command.split()
+        if not tokens:
+            return [], []
+        match tokens:
+            case ["s"]:
+                return [f"p{self.power}", "iDCC-EX V-5.4.8 / STANDIN / NONE G-0"], []
+            case ["#"]:
+                return [f"# {LOCO_SLOTS}"], []
+            case ["JR"]:
+                return [" ".join(["jR", *map(str, self.roster)])], []
+            case ["JR", cab]:
+                if int(cab) not in self.roster:
+                    return ["X"], []
+                return [f'jR {cab} "{self.roster[int(cab)]}" "Lights/*Horn"'], []
+            case ["JT"]:
+                return [" ".join(["jT", *map(str, self.turnouts)])], []
+            case ["JT", tid]:
+                if int(tid) not in self.turnouts:
+                    return ["X"], []
+                return [f'jT {tid} {"CT"[self.turnouts[int(tid)]]} "T{tid}"'], []
+            case ["J", "A"]:
+                return [" ".join(["jA", *map(str, self.routes)])], []
+            case ["J", "A", rid]:
+                return [f'jA {rid} R "Route {rid}"'], []
+            case ["t", cab]:
+                return [self._throttle_state(int(cab))], []
+            case ["t", cab, speed, direction]:
+                self.speed_bytes[int(cab)] = (int(speed) + 1 if int(speed) else 0) + (
+                    128 * int(direction)
+                )
+                return [], [self._throttle_state(int(cab))]
+            case ["T", tid, state]:
+                self.turnouts[int(tid)] = int(state in {"1", "T"})
+                return [], [f"H {tid} {self.turnouts[int(tid)]}"]
+            case ["1" | "0" as power]:
+                self.power = int(power)
+                return [], [f"p{power}"]
+            case ["!"]:
+                for cab, speed_byte in self.speed_bytes.items():
+                    self.speed_bytes[cab] = (speed_byte & 0x80) | 1
+                return [], []
+        return [], []
+
+    def _throttle_state(self, cab: int) -> str:
+        """Return the throttle state frame of a cab."""
+        return f"l {cab} 0 {self.speed_bytes.get(cab, 128)} 0"
+
+    def process(self, buffer: bytes, writer: _FrameWriter) -> bytes:
+        """Handle the complete frames in the buffer and return the remainder."""
+        while (start := buffer.find(b"<")) != -1 and (
+            end := buffer.find(b">", start)
+        ) != -1:
+            command = buffer[start + 1 : end].decode("ascii", "replace")
+            buffer = buffer[end + 1 :]
+            replies, broadcasts = self.reply(command)
+            if replies:
+                writer.write("".join(f"<{reply}>\n" for reply in replies).encode())
+            if broadcasts:
+                frames = "".join(f"<{frame}>\n" for frame in broadcasts).encode()
+                for client in self.clients:
+                    client.write(frames)
+        return buffer
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client connection."""
+        self.clients.add(writer)
+        if (task := asyncio.current_task()) is not None:
+            self._handlers.add(task)
+        buffer = b""
+        try:
+            while data := await reader.read(4096):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                buffer = self.process(buffer + data, writer)
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            if task is not None:
+                self._handlers.discard(task)
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Start serving and return the server."""
+        return await asyncio.start_server(self.handle, host, port)
+
+    def open_pty(self) -> tuple[int, str]:
+        """
+        Serve a new pseudo-terminal and return its master fd and device path.
+
+        The device path is opened by the client like a serial port. The pty
+        is kept open when the client disconnects, so it can reconnect.
+        """
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        os.set_blocking(master, False)
+        writer = _PtyWriter(master)
+        self.clients.add(writer)
+        buffer = b""
+
+        def read() -> None:
+            nonlocal buffer
+            with contextlib.suppress(BlockingIOError):
+                buffer = self.process(buffer + os.read(master, 4096), writer)
+
+        asyncio.get_running_loop().add_reader(master, read)
+        # Keep the slave side open; the master reports EIO once it is closed
+        self._pty_slaves[master] = slave
+        return master, os.ttyname(slave)
+
+    def close_pty(self, master: int) -> None:
+        """Stop serving a pseudo-terminal opened by ``open_pty``."""
+        asyncio.get_running_loop().remove_reader(master)
+        self.clients = {
+            client
+            for client in self.clients
+            if not (isinstance(client, _PtyWriter) and client.fd == master)
+        }
+        os.close(self._pty_slaves.pop(master))
+        os.close(master)
+
+    async def stop(self, server: asyncio.Server) -> None:
+        """Stop serving and close all client connections."""
+        server.close()
+        for writer in list(self.clients):
+            if isinstance(writer, asyncio.StreamWriter):
+                writer.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers)
+        await server.wait_closed()
+
+
+async def main() -> None:
+    """Serve the stand-in station until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2560)
+    parser.add_argument("--locos", type=int, default=3)
+    parser.add_argument("--turnouts", type=int, default=3)
+    parser.add_argument("--routes", type=int, default=1)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0, help="delay of data received over TCP"
+    )
+    parser.add_argument(
+        "--pty", action="store_true", help="serve a pseudo-terminal instead of TCP"
+    )
+    args = parser.parse_args()
+
+    station = StandInStation(
+        args.locos, args.turnouts, args.routes, args.latency_ms / 1000
+    )
+    if args.pty:
+        _, device = station.open_pty()
+        print(f"Stand-in EX-CommandStation serving serial device {device}")
+        await asyncio.Event().wait()
+        return
+
+    server = await station.start(args.host, args.port)
+    print(f"Stand-in EX-CommandStation listening on {args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
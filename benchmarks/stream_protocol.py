@@ -0,0 +1,90 @@
+"""
+Compare frame throughput: per-line readline loop versus the streaming protocol.
+
+A loopback server streams throttle frames, one per line. The readline path
+mirrors the previous ``handle_stream`` implementation, wrapping every
+``readline`` in ``asyncio.wait_for`` and decoding/stripping each line.
+
+Run from the repository root:
+
+    python -m benchmarks.stream_protocol --frames 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from excs.stream_protocol import EXCSStreamProtocol
+
+IDLE_TIMEOUT = 150.0
+
+
+async def _serve(frames: int) -> asyncio.Server:
+    """Start a server sending the given number of frames to every client."""
+    payload = b"".join(
+        f"<l {i % 120 + 1} 0 {130 + i % 100} 0>\n".encode() for i in range(frames)
+    )
+
+    async def handle(
+        _reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        writer.write(payload)
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def bench_readline(port: int) -> tuple[float, int]:
+    """Receive frames with a timed readline per message."""
+    received = 0
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    start = time.perf_counter()
+    while not reader.at_eof():
+        line = await asyncio.wait_for(reader.readline(), timeout=IDLE_TIMEOUT)
+        if not line:
+            break
+        message = line.decode("ascii").strip()
+        if message.startswith("<") and message.endswith(">"):
+            received += 1
+    elapsed = time.perf_counter() - start
+    writer.close()
+    return elapsed, received
+
+
+async def bench_protocol(port: int) -> tuple[float, int]:
+    """Receive frames through the streaming protocol."""
+    received = 0
+
+    def on_frame(_frame: str) -> None:
+        nonlocal received
+        received += 1
+
+    loop = asyncio.get_running_loop()
+    _, protocol = await loop.create_connection(
+        lambda: EXCSStreamProtocol(on_frame, IDLE_TIMEOUT), "127.0.0.1", port
+    )
+    start = time.perf_counter()
+    await protocol.wait_closed()
+    return time.perf_counter() - start, received
+
+
+async def main(frames: int) -> None:
+    """Run both receive paths against the same server."""
+    server = await _serve(frames)
+    port = server.sockets[0].getsockname()[1]
+    for name, bench in (("readline", bench_readline), ("protocol", bench_protocol)):
+        elapsed, received = await bench(port)
+        print(
+            f"{name:>8}: {received / elapsed:10.0f} frames/s "
+            f"({received} frames in {elapsed:.3f} s)"
+        )
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200000)
+    asyncio.run(main(parser.parse_args().frames))
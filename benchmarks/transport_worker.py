@@ -0,0 +1,123 @@
+"""
+Compare reading the station connection in-process and in a transport worker.
+
+The stand-in station runs in its own thread and event loop, so only the
+client side shares the measured loop. Every run sends throttle commands in
+batches and waits until all their echoes arrived, while a ticker task
+measures how late the event loop wakes it up (event loop lag). With the
+worker the loop only reads pre-split frames from a pipe; in-process it also
+reads the socket and scans the stream for frames.
+
+Run from the repository root:
+
+    python -m benchmarks.transport_worker --frames 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import threading
+import time
+
+from excs.connectors import (
+    EXCSConnector,
+    EXCSTcpConnector,
+    EXCSWorkerConnector,
+)
+from excs.stream_protocol import EXCSStreamProtocol
+
+from .standin import StandInStation
+
+IDLE_TIMEOUT = 150.0
+CONNECT_TIMEOUT = 10.0
+BATCH_SIZE = 100
+TICK_INTERVAL = 0.001
+
+
+def start_station() -> tuple[asyncio.AbstractEventLoop, int]:
+    """Start the stand-in station in a thread and return its loop and port."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    port = 0
+
+    def run() -> None:
+        nonlocal port
+        server = loop.run_until_complete(StandInStation().start())
+        port = server.sockets[0].getsockname()[1]
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return loop, port
+
+
+async def bench_connector(
+    connector: EXCSConnector, frames: int
+) -> tuple[float, list[float]]:
+    """Return the frame rate and the event loop lags of one connector."""
+    loop = asyncio.get_running_loop()
+    received = 0
+    done = loop.create_future()
+
+    def on_frame(frame: str) -> None:
+        nonlocal received
+        if frame.startswith("l 1 "):
+            received += 1
+            if received == frames and not done.done():
+                done.set_result(None)
+
+    protocol = await connector.open(
+        lambda: EXCSStreamProtocol(on_frame, IDLE_TIMEOUT), CONNECT_TIMEOUT
+    )
+
+    lags: list[float] = []
+
+    async def tick() -> None:
+        while True:
+            expected = loop.time() + TICK_INTERVAL
+            await asyncio.sleep(TICK_INTERVAL)
+            lags.append(loop.time() - expected)
+
+    ticker = asyncio.create_task(tick())
+    start = time.perf_counter()
+    for sent in range(0, frames, BATCH_SIZE):
+        batch = range(sent, min(sent + BATCH_SIZE, frames))
+        protocol.write(b"".join(f"<t 1 {i % 126} 1>".encode() for i in batch))
+        await protocol.drain()
+        await asyncio.sleep(0)
+    await done
+    elapsed = time.perf_counter() - start
+
+    ticker.cancel()
+    protocol.close()
+    with contextlib.suppress(ConnectionError):
+        await protocol.wait_closed()
+    return frames / elapsed, lags
+
+
+async def main(frames: int) -> None:
+    """Run both modes against the same stand-in station."""
+    station_loop, port = start_station()
+    for name, connector in (
+        ("in-process", EXCSTcpConnector("127.0.0.1", port)),
+        ("worker", EXCSWorkerConnector("127.0.0.1", port)),
+    ):
+        rate, lags = await bench_connector(connector, frames)
+        quantiles = statistics.quantiles(lags, n=100)
+        print(
+            f"{name:>10}: {rate:9.0f} frames/s, loop lag "
+            f"p50 {quantiles[49] * 1e3:6.2f} ms, "
+            f"p99 {quantiles[98] * 1e3:6.2f} ms, "
+            f"max {max(lags) * 1e3:6.2f} ms"
+        )
+    station_loop.call_soon_threadsafe(station_loop.stop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=50000)
+    asyncio.run(main(parser.parse_args().frames))
@@ -0,0 +1,55 @@
+"""
+Compare the per-frame cost of the wire trace with debug logging of every frame.
+
+The logging run writes through a stream handler to a temporary file, like a
+file log with debug enabled.
+
+Run from the repository root:
+
+    python -m benchmarks.wire_trace --frames 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import time
+
+from excs.wire_trace import EXCSWireDirection, EXCSWireTrace
+
+FRAME = "l 3 0 179 0"
+
+
+def bench_trace(frames: int) -> float:
+    """Return the time per frame of the wire trace in seconds."""
+    trace = EXCSWireTrace(1000)
+    start = time.perf_counter()
+    for _ in range(frames):
+        trace.record(EXCSWireDirection.RX, FRAME)
+    return (time.perf_counter() - start) / frames
+
+
+def bench_logging(frames: int) -> float:
+    """Return the time per frame of debug logging to a file in seconds."""
+    logger = logging.getLogger("benchmarks.wire_trace")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    with tempfile.TemporaryFile("w") as log_file:
+        handler = logging.StreamHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        start = time.perf_counter()
+        for _ in range(frames):
+            logger.debug("Received message: <%s>", FRAME)
+        elapsed = time.perf_counter() - start
+        logger.removeHandler(handler)
+    return elapsed / frames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=200000)
+    frames = parser.parse_args().frames
+    for name, bench in (("trace", bench_trace), ("logging", bench_logging)):
+        print(f"{name:>7}: {bench(frames) * 1e9:8.0f} ns/frame")
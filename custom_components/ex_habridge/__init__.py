@@ -7,20 +7,42 @@ https://github.com/SenMorgan/EX-HABridge
 
 from __future__ import annotations
 
-from asyncio import gather
+import asyncio
+from functools import partial, wraps
 from typing import TYPE_CHECKING
 
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.const import Platform
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import (
+    ConfigEntryError,
+    HomeAssistantError,
+    ServiceValidationError,
+)
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import issue_registry as ir
 
-from .const import DOMAIN
+from .client_handoff import async_claim_client
+from .const import DOMAIN, LOGGER, SIGNAL_READY
 from .coordinator import LocoUpdateCoordinator
-from .excs_client import EXCSClient
-from .excs_exceptions import EXCSConnectionError, EXCSError, EXCSVersionError
+from .definition_cache import EXCSDefinitionCache
+from .excs.const import MIN_SUPPORTED_VERSION
+from .excs.excs_exceptions import (
+    EXCSConnectionError,
+    EXCSError,
+    EXCSValueError,
+    EXCSVersionError,
+)
+from .excs.excs_options import EXCSClientOptions
+from .excs.reconnect_backoff import EXCSReconnectBackoff
+from .excs_client import EXCSHassClient
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from homeassistant.config_entries import ConfigEntry
-    from homeassistant.core import HomeAssistant
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    ServiceHandler = Callable[[ServiceCall], Awaitable[ServiceResponse]]
 
 
 PLATFORMS: list[Platform] = [
@@ -33,54 +55,195 @@ PLATFORMS: list[Platform] = [
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up EX-CommandStation from a config entry."""
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
-
-    try:
-        client = EXCSClient(hass, host, port, entry.entry_id)
-        await client.async_setup()
-    except (EXCSConnectionError, TimeoutError) as err:
-        if client:
-            await client.async_shutdown()
-        raise ConfigEntryNotReady from err
-    except EXCSVersionError as err:
-        if client:
-            await client.async_shutdown()
-        raise ConfigEntryError from err
-    except EXCSError as err:
-        if client:
-            await client.async_shutdown()
-        msg = f"Unexpected error: {err}"
-        raise ConfigEntryError(msg) from err
+    """
+    Set up EX-CommandStation from a config entry.
 
-    # Create and initialize coordinators for each locomotive
-    coordinators = {
-        loco.id: LocoUpdateCoordinator(hass, client, loco)
-        for loco in client.roster_entries
-    }
-    await gather(
-        *(
-            coordinator.async_config_entry_first_refresh()
-            for coordinator in coordinators.values()
-        )
-    )
+    The entry is set up without waiting for the station: the platforms add
+    the station entities right away, unavailable until the client is ready,
+    and the connection and discovery run in a background task. The entities
+    of the roster entries, routes and turnouts are added when it is done.
+    """
+    # Adopt the client connected by the config flow that created the entry
+    options = EXCSClientOptions.from_entry_options(entry.options)
+    client = async_claim_client(hass, entry, options)
+    if client is None:
+        try:
+            client = EXCSHassClient.from_config(
+                hass, entry.data, entry.entry_id, options
+            )
+        except EXCSError as err:
+            msg = f"Unexpected error: {err}"
+            raise ConfigEntryError(msg) from err
 
-    # Store client and coordinators in hass data
+    # Store client and coordinators in hass data; the coordinators are
+    # created once the roster is known
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "client": client,
-        "coordinators": coordinators,
+        "coordinators": {},
     }
 
     # Load platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Record the firmware version on the station device once it is known
+    entry.async_on_unload(
+        client.register_signal_handler(
+            SIGNAL_READY, partial(_async_update_firmware_version, hass, client)
+        )
+    )
+
+    # Connect and discover the station in the background
+    entry.async_create_background_task(
+        hass, _async_start_client(hass, entry, client), "EXCS client setup"
+    )
+
     # Register services
-    hass.services.async_register(DOMAIN, "write_cv", client.handle_write_cv)
+    hass.services.async_register(
+        DOMAIN, "write_cv", _raise_as_hass_errors(client.handle_write_cv)
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "dump_wire_trace",
+        _raise_as_hass_errors(client.handle_dump_wire_trace),
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "start_recording",
+        _raise_as_hass_errors(client.handle_start_recording),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "stop_recording",
+        _raise_as_hass_errors(client.handle_stop_recording),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "replay_recording",
+        _raise_as_hass_errors(client.handle_replay_recording),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    # Reload the entry when its options change
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+def _raise_as_hass_errors(handler: ServiceHandler) -> ServiceHandler:
+    """Wrap a service handler to raise client errors as Home Assistant errors."""
+
+    @wraps(handler)
+    async def handle(call: ServiceCall) -> ServiceResponse:
+        try:
+            return await handler(call)
+        except EXCSValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        except EXCSError as err:
+            raise HomeAssistantError(str(err)) from err
+
+    return handle
+
+
+async def _async_start_client(
+    hass: HomeAssistant, entry: ConfigEntry, client: EXCSHassClient
+) -> None:
+    """Set up the client in the background, logging unexpected errors."""
+    try:
+        await _async_set_up_client(hass, entry, client)
+    except Exception:  # noqa: BLE001
+        LOGGER.exception("Unexpected error setting up EX-CommandStation")
+
+
+async def _async_set_up_client(
+    hass: HomeAssistant, entry: ConfigEntry, client: EXCSHassClient
+) -> None:
+    """
+    Set up the client until it succeeds, then announce that it is ready.
+
+    Connection failures are retried with backoff while the client keeps
+    reconnecting on its own. An unsupported station version is not retried
+    and is raised as a repair issue.
+    """
+    cache = EXCSDefinitionCache(hass, entry, client.host)
+    backoff = EXCSReconnectBackoff()
+    while True:
+        try:
+            await client.async_setup(await cache.async_load())
+            break
+        except (EXCSConnectionError, TimeoutError) as err:
+            delay = backoff.next_delay()
+            LOGGER.warning(
+                "EX-CommandStation is not reachable (%s), retrying in %.1f seconds",
+                err or "timeout",
+                delay,
+            )
+            await asyncio.sleep(delay)
+        except EXCSVersionError as err:
+            LOGGER.error("EX-CommandStation cannot be used: %s", err)
+            await client.async_shutdown()
+            ir.async_create_issue(
+                hass,
+                DOMAIN,
+                _unsupported_version_issue_id(entry),
+                is_fixable=False,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="unsupported_version",
+                translation_placeholders={
+                    "title": entry.title,
+                    "version": client.system_info.version or "unknown",
+                    "min_version": ".".join(map(str, MIN_SUPPORTED_VERSION)),
+                },
+            )
+            return
+        except EXCSError as err:
+            delay = backoff.next_delay()
+            LOGGER.error(
+                "Error setting up EX-CommandStation: %s, retrying in %.1f seconds",
+                err,
+                delay,
+            )
+            await asyncio.sleep(delay)
+    ir.async_delete_issue(hass, DOMAIN, _unsupported_version_issue_id(entry))
+
+    # Create and initialize coordinators for each locomotive
+    coordinators: dict[int, LocoUpdateCoordinator] = hass.data[DOMAIN][entry.entry_id][
+        "coordinators"
+    ]
+    coordinators.update(
+        (loco.id, LocoUpdateCoordinator(hass, client, loco))
+        for loco in client.roster_entries
+    )
+    await asyncio.gather(
+        *(coordinator.async_start() for coordinator in coordinators.values())
+    )
+
+    # Let the platforms add the entities of the discovered objects
+    client.set_ready()
+
+    # Check cached definitions against the station, or cache the discovered ones
+    if client.definitions_cached:
+        await cache.async_revalidate(client)
+    else:
+        await cache.async_save(client.definitions)
+
+
+def _unsupported_version_issue_id(entry: ConfigEntry) -> str:
+    """Return the ID of the repair issue of an unsupported station version."""
+    return f"unsupported_version_{entry.entry_id}"
+
+
+@callback
+def _async_update_firmware_version(hass: HomeAssistant, client: EXCSHassClient) -> None:
+    """Set the firmware version of the station on its device."""
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(identifiers={(DOMAIN, client.host)}):
+        device_registry.async_update_device(
+            device.id, sw_version=client.system_info.version
+        )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     # Get data from hass.data
@@ -88,11 +251,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not data:
         return True
 
-    client: EXCSClient = data["client"]
+    client: EXCSHassClient = data["client"]
     coordinators: dict[int, LocoUpdateCoordinator] = data["coordinators"]
 
     # Unregister services
     hass.services.async_remove(DOMAIN, "write_cv")
+    hass.services.async_remove(DOMAIN, "dump_wire_trace")
+    hass.services.async_remove(DOMAIN, "start_recording")
+    hass.services.async_remove(DOMAIN, "stop_recording")
+    hass.services.async_remove(DOMAIN, "replay_recording")
 
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -111,6 +278,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached definitions and the repair issues of a removed entry."""
+    await EXCSDefinitionCache(hass, entry, "").async_remove()
+    ir.async_delete_issue(hass, DOMAIN, _unsupported_version_issue_id(entry))
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -2,22 +2,24 @@
 
 from __future__ import annotations
 
+import time
 from typing import TYPE_CHECKING
 
 from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.core import callback
 
-from .commands import EMERGENCY_STOP, REBOOT
 from .const import DOMAIN, LOGGER
-from .entity import EXCSEntity
-from .excs_client import EXCSError
-from .route import EXCSRoute, EXCSRouteConsts, EXCSRouteType
+from .entity import EXCSEntity, async_add_when_ready
+from .excs.commands import EMERGENCY_STOP_FRAME, REBOOT
+from .excs.excs_exceptions import EXCSError
+from .excs.route import EXCSRoute, EXCSRouteConsts, EXCSRouteType
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-    from .excs_client import EXCSClient
+    from .excs_client import EXCSHassClient
 
 
 async def async_setup_entry(
@@ -28,17 +30,20 @@ async def async_setup_entry(
     client = data["client"]
 
     # Create core buttons
-    entities = [
-        EXCSRebootButton(client),
-        EXCSEmergencyStopButton(client),
-    ]
+    async_add_entities(
+        [
+            EXCSRebootButton(client),
+            EXCSEmergencyStopButton(client),
+        ]
+    )
 
-    # Add route/automation buttons
-    if client.routes:
-        routes_buttons = [RouteButton(client, route) for route in client.routes]
-        entities.extend(routes_buttons)
+    @callback
+    def async_add_route_buttons() -> None:
+        """Add route/automation buttons once the routes are discovered."""
+        if client.routes:
+            async_add_entities([RouteButton(client, route) for route in client.routes])
 
-    async_add_entities(entities)
+    async_add_when_ready(entry, client, async_add_route_buttons)
 
 
 class EXCSButtonEntity(EXCSEntity, ButtonEntity):
@@ -48,7 +53,7 @@ class EXCSButtonEntity(EXCSEntity, ButtonEntity):
 class EXCSRebootButton(EXCSButtonEntity):
     """Representation of the EX-CommandStation reboot button."""
 
-    def __init__(self, client: EXCSClient) -> None:
+    def __init__(self, client: EXCSHassClient) -> None:
         """Initialize the button."""
         super().__init__(client)
 
@@ -71,7 +76,9 @@ class EXCSRebootButton(EXCSButtonEntity):
 class EXCSEmergencyStopButton(EXCSButtonEntity):
     """Representation of the EX-CommandStation emergency stop button."""
 
-    def __init__(self, client: EXCSClient) -> None:
+    _journaled_commands = True
+
+    def __init__(self, client: EXCSHassClient) -> None:
         """Initialize the button."""
         super().__init__(client)
 
@@ -83,10 +90,17 @@ class EXCSEmergencyStopButton(EXCSButtonEntity):
         )
         self._attr_unique_id = f"{client.entry_id}_{self.entity_description.key}"
 
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the press-to-wire latency of the emergency stop."""
+        return self._client.emergency_latency_stats
+
     async def async_press(self) -> None:
         """Send the emergency stop command to the EX-CommandStation."""
+        pressed_at = time.perf_counter()
         try:
-            await self._client.send_command(EMERGENCY_STOP)
+            # Pre-encoded frame that jumps all queued commands
+            await self._client.send_emergency(EMERGENCY_STOP_FRAME, pressed_at)
         except EXCSError:
             LOGGER.exception("Failed to send emergency stop command")
 
@@ -94,7 +108,7 @@ class EXCSEmergencyStopButton(EXCSButtonEntity):
 class RouteButton(EXCSButtonEntity):
     """Representation of a route or automation button in the EX-CommandStation."""
 
-    def __init__(self, client: EXCSClient, route: EXCSRoute) -> None:
+    def __init__(self, client: EXCSHassClient, route: EXCSRoute) -> None:
         """Initialize the route button."""
         super().__init__(client)
         self._route = route
@@ -0,0 +1,87 @@
+"""Handoff of the client validated by the config flow to the entry setup."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, HANDOFF_TIMEOUT_S, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .excs.excs_options import EXCSClientOptions
+    from .excs_client import EXCSHassClient
+
+# Clients offered by config flows, by unique ID of the entry being created
+HANDOFF_DATA: Final = f"{DOMAIN}_handoff"
+
+
+@callback
+def async_offer_client(
+    hass: HomeAssistant, unique_id: str, client: EXCSHassClient
+) -> None:
+    """
+    Keep a validated, connected client for the setup of a new entry.
+
+    The first setup of the entry with ``unique_id`` adopts the client instead
+    of connecting and asking the station for its system info again. A client
+    that is not claimed within ``HANDOFF_TIMEOUT_S`` seconds is closed.
+    """
+    pending: dict[str, tuple[EXCSHassClient, Callable[[], None]]] = (
+        hass.data.setdefault(HANDOFF_DATA, {})
+    )
+    if previous := pending.pop(unique_id, None):
+        previous_client, cancel_expiry = previous
+        cancel_expiry()
+        _async_close(hass, previous_client)
+
+    @callback
+    def expire(_now: datetime) -> None:
+        """Close the client if it has not been claimed."""
+        if pending.get(unique_id, (None,))[0] is client:
+            LOGGER.debug("Closing the unclaimed client of %s", unique_id)
+            _async_close(hass, pending.pop(unique_id)[0])
+
+    pending[unique_id] = (client, async_call_later(hass, HANDOFF_TIMEOUT_S, expire))
+
+
+@callback
+def async_claim_client(
+    hass: HomeAssistant, entry: ConfigEntry, options: EXCSClientOptions
+) -> EXCSHassClient | None:
+    """
+    Return the client offered for an entry, if any.
+
+    A client created with other options than the entry's is closed rather
+    than adopted, since its options are fixed when it is created.
+    """
+    pending: dict[str, tuple[EXCSHassClient, Callable[[], None]]] = hass.data.get(
+        HANDOFF_DATA, {}
+    )
+    if entry.unique_id is None or not (offer := pending.pop(entry.unique_id, None)):
+        return None
+
+    client, cancel_expiry = offer
+    cancel_expiry()
+    if client.options != options:
+        _async_close(hass, client)
+        return None
+
+    LOGGER.debug("Adopting the client validated by the config flow")
+    client.entry_id = entry.entry_id
+    return client
+
+
+@callback
+def _async_close(hass: HomeAssistant, client: EXCSHassClient) -> None:
+    """Close an offered client in the background."""
+    hass.async_create_background_task(
+        client.async_shutdown(), "EXCS handoff client shutdown"
+    )
@@ -4,13 +4,52 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.config_entries import ConfigFlowResult
-from homeassistant.const import CONF_BASE, CONF_HOST, CONF_PORT, CONF_PROFILE_NAME
+from homeassistant.config_entries import ConfigEntry, ConfigFlowResult, OptionsFlow
+from homeassistant.const import (
+    CONF_BASE,
+    CONF_DEVICE,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_PROFILE_NAME,
+)
+from homeassistant.core import callback
 from slugify import slugify
 
-from .const import DEFAULT_PORT, DOMAIN, LOGGER
-from .excs_client import EXCSClient
-from .excs_exceptions import EXCSConnectionError, EXCSError, EXCSVersionError
+from .client_handoff import async_offer_client
+from .const import (
+    CONF_BAUDRATE,
+    CONF_TRANSPORT,
+    DEFAULT_BAUDRATE,
+    DEFAULT_PORT,
+    DOMAIN,
+    LOGGER,
+    TRANSPORT_SERIAL,
+    TRANSPORT_TCP,
+)
+from .excs.const import (
+    CONF_JOURNAL_TTL_S,
+    CONF_OFFLINE_JOURNAL,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONF_SOCKET_PROFILE,
+    CONF_THROTTLE_WINDOW_MS,
+    CONF_TRANSPORT_WORKER,
+    CONF_WRITE_WINDOW_US,
+    DEFAULT_JOURNAL_TTL_S,
+    DEFAULT_OFFLINE_JOURNAL,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_SOCKET_PROFILE,
+    DEFAULT_THROTTLE_WINDOW_MS,
+    DEFAULT_TRANSPORT_WORKER,
+    DEFAULT_WRITE_WINDOW_US,
+    MAX_JOURNAL_TTL_S,
+    MAX_THROTTLE_WINDOW_MS,
+    MAX_WRITE_WINDOW_US,
+)
+from .excs.excs_exceptions import EXCSConnectionError, EXCSError, EXCSVersionError
+from .excs.socket_profile import EXCSSocketProfile
+from .excs_client import EXCSHassClient
 
 USER_SCHEMA = vol.Schema(
     {
@@ -20,16 +59,64 @@ USER_SCHEMA = vol.Schema(
     }
 )
 
+SERIAL_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_DEVICE): str,
+        vol.Optional(CONF_BAUDRATE, default=DEFAULT_BAUDRATE): int,
+        vol.Optional(CONF_PROFILE_NAME): str,
+    }
+)
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_WRITE_WINDOW_US, default=DEFAULT_WRITE_WINDOW_US): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=MAX_WRITE_WINDOW_US)
+        ),
+        vol.Optional(
+            CONF_THROTTLE_WINDOW_MS, default=DEFAULT_THROTTLE_WINDOW_MS
+        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_THROTTLE_WINDOW_MS)),
+        vol.Optional(CONF_SOCKET_PROFILE, default=DEFAULT_SOCKET_PROFILE): vol.In(
+            [profile.value for profile in EXCSSocketProfile]
+        ),
+        vol.Optional(CONF_OFFLINE_JOURNAL, default=DEFAULT_OFFLINE_JOURNAL): bool,
+        vol.Optional(CONF_JOURNAL_TTL_S, default=DEFAULT_JOURNAL_TTL_S): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_JOURNAL_TTL_S)
+        ),
+        vol.Optional(CONF_PROXY_PORT, default=DEFAULT_PROXY_PORT): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=65535)
+        ),
+        vol.Optional(CONF_PROXY_HOST, default=DEFAULT_PROXY_HOST): vol.All(
+            str, vol.Length(min=1)
+        ),
+        vol.Optional(CONF_TRANSPORT_WORKER, default=DEFAULT_TRANSPORT_WORKER): bool,
+    }
+)
+
 
 class EXCommandStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for EX-CommandStation."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:  # noqa: ARG004
+        """Get the options flow for this handler."""
+        return EXCommandStationOptionsFlow()
+
     async def async_step_user(
-        self, user_input: dict[str, Any] | None = None
+        self,
+        user_input: dict[str, Any] | None = None,  # noqa: ARG002
     ) -> ConfigFlowResult:
         """Handle a flow initiated by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=[TRANSPORT_TCP, TRANSPORT_SERIAL]
+        )
+
+    async def async_step_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the connection to a networked EX-CommandStation."""
         _errors = {}
         if user_input is not None:
             host = user_input[CONF_HOST]
@@ -40,39 +127,98 @@ class EXCommandStationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(unique_id)
             self._abort_if_unique_id_configured()
 
-            # Attempt to connect to the EX-CommandStation and validate the configuration
-            client = None
-            try:
-                client = EXCSClient(self.hass, host, port)
-                await client.async_validate_config()
-
+            data = {**user_input, CONF_TRANSPORT: TRANSPORT_TCP}
+            _errors = await self._async_validate(data)
+            if not _errors:
                 # Use provided profile name or fallback to default
                 return self.async_create_entry(
                     title=user_input.get(
                         CONF_PROFILE_NAME, f"EX-CommandStation on {host}"
                     ),
-                    data=user_input,
+                    data=data,
                 )
-            except TimeoutError:
-                LOGGER.error("Connection timeout")
-                _errors[CONF_BASE] = "cannot_connect"
-            except EXCSConnectionError as e:
-                LOGGER.error("Connection error: %s", e)
-                _errors[CONF_BASE] = "cannot_connect"
-            except EXCSVersionError as e:
-                LOGGER.error("Unsupported version: %s", e)
-                _errors[CONF_BASE] = "unsupported_version"
-            except EXCSError as e:
-                LOGGER.error("Unknown error: %s", e)
-                _errors[CONF_BASE] = "unknown"
-            finally:
-                # Ensure the client is closed properly
-                if client:
-                    await client.async_shutdown()
 
         # If no user input, show the form
         return self.async_show_form(
-            step_id="user",
+            step_id="tcp",
             data_schema=USER_SCHEMA,
             errors=_errors,
         )
+
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the connection to an EX-CommandStation on a serial port."""
+        _errors = {}
+        if user_input is not None:
+            device = user_input[CONF_DEVICE]
+
+            # Check if we already have this station configured
+            await self.async_set_unique_id(slugify(device))
+            self._abort_if_unique_id_configured()
+
+            data = {**user_input, CONF_TRANSPORT: TRANSPORT_SERIAL}
+            _errors = await self._async_validate(data)
+            if not _errors:
+                return self.async_create_entry(
+                    title=user_input.get(
+                        CONF_PROFILE_NAME, f"EX-CommandStation on {device}"
+                    ),
+                    data=data,
+                )
+
+        return self.async_show_form(
+            step_id="serial",
+            data_schema=SERIAL_SCHEMA,
+            errors=_errors,
+        )
+
+    async def _async_validate(self, data: dict[str, Any]) -> dict[str, str]:
+        """
+        Connect to the EX-CommandStation and return errors, if any.
+
+        A validated client stays connected and is offered to the setup of the
+        entry about to be created, so the station is not connected to twice.
+        """
+        client = None
+        try:
+            client = EXCSHassClient.from_config(self.hass, data)
+            await client.async_validate_config()
+        except TimeoutError:
+            LOGGER.error("Connection timeout")
+            return {CONF_BASE: "cannot_connect"}
+        except EXCSConnectionError as e:
+            LOGGER.error("Connection error: %s", e)
+            return {CONF_BASE: "cannot_connect"}
+        except EXCSVersionError as e:
+            LOGGER.error("Unsupported version: %s", e)
+            return {CONF_BASE: "unsupported_version"}
+        except EXCSError as e:
+            LOGGER.error("Unknown error: %s", e)
+            return {CONF_BASE: "unknown"}
+        else:
+            async_offer_client(self.hass, self.unique_id, client)
+            client = None
+        finally:
+            # Ensure a client that is not handed off is closed properly
+            if client:
+                await client.async_shutdown()
+        return {}
+
+
+class EXCommandStationOptionsFlow(OptionsFlow):
+    """Options flow for EX-CommandStation."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the client options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
@@ -10,17 +10,21 @@ DOMAIN: Final = "ex_habridge"
 # Default port used in the EX-CommandStation
 DEFAULT_PORT: Final = 2560
 
-# Timeouts for various operations
-CONNECTION_TIMEOUT: Final = 10.0
-RESPONSE_TIMEOUT: Final = 20.0
-HEARTBEAT_INTERVAL: Final = 60.0
-HEARTBEAT_TIMEOUT: Final = 150.0
-MAX_BACKOFF_TIME: Final = 60.0
-
-# Minimum supported version of the EX-CommandStation
-MIN_SUPPORTED_VERSION: Final[tuple[int, ...]] = (5, 4, 0)
-
-# Dispatcher signals
-SIGNAL_CONNECTED = "connected"
-SIGNAL_DISCONNECTED = "disconnected"
-SIGNAL_DATA_PUSHED = "data_pushed"
+# Transports to reach the EX-CommandStation (entries without one use TCP)
+CONF_TRANSPORT: Final = "transport"
+CONF_BAUDRATE: Final = "baudrate"
+TRANSPORT_TCP: Final = "tcp"
+TRANSPORT_SERIAL: Final = "serial"
+DEFAULT_BAUDRATE: Final = 115200
+
+# Directory in the configuration directory holding the wire traffic
+# recordings; recording files named without a directory are kept there
+RECORDINGS_DIR: Final = f"{DOMAIN}_recordings"
+
+# Signal dispatched by the client once it is connected and the station is
+# discovered, after which the entities of its objects are added
+SIGNAL_READY: Final = "ready"
+
+# Seconds a client validated by the config flow is kept for the setup of the
+# new entry before it is closed
+HANDOFF_TIMEOUT_S: Final = 10
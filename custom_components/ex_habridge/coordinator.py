@@ -7,27 +7,25 @@ from typing import TYPE_CHECKING
 from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import (
-    DOMAIN,
-    LOGGER,
-    SIGNAL_CONNECTED,
-    SIGNAL_DATA_PUSHED,
-    SIGNAL_DISCONNECTED,
-)
-from .excs_exceptions import EXCSError
-from .roster import EXCSRosterEntry
+from .const import DOMAIN, LOGGER
+from .excs.commands import OPCODE_THROTTLE
+from .excs.const import SIGNAL_DISCONNECTED
+from .excs.excs_exceptions import EXCSError
+from .excs.outbound_queue import EXCSCommandPriority
+from .excs.roster import EXCSRosterEntry
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
-    from .excs_client import EXCSClient
+    from .excs.messages import EXCSMessage
+    from .excs_client import EXCSHassClient
 
 
 class LocoUpdateCoordinator(DataUpdateCoordinator[EXCSRosterEntry]):
     """Class to manage throttle updates for a locomotive."""
 
     def __init__(
-        self, hass: HomeAssistant, client: EXCSClient, loco: EXCSRosterEntry
+        self, hass: HomeAssistant, client: EXCSHassClient, loco: EXCSRosterEntry
     ) -> None:
         """Initialize the locomotive update coordinator."""
         super().__init__(
@@ -43,34 +41,39 @@ class LocoUpdateCoordinator(DataUpdateCoordinator[EXCSRosterEntry]):
         # List to store signal unsubscribe callbacks
         self._unsub_callbacks = []
 
-    async def _async_setup(self) -> None:
-        """Register callbacks and call initial update."""
+    async def async_start(self) -> None:
+        """
+        Register callbacks and request the initial state.
+
+        Called once the client is set up, after the config entry itself has
+        been set up, so the first refresh of the coordinator is not used.
+        """
         self._unsub_callbacks.extend(
             [
-                self._client.register_signal_handler(
-                    SIGNAL_CONNECTED, self._on_connect
-                ),
                 self._client.register_signal_handler(
                     SIGNAL_DISCONNECTED, self._on_disconnect
                 ),
-                self._client.register_signal_handler(
-                    SIGNAL_DATA_PUSHED, self._handle_push
+                self._client.register_push_handler(
+                    OPCODE_THROTTLE, self._handle_push, self._loco.id
                 ),
             ]
         )
+        await self.async_refresh()
 
     async def _async_update_data(self) -> None:
         """
         Request an update of the locomotive state.
 
-        This method is used only for initial setup and in case of reconnections
-        to get the latest state of the locomotive.
+        This method is used only for the initial setup; after reconnecting,
+        the client resyncs the state of all locomotives at once.
         Normally, updates are pushed from the EXCommandStation.
         """
         try:
-            await self._client.send_command(self._loco.get_status_cmd())
+            await self._client.send_command(
+                self._loco.get_status_cmd(), EXCSCommandPriority.BACKGROUND
+            )
         except EXCSError as err:
-            LOGGER.warning("Error requesting loco update after reconnection: %s", err)
+            LOGGER.warning("Error requesting loco update: %s", err)
 
     async def async_shutdown(self) -> None:
         """Unregister callbacks and clean up resources."""
@@ -81,23 +84,14 @@ class LocoUpdateCoordinator(DataUpdateCoordinator[EXCSRosterEntry]):
             unsub()
         self._unsub_callbacks.clear()
 
-    @callback
-    def _on_connect(self) -> None:
-        """Handle connection to the EX-CommandStation."""
-        self.hass.async_create_task(self._async_update_data())
-
     @callback
     def _on_disconnect(self, exc: Exception) -> None:
         """Handle disconnection from the EX-CommandStation."""
         self.async_set_update_error(UpdateFailed(exc))
 
     @callback
-    def _handle_push(self, message: str) -> None:
-        """Process throttle messages for this locomotive."""
-        if not message.startswith(self._loco.recv_prefix):
-            # Ignore messages not related to this locomotive
-            return
-
+    def _handle_push(self, message: EXCSMessage) -> None:
+        """Process throttle messages routed to this locomotive."""
         try:
             # Process the message and update locomotive state
             self._loco.process_throttle_response(message)
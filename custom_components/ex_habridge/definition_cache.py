@@ -0,0 +1,87 @@
+"""Persistent cache of the definitions discovered from an EX-CommandStation."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, LOGGER
+from .excs.excs_config import EXCSDefinitions
+from .excs.excs_exceptions import EXCSError
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .excs_client import EXCSHassClient
+
+STORAGE_VERSION: Final = 1
+
+
+class EXCSDefinitionCache:
+    """
+    Roster, route and turnout definitions of a config entry, kept across restarts.
+
+    The definitions are stored with the host they were discovered from and
+    the build number of the station, and are only used again for the same
+    host and build. A cached setup is revalidated in the background by
+    discovering the definitions again.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, host: str) -> None:
+        """Initialize the cache of a config entry."""
+        self._hass = hass
+        self._entry = entry
+        self._host = host
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.definitions"
+        )
+
+    async def async_load(self) -> EXCSDefinitions | None:
+        """Return the cached definitions of the host, if any."""
+        data = await self._store.async_load()
+        if not data or data.get("host") != self._host:
+            return None
+        try:
+            return EXCSDefinitions(**data["definitions"])
+        except (KeyError, TypeError):
+            LOGGER.warning("Ignoring malformed cached definitions")
+            return None
+
+    async def async_save(self, definitions: EXCSDefinitions) -> None:
+        """Store the definitions of the host."""
+        await self._store.async_save(
+            {"host": self._host, "definitions": asdict(definitions)}
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached definitions."""
+        await self._store.async_remove()
+
+    async def async_revalidate(self, client: EXCSHassClient) -> None:
+        """
+        Discover the definitions again and update what differs from the cache.
+
+        Changed turnout states are applied to the existing entities. Any other
+        change (objects added, removed or renamed) is stored and the entry is
+        reloaded, which creates the entities from the updated cache.
+        """
+        try:
+            definitions = await client.discover_definitions()
+        except EXCSError as err:
+            LOGGER.warning("Could not revalidate the cached definitions: %s", err)
+            return
+
+        if definitions == client.definitions:
+            LOGGER.debug("Cached definitions are up to date")
+            return
+
+        await self.async_save(definitions)
+        if client.apply_turnout_states(definitions):
+            LOGGER.debug("Updated turnout states from the revalidated definitions")
+            return
+
+        LOGGER.info("Definitions of the EX-CommandStation changed, reloading")
+        self._hass.config_entries.async_schedule_reload(self._entry.entry_id)
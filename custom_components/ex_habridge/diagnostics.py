@@ -0,0 +1,58 @@
+"""Diagnostics support for EX-CommandStation."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST, CONF_PORT
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .excs_client import EXCSHassClient
+
+# The address of the station, also part of the description of the connector
+TO_REDACT = {CONF_HOST, CONF_PORT, "connector"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the setup, link statistics and wire trace of a config entry."""
+    client: EXCSHassClient = hass.data[DOMAIN][entry.entry_id]["client"]
+    diagnostics = {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "system_info": asdict(client.system_info),
+        "connected": client.connected,
+        "ready": client.ready.is_set(),
+        "setup": {
+            "times": client.setup_times,
+            "definitions_cached": client.definitions_cached,
+            "roster_entries": len(client.roster_entries),
+            "routes": len(client.routes),
+            "turnouts": len(client.turnouts),
+        },
+        "link": {
+            "connector": str(client.connector),
+            "response_time": client.rtt.stats,
+            "heartbeat": client.heartbeat_latencies.stats,
+            "loco_slots": client.loco_slots,
+            "reconnects": client.reconnect_stats,
+            "resync": client.resync.stats,
+            "outbound": client.outbound_stats,
+            "emergency": client.emergency_latency_stats,
+            "throttle": client.throttle.stats,
+            "journal": client.journal.stats if client.journal else None,
+            "proxy": client.proxy.stats if client.proxy else None,
+        },
+        "wire_trace": {
+            "recorded": client.wire_trace.recorded,
+            "frames": client.wire_trace.dump(),
+        },
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
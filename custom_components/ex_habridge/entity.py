@@ -9,17 +9,33 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import (
-    DOMAIN,
-    LOGGER,
-    SIGNAL_CONNECTED,
-    SIGNAL_DISCONNECTED,
-)
+from .const import DOMAIN, LOGGER, SIGNAL_READY
 from .coordinator import LocoUpdateCoordinator
+from .excs.const import SIGNAL_DISCONNECTED, SIGNAL_RESYNCED
 
 if TYPE_CHECKING:
-    from .excs_client import EXCSClient
-    from .roster import EXCSRosterEntry
+    from collections.abc import Callable
+
+    from homeassistant.config_entries import ConfigEntry
+
+    from .excs.roster import EXCSRosterEntry
+    from .excs_client import EXCSHassClient
+
+
+@callback
+def async_add_when_ready(
+    entry: ConfigEntry, client: EXCSHassClient, add_entities: Callable[[], None]
+) -> None:
+    """
+    Add the entities of the discovered objects once the client is ready.
+
+    ``add_entities`` is called right away if the client is already ready,
+    otherwise when it signals readiness.
+    """
+    if client.ready.is_set():
+        add_entities()
+        return
+    entry.async_on_unload(client.register_signal_handler(SIGNAL_READY, add_entities))
 
 
 class EXCSEntity(Entity):
@@ -28,30 +44,41 @@ class EXCSEntity(Entity):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
-    def __init__(self, client: EXCSClient) -> None:
+    # Whether the commands of the entity are journaled while disconnected; if
+    # the offline journal is enabled, the entity then stays available
+    _journaled_commands = False
+
+    def __init__(self, client: EXCSHassClient) -> None:
         """Initialize the entity."""
         self._client = client
-        self._attr_available = client.connected  # Available if client is connected
+        # Available once the client is connected and set up
+        self._attr_available = client.connected and client.ready.is_set()
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, client.host)},
             name="EX-CommandStation",
             manufacturer="DCC-EX",
             model="EX-CommandStation",
-            sw_version=client.system_info.version,
+            # Not known before the client is ready; set on the device then
+            sw_version=client.system_info.version or None,
         )
 
         # List to store signal unsubscribe callbacks
         self._unsub_callbacks = []
 
     @callback
-    def _on_connect(self) -> None:
-        """Handle connection to the EX-CommandStation."""
-        self._attr_available = True
+    def _on_ready(self) -> None:
+        """Handle the client becoming ready, or its state resync after reconnecting."""
+        self._attr_available = self._client.ready.is_set() and (
+            self._client.connected
+            or (self._journaled_commands and self._client.journal is not None)
+        )
         self.async_write_ha_state()
 
     @callback
     def _on_disconnect(self, exc: Exception) -> None:
         """Handle disconnection from the EX-CommandStation."""
+        if self._journaled_commands and self._client.journal is not None:
+            return
         LOGGER.debug("Entity became unavailable due to: %s", exc)
         self._attr_available = False
         self.async_write_ha_state()
@@ -59,7 +86,8 @@ class EXCSEntity(Entity):
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
         self._unsub_callbacks = [
-            self._client.register_signal_handler(SIGNAL_CONNECTED, self._on_connect),
+            self._client.register_signal_handler(SIGNAL_RESYNCED, self._on_ready),
+            self._client.register_signal_handler(SIGNAL_READY, self._on_ready),
             self._client.register_signal_handler(
                 SIGNAL_DISCONNECTED, self._on_disconnect
             ),
@@ -78,9 +106,12 @@ class EXCSRosterEntity(CoordinatorEntity[LocoUpdateCoordinator]):
     _attr_has_entity_name = True
     _attr_should_poll = False
 
+    # Whether the commands of the entity are journaled while disconnected
+    _journaled_commands = False
+
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         roster_entry: EXCSRosterEntry,
     ) -> None:
@@ -97,3 +128,15 @@ class EXCSRosterEntity(CoordinatorEntity[LocoUpdateCoordinator]):
             model_id=str(roster_entry.id),
             via_device=(DOMAIN, client.host),
         )
+
+    @property
+    def available(self) -> bool:
+        """
+        Return True if the state of the locomotive is known.
+
+        Locomotive controls stay available while disconnected if the offline
+        journal is enabled, so their commands are journaled and replayed.
+        """
+        return super().available or (
+            self._journaled_commands and self._client.journal is not None
+        )
@@ -0,0 +1,9 @@
+"""
+Home Assistant independent EX-CommandStation client.
+
+Connection handling, request correlation and the roster, turnout and route
+managers only depend on asyncio; the integration adapts the client to Home
+Assistant (see ``excs_client.py`` in the integration package). The package
+only uses relative imports, so it can also be imported on its own, e.g. by
+benchmarks and scripts, with ``custom_components/ex_habridge`` on the path.
+"""
@@ -0,0 +1,85 @@
+"""Journal of commands issued while the EX-CommandStation is unreachable."""
+
+from __future__ import annotations
+
+import contextlib
+import time
+
+from . import commands
+
+
+def journal_key(command: str) -> tuple[str | int, ...] | None:
+    """
+    Return the key of the object a state-setting command targets.
+
+    For example ``("t", 3)`` for the throttle of cab 3. Only commands that
+    set a state are journaled: throttles, functions, turnouts, track power
+    and emergency stop. Commands with side effects that must not be repeated
+    later (reboot, routes, CV writes) are not, nor are malformed commands
+    such as ``t abc 1 1``.
+    """
+    with contextlib.suppress(ValueError):
+        match command.split():
+            case ["t", cab, _, _]:
+                return ("t", int(cab))
+            case ["F", cab, function_id, _]:
+                return ("F", int(cab), int(function_id))
+            case ["T", turnout_id, _]:
+                return ("T", int(turnout_id))
+            case [commands.CMD_TRACKS_ON | commands.CMD_TRACKS_OFF]:
+                return ("power",)
+            case [commands.EMERGENCY_STOP]:
+                return (commands.EMERGENCY_STOP,)
+    return None
+
+
+class EXCSCommandJournal:
+    """
+    Latest intent per cab, function, turnout and track power while offline.
+
+    A newer command for the same object replaces the older one and moves to
+    the end, so the journal replays intents in the order of their latest
+    change. Intents older than the time-to-live are dropped.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        """Initialize an empty journal with the time-to-live in seconds."""
+        self._ttl = ttl
+        self._entries: dict[tuple[str | int, ...], tuple[str, float]] = {}
+
+        # Counters of the journal activity
+        self.journaled = 0
+        self.replayed = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        """Return the number of journaled intents."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the journal counters."""
+        return {
+            "pending": len(self._entries),
+            "journaled": self.journaled,
+            "replayed": self.replayed,
+            "expired": self.expired,
+        }
+
+    def record(self, command: str) -> bool:
+        """Journal a command; return False if it cannot be journaled."""
+        if (key := journal_key(command)) is None:
+            return False
+        self._entries.pop(key, None)
+        self._entries[key] = (command, time.monotonic() + self._ttl)
+        self.journaled += 1
+        return True
+
+    def take(self) -> list[str]:
+        """Remove and return the commands that have not expired yet."""
+        now = time.monotonic()
+        entries, self._entries = self._entries, {}
+        pending = [command for command, expires in entries.values() if expires > now]
+        self.expired += len(entries) - len(pending)
+        self.replayed += len(pending)
+        return pending
@@ -22,12 +22,23 @@ CMD_EXCS_SYS_INFO: Final[str] = "s"
 CMD_TRACKS_ON: Final[str] = "1"
 CMD_TRACKS_OFF: Final[str] = "0"
 CMD_KEEP_ALIVE: Final[str] = "#"
+RESP_KEEP_ALIVE_PREFIX: Final[str] = "#"  # <# slots>
 RESP_TRACKS_ON: Final[str] = "p1"
 RESP_TRACKS_OFF: Final[str] = "p0"
 EMERGENCY_STOP: Final[str] = "!"
 REBOOT: Final[str] = "D RESET"
 RESP_FAIL: Final[str] = "X"
 
+# Pre-encoded frames sent through the emergency fast path
+EMERGENCY_STOP_FRAME: Final[bytes] = b"<!>\n"
+TRACKS_ON_FRAME: Final[bytes] = b"<1>\n"
+TRACKS_OFF_FRAME: Final[bytes] = b"<0>\n"
+
+# Opcodes of messages pushed by the EX-CommandStation
+OPCODE_THROTTLE: Final[str] = "l"
+OPCODE_TURNOUT_STATE: Final[str] = "H"
+OPCODE_POWER: Final[str] = "p"
+
 
 def command_write_cv(addr: int, cv: int, value: int) -> str:
     """Write a value to a locomotive CV on Main track."""
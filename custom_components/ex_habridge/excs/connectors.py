@@ -0,0 +1,264 @@
+"""Transports connecting the client to the EX-CommandStation."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import LOGGER
+from .socket_profile import EXCSSocketProfile, apply_socket_profile
+from .transport_worker import WORKER_READY
+
+# Imports this package on its own in the worker process; the integration
+# directory is appended to the path, as its platform modules (e.g.
+# select.py) would shadow standard library modules
+WORKER_BOOTSTRAP: Final = (
+    "import sys; sys.path.append({path!r}); "
+    "from {package}.transport_worker import main; sys.exit(main())"
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .stream_protocol import EXCSStreamProtocol
+
+
+class EXCSConnector(ABC):
+    """Open the link to the EX-CommandStation for the stream protocol."""
+
+    @abstractmethod
+    async def open(
+        self, protocol_factory: Callable[[], EXCSStreamProtocol], connect_timeout: float
+    ) -> EXCSStreamProtocol:
+        """Open the link within the timeout and return its protocol."""
+
+    @abstractmethod
+    def __str__(self) -> str:
+        """Return a description of the link for log messages."""
+
+
+class EXCSTcpConnector(EXCSConnector):
+    """
+    TCP connection to a networked EX-CommandStation.
+
+    The address of the last successful connection is reused, so reconnects
+    skip name resolution; it is resolved again after a failed attempt.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        socket_profile: EXCSSocketProfile = EXCSSocketProfile.LOW_LATENCY,
+    ) -> None:
+        """Initialize the connector."""
+        self.host = host
+        self.port = port
+        self.socket_profile = socket_profile
+        self._resolved_address: tuple[int, tuple[Any, ...]] | None = None
+
+    def __str__(self) -> str:
+        """Return the host and port."""
+        return f"{self.host}:{self.port}"
+
+    async def open(
+        self, protocol_factory: Callable[[], EXCSStreamProtocol], connect_timeout: float
+    ) -> EXCSStreamProtocol:
+        """Connect and apply the socket profile."""
+        loop = asyncio.get_running_loop()
+        if self._resolved_address is None:
+            host, port, family = self.host, self.port, 0
+        else:
+            family, (host, port, *_) = self._resolved_address
+
+        try:
+            transport, protocol = await asyncio.wait_for(
+                loop.create_connection(protocol_factory, host, port, family=family),
+                timeout=connect_timeout,
+            )
+        except (OSError, TimeoutError):
+            self._resolved_address = None
+            raise
+
+        if (sock := transport.get_extra_info("socket")) is not None:
+            self._resolved_address = (sock.family, transport.get_extra_info("peername"))
+            apply_socket_profile(sock, self.socket_profile)
+        return protocol
+
+
+class EXCSSerialConnector(EXCSConnector):
+    """Serial (USB) connection to a locally attached EX-CommandStation."""
+
+    def __init__(self, device: str, baudrate: int) -> None:
+        """Initialize the connector."""
+        self.device = device
+        self.baudrate = baudrate
+
+    def __str__(self) -> str:
+        """Return the device and baud rate."""
+        return f"{self.device}@{self.baudrate}"
+
+    async def open(
+        self, protocol_factory: Callable[[], EXCSStreamProtocol], connect_timeout: float
+    ) -> EXCSStreamProtocol:
+        """Open the serial device."""
+        # Only loaded for serial connections
+        import serial_asyncio_fast  # noqa: PLC0415
+
+        try:
+            _, protocol = await asyncio.wait_for(
+                serial_asyncio_fast.create_serial_connection(
+                    asyncio.get_running_loop(),
+                    protocol_factory,
+                    self.device,
+                    baudrate=self.baudrate,
+                ),
+                timeout=connect_timeout,
+            )
+        except (ValueError, serial_asyncio_fast.serial.SerialException) as err:
+            # Report like a refused TCP connection so the client reconnects
+            raise OSError(str(err)) from err
+        return protocol
+
+
+class _WorkerTransport(asyncio.Transport):
+    """Transport writing to the stdin pipe of the transport worker."""
+
+    def __init__(self, process: asyncio.SubprocessTransport) -> None:
+        """Initialize the transport for a started worker process."""
+        super().__init__()
+        self._process = process
+        self._stdin = process.get_pipe_transport(0)
+
+    def write(self, data: bytes | bytearray | memoryview) -> None:
+        """Send encoded commands to the worker."""
+        self._stdin.write(data)
+
+    def is_closing(self) -> bool:
+        """Return True once the worker was asked to stop."""
+        return self._stdin.is_closing()
+
+    def close(self) -> None:
+        """Close stdin so the worker closes the connection and exits."""
+        self._stdin.close()
+
+    def abort(self) -> None:
+        """Terminate the worker right away."""
+        self._stdin.close()
+        if self._process.get_returncode() is None:
+            self._process.kill()
+
+
+class _WorkerPipeProtocol(asyncio.SubprocessProtocol):
+    """Deliver the frames reported by the transport worker to the protocol."""
+
+    def __init__(self, protocol: EXCSStreamProtocol) -> None:
+        """Initialize the bridge to the stream protocol."""
+        self._protocol = protocol
+        self._buffer = ""
+        self._process: asyncio.SubprocessTransport | None = None
+        self._transport: _WorkerTransport | None = None
+        self.ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Wrap the process transport once the worker started."""
+        self._process = transport  # type: ignore[assignment]
+        self._transport = _WorkerTransport(self._process)  # type: ignore[arg-type]
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        """Split the worker output into frames, after its connect report."""
+        if fd != 1:
+            return
+        *lines, self._buffer = (self._buffer + data.decode("ascii")).split("\n")
+        if not lines:
+            return
+        if not self.ready.done():
+            status, _, reason = lines.pop(0).partition(" ")
+            if status != WORKER_READY:
+                self._fail(OSError(reason))
+                return
+            self.ready.set_result(None)
+            self._protocol.connection_made(self._transport)  # type: ignore[arg-type]
+        if lines:
+            self._protocol.frames_received(lines)
+
+    def pause_writing(self) -> None:
+        """Pause writers while the stdin pipe is full."""
+        self._protocol.pause_writing()
+
+    def resume_writing(self) -> None:
+        """Resume writers once the stdin pipe has drained."""
+        self._protocol.resume_writing()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Report the end of the worker as a lost connection."""
+        if self._process is not None:
+            self._process.close()
+        if not self.ready.done():
+            self._fail(OSError("Transport worker exited"))
+        else:
+            self._protocol.connection_lost(exc)
+
+    def _fail(self, exc: Exception) -> None:
+        """Fail the connect attempt waiting for the worker."""
+        self.ready.set_exception(exc)
+        self.ready.exception()  # The attempt may have timed out already
+
+
+class EXCSWorkerConnector(EXCSConnector):
+    """
+    TCP connection owned by a transport worker process.
+
+    The worker (see ``transport_worker.py``) reads the socket and extracts
+    the frames, so a busy Home Assistant event loop does not delay reading
+    from the station and heavy frame traffic costs the event loop only one
+    pipe read per batch of frames. A new worker is started for every
+    connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        socket_profile: EXCSSocketProfile = EXCSSocketProfile.LOW_LATENCY,
+    ) -> None:
+        """Initialize the connector."""
+        self.host = host
+        self.port = port
+        self.socket_profile = socket_profile
+
+    def __str__(self) -> str:
+        """Return the host and port."""
+        return f"{self.host}:{self.port} (worker)"
+
+    async def open(
+        self, protocol_factory: Callable[[], EXCSStreamProtocol], connect_timeout: float
+    ) -> EXCSStreamProtocol:
+        """Start a worker and wait until it connected to the station."""
+        protocol = protocol_factory()
+        process, bridge = await asyncio.get_running_loop().subprocess_exec(
+            lambda: _WorkerPipeProtocol(protocol),
+            sys.executable,
+            "-I",  # Keep the integration directory off the module search path
+            "-c",
+            WORKER_BOOTSTRAP.format(
+                path=str(Path(__file__).parents[1]), package=Path(__file__).parent.name
+            ),
+            self.host,
+            str(self.port),
+            self.socket_profile.value,
+            str(connect_timeout),
+            stderr=None,
+        )
+        try:
+            # Allow for the start-up of the interpreter on top of the connect
+            await asyncio.wait_for(asyncio.shield(bridge.ready), connect_timeout * 2)
+        except (OSError, TimeoutError):
+            if process.get_returncode() is None:
+                process.kill()
+            raise
+        LOGGER.debug("Transport worker %d connected", process.get_pid())
+        return protocol
@@ -0,0 +1,90 @@
+"""Constants of the EX-CommandStation client."""
+
+from logging import Logger, getLogger
+from typing import Final
+
+LOGGER: Logger = getLogger(__package__)
+
+# Timeouts for various operations
+CONNECTION_TIMEOUT: Final = 10.0
+RESPONSE_TIMEOUT: Final = 20.0
+# A keep-alive probe is only sent after this long without received data,
+# and the link is declared dead after HEARTBEAT_TIMEOUT without data
+HEARTBEAT_INTERVAL: Final = 60.0
+HEARTBEAT_TIMEOUT: Final = 150.0
+MAX_BACKOFF_TIME: Final = 60.0
+
+# Reconnect delays grow from this base delay with random jitter; connections
+# dropping within STABLE_CONNECTION_TIME do not reset the backoff
+RECONNECT_BASE_DELAY: Final = 0.5
+STABLE_CONNECTION_TIME: Final = 10.0
+
+# Bounds of the response timeout derived from the measured round-trip time;
+# RESPONSE_TIMEOUT is used until the first round trip has been measured
+MIN_RESPONSE_TIMEOUT: Final = 0.3
+MAX_RESPONSE_TIMEOUT: Final = 60.0
+
+# Retries of unanswered read-only requests before giving up
+MAX_REQUEST_RETRIES: Final = 2
+
+# Detail requests (roster entries, turnouts, routes) in flight at once during
+# discovery, and state requests during a resync after reconnecting; small
+# enough not to overrun the input buffer of the station
+DISCOVERY_WINDOW: Final = 8
+
+# Number of most recent frames kept by the wire trace
+WIRE_TRACE_SIZE: Final = 1000
+
+# Bytes of recorded frames collected before they are written to the file
+RECORDING_FLUSH_SIZE: Final = 64 * 1024
+
+# Keys of the client options (the options of a config entry in Home Assistant)
+CONF_WRITE_WINDOW_US: Final = "write_window_us"
+CONF_THROTTLE_WINDOW_MS: Final = "throttle_window_ms"
+CONF_SOCKET_PROFILE: Final = "socket_profile"
+CONF_OFFLINE_JOURNAL: Final = "offline_journal"
+CONF_JOURNAL_TTL_S: Final = "journal_ttl_s"
+CONF_PROXY_PORT: Final = "proxy_port"
+CONF_PROXY_HOST: Final = "proxy_host"
+CONF_TRANSPORT_WORKER: Final = "transport_worker"
+
+# Outbound commands issued within this window are sent with a single write
+# (0 = commands issued within the same event loop iteration)
+DEFAULT_WRITE_WINDOW_US: Final = 0
+MAX_WRITE_WINDOW_US: Final = 100_000
+
+# Only the newest speed and direction requested for a cab within this window
+# are sent (0 = only requests issued within the same event loop iteration)
+DEFAULT_THROTTLE_WINDOW_MS: Final = 50
+MAX_THROTTLE_WINDOW_MS: Final = 1000
+
+# Socket options applied at connect time (see socket_profile.py)
+DEFAULT_SOCKET_PROFILE: Final = "low_latency"
+
+# Commands issued while disconnected are journaled and replayed after
+# reconnecting if enabled; intents older than the TTL are dropped
+DEFAULT_OFFLINE_JOURNAL: Final = False
+DEFAULT_JOURNAL_TTL_S: Final = 30
+MAX_JOURNAL_TTL_S: Final = 600
+
+# Port of the local DCC-EX server sharing the station connection with other
+# throttles (0 = disabled) and the address it listens on; the server does not
+# authenticate, so it only accepts local clients unless told otherwise. Bytes
+# buffered per downstream client before a client too slow to read them is
+# disconnected
+DEFAULT_PROXY_PORT: Final = 0
+DEFAULT_PROXY_HOST: Final = "127.0.0.1"
+PROXY_CLIENT_BUFFER_SIZE: Final = 64 * 1024
+
+# Read the TCP connection in a separate worker process (see transport_worker.py)
+DEFAULT_TRANSPORT_WORKER: Final = False
+
+# Minimum supported version of the EX-CommandStation
+MIN_SUPPORTED_VERSION: Final[tuple[int, ...]] = (5, 4, 0)
+
+# Signals dispatched by the client
+SIGNAL_CONNECTED = "connected"
+SIGNAL_DISCONNECTED = "disconnected"
+SIGNAL_DATA_PUSHED = "data_pushed"
+SIGNAL_HEARTBEAT = "heartbeat"
+SIGNAL_RESYNCED = "resynced"
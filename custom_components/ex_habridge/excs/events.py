@@ -0,0 +1,75 @@
+"""Signals and background tasks of the EX-CommandStation client."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Protocol
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+
+
+class EXCSEvents(Protocol):
+    """
+    Interface through which the client reaches its host application.
+
+    The client creates its background tasks and dispatches signals (e.g.
+    connected, disconnected, unhandled pushed messages) through this
+    interface, so it runs on plain asyncio as well as in Home Assistant.
+    """
+
+    def create_background_task(
+        self, coro: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Run a coroutine in a task not awaited by its creator."""
+
+    def dispatch(self, signal: str, *args: Any) -> None:
+        """Call the callbacks connected to a signal with the arguments."""
+
+    def connect(self, signal: str, callback: Callable[..., Any]) -> Callable[[], None]:
+        """Connect a callback to a signal and return a function to disconnect it."""
+
+
+class EXCSEventBus:
+    """Plain asyncio implementation of the client events."""
+
+    def __init__(self) -> None:
+        """Initialize the bus without connected callbacks."""
+        self._callbacks: dict[str, tuple[Callable[..., Any], ...]] = {}
+        # Keep references so running tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    def create_background_task(
+        self, coro: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Run a coroutine in a task referenced until it is done."""
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def dispatch(self, signal: str, *args: Any) -> None:
+        """Call the callbacks connected to a signal in the order they connected."""
+        for callback in self._callbacks.get(signal, ()):
+            try:
+                callback(*args)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Error in callback for signal %s", signal)
+
+    def connect(self, signal: str, callback: Callable[..., Any]) -> Callable[[], None]:
+        """Connect a callback to a signal and return a function to disconnect it."""
+        self._callbacks[signal] = (*self._callbacks.get(signal, ()), callback)
+
+        def disconnect() -> None:
+            """Disconnect the callback from the signal."""
+            callbacks = tuple(
+                cb for cb in self._callbacks.get(signal, ()) if cb is not callback
+            )
+            if callbacks:
+                self._callbacks[signal] = callbacks
+            else:
+                self._callbacks.pop(signal, None)
+
+        return disconnect
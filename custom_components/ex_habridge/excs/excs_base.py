@@ -0,0 +1,694 @@
+"""Base client for EX-CommandStation with core connectivity functionality."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from .command_journal import EXCSCommandJournal
+from .commands import (
+    CMD_KEEP_ALIVE,
+    EMERGENCY_STOP,
+    RESP_FAIL,
+    RESP_KEEP_ALIVE_PREFIX,
+)
+from .connectors import EXCSConnector, EXCSTcpConnector
+from .const import (
+    CONNECTION_TIMEOUT,
+    DISCOVERY_WINDOW,
+    HEARTBEAT_INTERVAL,
+    HEARTBEAT_TIMEOUT,
+    LOGGER,
+    MAX_REQUEST_RETRIES,
+    SIGNAL_CONNECTED,
+    SIGNAL_DATA_PUSHED,
+    SIGNAL_DISCONNECTED,
+    SIGNAL_HEARTBEAT,
+    STABLE_CONNECTION_TIME,
+    WIRE_TRACE_SIZE,
+)
+from .events import EXCSEventBus
+from .excs_exceptions import (
+    EXCSArgumentError,
+    EXCSCommandFailedError,
+    EXCSConnectionError,
+    EXCSError,
+    EXCSInvalidResponseError,
+)
+from .excs_options import EXCSClientOptions
+from .messages import tokenize_message
+from .outbound_queue import EXCSCommandPriority, EXCSOutboundQueue
+from .proxy_server import EXCSProxyServer
+from .push_router import EXCSPushRouter
+from .reconnect_backoff import EXCSReconnectBackoff
+from .request_correlator import EXCSRequestCorrelator
+from .rtt_estimator import EXCSLatencyWindow, EXCSRttEstimator
+from .stream_protocol import EXCSStreamProtocol
+from .throttle_coalescer import EXCSThrottleCoalescer
+from .wire_recording import EXCSWireRecorder
+from .wire_trace import EXCSWireDirection, EXCSWireTrace
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+    from pathlib import Path
+
+    from .events import EXCSEvents
+    from .messages import EXCSMessage
+
+
+class EXCSBaseClient:
+    """Base client for EX-CommandStation with core connectivity functionality."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        port: int,
+        entry_id: str = "",
+        options: EXCSClientOptions | None = None,
+        connector: EXCSConnector | None = None,
+        events: EXCSEvents | None = None,
+    ) -> None:
+        """
+        Initialize the EX-CommandStation base client.
+
+        The station is reached over TCP at ``host`` and ``port`` unless
+        another connector is given; the host then only identifies the
+        station (e.g. the serial device path, with the baud rate as port).
+        Signals and background tasks go through ``events``, a plain asyncio
+        event bus by default.
+        """
+        if not host or port <= 0:
+            msg = "Host cannot be empty and port must be greater than 0"
+            LOGGER.error(msg)
+            raise EXCSArgumentError(msg)
+
+        LOGGER.debug(
+            "Initializing EX-CommandStation client with host: %s, port: %s", host, port
+        )
+
+        self.host = host.strip().lower()  # Normalize host name
+        self.port = port
+        self.connected = False
+        self.entry_id = entry_id or host
+        self.options = options or EXCSClientOptions()
+        self._connector = connector or EXCSTcpConnector(
+            host.strip(), port, self.options.socket_profile
+        )
+        self._events = events or EXCSEventBus()
+        self._protocol: EXCSStreamProtocol | None = None
+        self._outbound = EXCSOutboundQueue(self.options.write_window_us)
+        self.throttle = EXCSThrottleCoalescer(self, self.options.throttle_window_ms)
+        # Press-to-wire latencies of emergency frames in seconds
+        self._emergency_latencies: deque[float] = deque(maxlen=100)
+        self._listener_task: asyncio.Task | None = None
+        self._probe_task: asyncio.Task | None = None
+        # Commands issued while disconnected, if enabled
+        self.journal = (
+            EXCSCommandJournal(self.options.journal_ttl_s)
+            if self.options.offline_journal
+            else None
+        )
+        # Local server sharing this connection with other throttles, if enabled
+        self.proxy = (
+            EXCSProxyServer(self, self.options.proxy_port, self.options.proxy_host)
+            if self.options.proxy_port
+            else None
+        )
+        # Link loss timestamps
+        self._link_lost_at: float | None = None
+        self._recovery_times: deque[float] = deque(maxlen=100)
+        self._connected_event = asyncio.Event()
+        self._correlator = EXCSRequestCorrelator()
+        # Bounds the detail and state requests in flight while discovering the
+        # layout or resyncing its state
+        self.discovery_window = asyncio.Semaphore(DISCOVERY_WINDOW)
+        self.rtt = EXCSRttEstimator()
+        # Round trips of keep-alive probes and the loco slots they report
+        self.heartbeat_latencies = EXCSLatencyWindow()
+        self.loco_slots: int | None = None
+        self._push_router = EXCSPushRouter()
+        # Most recent frames sent and received, dumped on demand
+        self.wire_trace = EXCSWireTrace(WIRE_TRACE_SIZE)
+        # Recording of the frames to a file, while one is in progress
+        self.recorder: EXCSWireRecorder | None = None
+        # Callbacks receiving every frame from the station (e.g. the proxy)
+        self._frame_taps: tuple[Callable[[str], None], ...] = ()
+
+        # Flag to control the running state of the client and reconnection attempts
+        self._running = True
+
+    async def connect(self) -> None:
+        """Connect to the EX-CommandStation."""
+        LOGGER.debug("Connecting to EX-CommandStation on %s", self._connector)
+
+        # Start listener task
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = self._events.create_background_task(
+                self._listener_loop(), name="EXCS Listener"
+            )
+
+        # Wait for the connection to be established
+        await self.wait_for_connection()
+        LOGGER.debug("Connected to EX-CommandStation on %s", self._connector)
+
+    async def disconnect(self) -> None:
+        """Disconnect from the EX-CommandStation."""
+        LOGGER.debug("Disconnecting from EX-CommandStation...")
+        self._running = False
+
+        # Cancel listener task
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.TimeoutError, asyncio.CancelledError):
+                await asyncio.wait_for(self._listener_task, timeout=2)
+
+        # Cancel a keep-alive probe still being sent
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._probe_task
+
+        self._listener_task = None
+        LOGGER.debug("Disconnected from EX-CommandStation")
+
+    async def wait_for_connection(self) -> None:
+        """Wait until the client is connected to the EX-CommandStation."""
+        if not self._connected_event.is_set():
+            await asyncio.wait_for(
+                self._connected_event.wait(), timeout=CONNECTION_TIMEOUT
+            )
+
+    def create_background_task(
+        self, coro: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Run a coroutine in a background task of the host application."""
+        return self._events.create_background_task(coro, name=name)
+
+    def dispatch_signal(self, signal: str, *args: Any) -> None:
+        """Dispatch a signal of this station to all registered callbacks."""
+        self._events.dispatch(f"{self.host}_{signal}", *args)
+
+    def register_signal_handler(
+        self, signal: str, callback: Callable[..., Any]
+    ) -> Callable[[], None]:
+        """Connect a callback to a signal of this station."""
+        return self._events.connect(f"{self.host}_{signal}", callback)
+
+    def register_push_handler(
+        self,
+        opcode: str,
+        callback: Callable[[EXCSMessage], None],
+        object_id: int | None = None,
+    ) -> Callable[[], None]:
+        """
+        Subscribe a callback to pushed messages with the given opcode.
+
+        Callbacks receive the tokenized message. When ``object_id`` is given,
+        only messages for that object (cab ID, turnout ID) are delivered.
+        Messages without a matching subscriber fall back to the
+        ``SIGNAL_DATA_PUSHED`` signal.
+        """
+        return self._push_router.subscribe(opcode, callback, object_id)
+
+    def register_frame_tap(self, callback: Callable[[str], None]) -> Callable[[], None]:
+        """
+        Subscribe a callback to every frame received from the station.
+
+        Callbacks receive the frame content without the angle brackets before
+        it is correlated or routed, including responses to requests.
+        """
+        self._frame_taps = (*self._frame_taps, callback)
+
+        def unsubscribe() -> None:
+            """Remove the frame tap."""
+            self._frame_taps = tuple(
+                tap for tap in self._frame_taps if tap is not callback
+            )
+
+        return unsubscribe
+
+    async def start_recording(self, path: Path) -> None:
+        """Start recording the frames sent and received to a file."""
+        if self.recorder is not None:
+            msg = f"Already recording to {self.recorder.path}"
+            raise EXCSError(msg)
+        recorder = EXCSWireRecorder(path)
+        await recorder.start()
+        self.recorder = recorder
+
+    async def stop_recording(self) -> int:
+        """Stop the recording in progress and return the number of frames."""
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return 0
+        await recorder.stop()
+        return recorder.recorded
+
+    def feed_frame(self, message: str) -> None:
+        """
+        Deliver a replayed frame to the subscribers of pushed updates.
+
+        Used to replay recorded traffic; the message is the frame content
+        without the angle brackets. Unlike a received frame, it is not traced,
+        recorded, relayed to proxy clients or matched to pending requests, so
+        a replay never interferes with the live link.
+        """
+        if message:
+            self.route_push(message)
+
+    def _trace(self, direction: EXCSWireDirection, frame: str) -> None:
+        """Add a frame to the wire trace and the recording in progress."""
+        self.wire_trace.record(direction, frame)
+        if self.recorder is not None:
+            self.recorder.record(direction, frame)
+
+    def _notify_connection_state(
+        self, *, connected: bool, exc: Exception | None = None
+    ) -> None:
+        """Notify all registered callbacks of connection state change."""
+        if connected != self.connected:
+            self.connected = connected
+            if connected:
+                self._connected_event.set()
+                self.dispatch_signal(SIGNAL_CONNECTED)
+            else:
+                self._connected_event.clear()
+                self.throttle.reset()
+                self.dispatch_signal(SIGNAL_DISCONNECTED, exc)
+
+    @property
+    def connector(self) -> EXCSConnector:
+        """Return the connector opening the link to the EX-CommandStation."""
+        return self._connector
+
+    @property
+    def outbound_stats(self) -> dict[str, float]:
+        """Return the batching counters of the outbound queue."""
+        return self._outbound.stats
+
+    @property
+    def emergency_latency_stats(self) -> dict[str, float | int | None]:
+        """Return press-to-wire latencies of emergency frames in milliseconds."""
+        latencies = self._emergency_latencies
+        return {
+            "last_latency_ms": round(latencies[-1] * 1000, 3) if latencies else None,
+            "max_latency_ms": round(max(latencies) * 1000, 3) if latencies else None,
+            "samples": len(latencies),
+        }
+
+    async def send_command(
+        self,
+        command: str,
+        priority: EXCSCommandPriority = EXCSCommandPriority.INTERACTIVE,
+    ) -> None:
+        """
+        Send a command to the EX-CommandStation.
+
+        Commands issued within the same event loop iteration (or within the
+        configured write window) are sent with a single write, interactive
+        commands ahead of background ones. The call returns once the write
+        containing the command has been drained.
+        """
+        if self._journal_offline(command):
+            return
+
+        await self._send_frame(
+            command,
+            (f"<{command}>\n").encode("ascii"),
+            priority,
+            written=self._correlator.note_uncorrelated,
+        )
+
+    async def send_emergency(
+        self, frame: bytes, issued_at: float | None = None
+    ) -> None:
+        """
+        Send a pre-encoded emergency or power frame ahead of all queued commands.
+
+        ``issued_at`` is the ``time.perf_counter()`` timestamp of the user
+        action; the time until the frame is handed to the transport is
+        recorded as press-to-wire latency.
+        """
+        command = frame.decode("ascii").strip("<>\n")
+        if command == EMERGENCY_STOP:
+            # Nothing requested before the stop may set a cab in motion again
+            self.throttle.emergency_stop()
+        if self._journal_offline(command):
+            return
+
+        issued_at = time.perf_counter() if issued_at is None else issued_at
+        await self._send_frame(
+            command,
+            frame,
+            EXCSCommandPriority.EMERGENCY,
+            issued_at,
+            self._correlator.note_uncorrelated,
+        )
+
+    def _journal_offline(self, command: str) -> bool:
+        """Journal a command while disconnected; return True if journaled."""
+        if self.connected or self.journal is None or not self.journal.record(command):
+            return False
+        LOGGER.debug("Journaled command while disconnected: <%s>", command)
+        return True
+
+    def _on_connected(self) -> None:
+        """Replay the journal and probe the link after (re)connecting."""
+        self._replay_journal()
+        self._send_probe()
+
+    def _replay_journal(self) -> None:
+        """Send the journaled commands as one batch after reconnecting."""
+        if self.journal is None or not (commands := self.journal.take()):
+            return
+        LOGGER.info("Replaying %d journaled commands", len(commands))
+
+        async def replay() -> None:
+            # Sent within one loop iteration, the commands share a single write
+            results = await asyncio.gather(
+                *(self.send_command(command) for command in commands),
+                return_exceptions=True,
+            )
+            for command, result in zip(commands, results, strict=True):
+                if isinstance(result, Exception):
+                    LOGGER.warning("Failed to replay <%s>: %s", command, result)
+
+        self._events.create_background_task(replay(), name="EXCS Journal Replay")
+
+    async def _send_frame(
+        self,
+        command: str,
+        frame: bytes,
+        priority: EXCSCommandPriority,
+        issued_at: float | None = None,
+        written: Callable[[int], None] | None = None,
+    ) -> None:
+        """
+        Send the encoded frame of a command through the outbound queue.
+
+        The command is traced once its frame is written to the transport, so
+        the trace never shows commands that were journaled or failed to be
+        sent. ``written`` is called with the wire sequence number of the frame
+        at that point.
+        """
+        if not self.connected or self._protocol is None:
+            msg = "Cannot send command: not connected to EX-CommandStation"
+            LOGGER.error(msg)
+            raise EXCSConnectionError(msg)
+
+        def traced(sequence: int) -> None:
+            self._trace(EXCSWireDirection.TX, command)
+            if written is not None:
+                written(sequence)
+
+        try:
+            if priority is EXCSCommandPriority.EMERGENCY:
+                # Write immediately, skipping the coalescing queue
+                self._outbound.write_now(frame, traced)
+                if issued_at is not None:
+                    self._emergency_latencies.append(time.perf_counter() - issued_at)
+                await self._outbound.drain()
+            else:
+                # Queue the command for the next write to the EX-CommandStation
+                await self._outbound.send(frame, priority, traced)
+        except OSError as err:
+            msg = f"Error sending command to EX-CommandStation: {err}"
+            LOGGER.error(msg)
+            self._notify_connection_state(connected=False, exc=err)
+            raise EXCSConnectionError(msg) from err
+
+    async def await_command_response(
+        self,
+        command: str,
+        expected_prefix: str,
+        priority: EXCSCommandPriority = EXCSCommandPriority.BACKGROUND,
+        *,
+        retries: int = MAX_REQUEST_RETRIES,
+    ) -> str:
+        """
+        Send a command and wait for a response with the expected prefix.
+
+        Several requests with the same prefix may be in flight at once;
+        they are answered in the order they were sent. Raises
+        ``EXCSCommandFailedError`` if the station rejects the command.
+
+        The timeout follows the measured round-trip time, from the handoff
+        of the frame to the transport until the response arrives, so time
+        spent queued or draining behind other frames is not counted.
+        Unanswered requests are sent again up to ``retries`` times, so only
+        read-only commands may be retried.
+        """
+        sent_at = answered_at = 0.0
+
+        def written(future: asyncio.Future[str], sequence: int) -> None:
+            nonlocal sent_at
+            sent_at = time.monotonic()
+            self._correlator.note_written(expected_prefix, future, sequence)
+
+        def answered(_future: asyncio.Future[str]) -> None:
+            nonlocal answered_at
+            answered_at = time.monotonic()
+
+        for attempt in range(retries + 1):
+            # Register the request before sending so a fast response is not missed
+            future = self._correlator.register(expected_prefix)
+            future.add_done_callback(answered)
+
+            # Wait for the response or timeout and drop the request if unanswered
+            try:
+                await self._send_frame(
+                    command,
+                    (f"<{command}>\n").encode("ascii"),
+                    priority,
+                    written=partial(written, future),
+                )
+                response = await asyncio.wait_for(
+                    future, timeout=self.rtt.response_timeout
+                )
+            except TimeoutError:
+                self.rtt.timed_out()
+                if attempt == retries:
+                    raise
+                self.rtt.retries += 1
+                LOGGER.debug("No response to <%s>, retrying", command)
+                continue
+            finally:
+                self._correlator.discard(expected_prefix, future)
+
+            # Only measure requests answered on their first attempt
+            if attempt == 0:
+                self.rtt.sample(answered_at - sent_at)
+            break
+
+        # Check if the response starts with the expected prefix
+        if not response.startswith(expected_prefix):
+            msg = (
+                f"Unexpected response from EX-CommandStation: {response}. "
+                f"Expected prefix: {expected_prefix}"
+            )
+            LOGGER.error(msg)
+            raise EXCSInvalidResponseError(msg)
+
+        return response
+
+    def _send_probe(self) -> None:
+        """Send a keep-alive probe (after connecting or an idle interval)."""
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        self._probe_task = self._events.create_background_task(
+            self._keep_alive(), name="EXCS Keep-Alive"
+        )
+
+    async def _keep_alive(self) -> None:
+        """Probe the EX-CommandStation and record the round-trip time."""
+        sent_at = time.monotonic()
+        try:
+            response = await self.await_command_response(
+                CMD_KEEP_ALIVE, RESP_KEEP_ALIVE_PREFIX, retries=0
+            )
+        except TimeoutError:
+            # The watchdog closes the connection if the link stays silent
+            self.heartbeat_latencies.timeouts += 1
+            LOGGER.warning("Keep-alive probe was not answered")
+            return
+        except EXCSError as err:
+            LOGGER.warning("Keep-alive failed: %s", err)
+            return
+
+        self.heartbeat_latencies.add(time.monotonic() - sent_at)
+        match tokenize_message(response).args:
+            case (int(slots),):
+                self.loco_slots = slots
+            case _:
+                LOGGER.debug("Unexpected keep-alive response: %s", response)
+        self.dispatch_signal(SIGNAL_HEARTBEAT)
+
+    async def _listener_loop(self) -> None:
+        """
+        Run connection and listener loop for the EX-CommandStation.
+
+        This loop will attempt to connect to the EX-CommandStation and
+        handle incoming messages. If the connection is lost, it reconnects
+        right away and then backs off with random jitter.
+        """
+        backoff = EXCSReconnectBackoff()
+
+        while self._running:
+            try:
+                self._protocol = await self._connector.open(
+                    self._create_protocol, CONNECTION_TIMEOUT
+                )
+                connected_at = time.monotonic()
+                self._record_recovery(connected_at)
+                self._outbound.attach(self._protocol)
+
+                # Mark as connected and notify entities
+                self._notify_connection_state(connected=True)
+                self._on_connected()
+
+                # Handle the stream of data
+                await self.handle_stream()
+                self._link_lost_at = time.monotonic()
+
+                # Start the backoff over after a stable connection, so only
+                # its first reconnect is immediate; a connection that dropped
+                # quickly keeps backing off
+                if self._link_lost_at - connected_at >= STABLE_CONNECTION_TIME:
+                    backoff.reset()
+                delay = backoff.next_delay()
+
+            except (asyncio.CancelledError, KeyboardInterrupt):
+                LOGGER.info("Stopping listener loop due to cancellation")
+                self._notify_connection_state(
+                    connected=False, exc=EXCSConnectionError("Listener loop cancelled")
+                )
+                break
+            except (OSError, TimeoutError) as e:
+                LOGGER.warning("Connection failed or timed out: %s", e)
+                self._notify_connection_state(connected=False, exc=e)
+                delay = backoff.next_delay()
+
+            if delay:
+                LOGGER.warning(
+                    "Reconnecting in %.1f seconds (attempt %d)", delay, backoff.attempts
+                )
+                await asyncio.sleep(delay)
+
+        LOGGER.info("Listener loop stopped")
+
+    def _record_recovery(self, connected_at: float) -> None:
+        """Record the time from losing the link to reconnecting."""
+        if self._link_lost_at is None:
+            return
+        recovery = connected_at - self._link_lost_at
+        self._link_lost_at = None
+        self._recovery_times.append(recovery)
+        LOGGER.info("Reconnected to EX-CommandStation after %.2f seconds", recovery)
+
+    @property
+    def reconnect_stats(self) -> dict[str, float | int | None]:
+        """Return the time to recover after link losses in seconds."""
+        times = self._recovery_times
+        return {
+            "last_recovery_s": round(times[-1], 3) if times else None,
+            "max_recovery_s": round(max(times), 3) if times else None,
+            "reconnects": len(times),
+        }
+
+    def _create_protocol(self) -> EXCSStreamProtocol:
+        """Create the protocol instance for a new connection."""
+        return EXCSStreamProtocol(
+            self._parse_message,
+            HEARTBEAT_TIMEOUT,
+            probe_callback=self._send_probe,
+            probe_interval=HEARTBEAT_INTERVAL,
+        )
+
+    async def handle_stream(self) -> None:
+        """Handle the stream of data from the EX-CommandStation."""
+        if self._protocol is None:
+            msg = "Protocol not initialized"
+            LOGGER.error(msg)
+            self._notify_connection_state(connected=False, exc=EXCSConnectionError(msg))
+            raise EXCSConnectionError(msg)
+
+        try:
+            # Frames are delivered by the protocol until the connection is lost.
+            # EX-CommandStation sends heartbeat messages, so the protocol aborts
+            # the connection when nothing was received within the idle deadline.
+            LOGGER.debug("Listening for incoming messages from EX-CommandStation")
+            await self._protocol.wait_closed()
+
+            # Handle EOF
+            msg = "Connection closed by EX-CommandStation"
+            LOGGER.info(msg)
+            self._notify_connection_state(
+                connected=False,
+                exc=EXCSConnectionError(msg),
+            )
+        except TimeoutError:
+            msg = "Heartbeat timeout"
+            LOGGER.warning(msg)
+            self._notify_connection_state(connected=False, exc=EXCSConnectionError(msg))
+            # Do not raise an exception to reconnect immediately
+        except OSError as err:
+            LOGGER.exception("Error while reading stream")
+            self._notify_connection_state(connected=False, exc=err)
+            # Do not raise an exception to reconnect immediately
+        finally:
+            # Fail unsent commands, close the transport and reset the protocol
+            self._outbound.detach(ConnectionResetError("Connection closed"))
+            self._protocol.close()
+            self._protocol = None
+            LOGGER.debug("Stream closed")
+
+    def _parse_message(self, message: str) -> None:
+        """
+        Parse incoming messages from the EX-CommandStation.
+
+        The message is the content of a single ``<...>`` frame, without the
+        angle brackets, as extracted by the stream protocol.
+        """
+        self._trace(EXCSWireDirection.RX, message)
+
+        for tap in self._frame_taps:
+            tap(message)
+
+        # Check if message is empty
+        if message == "":
+            LOGGER.warning("Empty message received from EX-CommandStation")
+            return
+
+        # Check if message indicates failure
+        # and fail the oldest pending request it belongs to
+        if message == RESP_FAIL:
+            err = EXCSCommandFailedError("EX-CommandStation rejected the command")
+            if not self._correlator.fail_oldest(err):
+                LOGGER.error("EX-CommandStation reported a failure")
+            return
+
+        # Message was awaited via await_command_response()
+        if self._correlator.resolve(message):
+            return
+
+        # Message is a push update
+        self.route_push(message)
+
+    def route_push(self, message: str) -> None:
+        """
+        Route a push update to its subscribers.
+
+        The message is tokenized once and delivered to the object subscribed
+        to it; messages nobody subscribed to are dispatched as
+        ``SIGNAL_DATA_PUSHED``.
+        """
+        pushed = tokenize_message(message)
+        if self._push_router.dispatch(pushed):
+            return
+
+        # Nobody subscribed to this opcode — notify generic subscribers
+        self.dispatch_signal(SIGNAL_DATA_PUSHED, pushed)
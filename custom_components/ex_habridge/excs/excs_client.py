@@ -0,0 +1,126 @@
+"""EX-CommandStation client."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from .commands import command_write_cv
+from .const import LOGGER
+from .excs_config import EXCSConfigClient
+from .excs_exceptions import EXCSError
+from .outbound_queue import EXCSCommandPriority
+
+if TYPE_CHECKING:
+    from .excs_config import EXCSDefinitions
+
+
+class EXCSClient(EXCSConfigClient):
+    """Client for communicating with the EX-CommandStation."""
+
+    async def async_validate_config(self) -> None:
+        """Validate the configuration of the EX-CommandStation client."""
+        if not self.connected:
+            await self.connect()
+
+        # Validate system info
+        LOGGER.debug("Validating EX-CommandStation client configuration")
+        await self.get_excs_system_info()
+        await self.validate_excs_version()
+
+    async def async_setup(self, cached: EXCSDefinitions | None = None) -> None:
+        """
+        Set up the EX-CommandStation client.
+
+        If ``cached`` definitions were read from a station with the same build
+        number, the roster entries, routes and turnouts are created from them
+        instead of being discovered; ``definitions_cached`` tells which way
+        they were obtained. A client validated with ``async_validate_config``
+        keeps its connection and system info.
+        """
+        started_at = time.monotonic()
+        if not self.connected:
+            await self.connect()
+        connected_at = time.monotonic()
+
+        # Fetch EX-CommandStation system info and validate version, unless
+        # the client was already validated
+        LOGGER.debug("Configuring EX-CommandStation client")
+        if not self.system_info.version_parsed:
+            await self.get_excs_system_info()
+        await self.validate_excs_version()
+        system_info_at = time.monotonic()
+
+        self.definitions_cached = self._load_cached_definitions(cached)
+        if not self.definitions_cached:
+            # Discover the roster entries, routes and turnouts concurrently;
+            # their detail requests share the discovery window. They are only
+            # created once all of them were discovered, so a failed attempt
+            # leaves nothing behind for the next one
+            self.load_definitions(await self.discover_definitions())
+        discovered_at = time.monotonic()
+
+        self.setup_times = {
+            "connect": round(connected_at - started_at, 3),
+            "system_info": round(system_info_at - connected_at, 3),
+            "discovery": round(discovered_at - system_info_at, 3),
+            "total": round(discovered_at - started_at, 3),
+        }
+        LOGGER.info(
+            "EX-CommandStation set up in %.2f s (%s of %d roster entries, "
+            "%d routes and %d turnouts in %.2f s)",
+            self.setup_times["total"],
+            "cached definitions" if self.definitions_cached else "discovery",
+            len(self.roster_entries),
+            len(self.routes),
+            len(self.turnouts),
+            self.setup_times["discovery"],
+        )
+
+        # Share the connection with other throttles once it is usable
+        if self.proxy is not None:
+            try:
+                await self.proxy.start()
+            except OSError as err:
+                LOGGER.error("Could not start the proxy server: %s", err)
+
+    def _load_cached_definitions(self, cached: EXCSDefinitions | None) -> bool:
+        """Create the objects from cached definitions if they are still valid."""
+        if cached is None:
+            return False
+        if cached.build_number != self.system_info.build_number:
+            LOGGER.info(
+                "Cached definitions are from build %s, station runs build %s",
+                cached.build_number,
+                self.system_info.build_number,
+            )
+            return False
+        try:
+            self.load_definitions(cached)
+        except EXCSError as err:
+            LOGGER.warning("Discarding invalid cached definitions: %s", err)
+            return False
+        return True
+
+    async def async_shutdown(self) -> None:
+        """Shutdown the EX-CommandStation client."""
+        LOGGER.debug("Shutting down EX-CommandStation client")
+        if self.proxy is not None:
+            await self.proxy.stop()
+        await self.stop_recording()
+        self.resync.cancel()
+        self.throttle.shutdown()
+        try:
+            await self.disconnect()
+        except EXCSError:
+            LOGGER.exception("Error during shutdown of EX-CommandStation client")
+
+    async def write_cv(self, address: int, cv: int, value: int) -> None:
+        """Write a CV of the decoder with the given address on the main track."""
+        command = command_write_cv(address, cv, value)
+        LOGGER.debug("Writing CV: address=%d, cv=%d, value=%d", address, cv, value)
+        try:
+            await self.send_command(command, EXCSCommandPriority.BACKGROUND)
+        except EXCSError as err:
+            LOGGER.error("Error writing CV: %s", err)
+            raise
@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from .commands import (
     CMD_EXCS_SYS_INFO,
+    OPCODE_POWER,
     RESP_EXCS_SYS_INFO_PREFIX,
     RESP_EXCS_SYS_INFO_REGEX,
-    RESP_TRACKS_OFF,
-    RESP_TRACKS_ON,
 )
-from .const import LOGGER, MIN_SUPPORTED_VERSION, SIGNAL_DATA_PUSHED
+from .const import LOGGER, MIN_SUPPORTED_VERSION
 from .excs_base import EXCSBaseClient
 from .excs_exceptions import (
     EXCSConnectionError,
@@ -22,16 +22,19 @@ from .excs_exceptions import (
 )
 from .roster_manager import EXCSRosterManager
 from .routes_manager import EXCSRoutesManager
+from .state_resync import EXCSStateResync
+from .turnout import EXCSTurnout, EXCSTurnoutState
 from .turnouts_manager import EXCSTurnoutsManager
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
-    from homeassistant.core import HomeAssistant
-    from route import EXCSRoute
-
+    from .connectors import EXCSConnector
+    from .events import EXCSEvents
+    from .excs_options import EXCSClientOptions
+    from .messages import EXCSMessage
     from .roster import EXCSRosterEntry
-    from .turnout import EXCSTurnout
+    from .route import EXCSRoute
 
 
 @dataclass
@@ -49,19 +52,46 @@ class EXCSSystemInfo:
     version_parsed: tuple[int, ...] = field(default_factory=tuple)
 
 
+@dataclass
+class EXCSDefinitions:
+    """
+    Definitions of the roster entries, routes and turnouts of a station.
+
+    Each definition is the detail response it was discovered from, so the
+    objects can be created again without asking the station. The build
+    number identifies the station software the definitions were read from.
+    """
+
+    build_number: str = ""
+    roster: list[str] = field(default_factory=list)
+    routes: list[str] = field(default_factory=list)
+    turnouts: list[str] = field(default_factory=list)
+
+
 class EXCSConfigClient(EXCSBaseClient):
     """EX-CommandStation Client with configuration and data retrieval capabilities."""
 
-    def __init__(
-        self, hass: HomeAssistant, host: str, port: int, entry_id: str = ""
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        port: int,
+        entry_id: str = "",
+        options: EXCSClientOptions | None = None,
+        connector: EXCSConnector | None = None,
+        events: EXCSEvents | None = None,
     ) -> None:
         """Initialize the configuration client."""
-        super().__init__(hass, host, port, entry_id)
+        super().__init__(host, port, entry_id, options, connector, events)
         self.system_info = EXCSSystemInfo()
         self.roster_manager = EXCSRosterManager(self)
         self.routes_manager = EXCSRoutesManager(self)
         self.turnouts_manager = EXCSTurnoutsManager(self)
         self.initial_tracks_state: bool = False
+        # Durations of the setup phases in seconds, once the client is set up
+        self.setup_times: dict[str, float] = {}
+        # Whether the roster entries, routes and turnouts came from a cache
+        self.definitions_cached = False
+        self.resync = EXCSStateResync(self)
 
     @property
     def roster_entries(self) -> list[EXCSRosterEntry]:
@@ -78,6 +108,13 @@ class EXCSConfigClient(EXCSBaseClient):
         """Return the list of turnouts."""
         return self.turnouts_manager.turnouts
 
+    def _on_connected(self) -> None:
+        """Resync the state of the known objects after reconnecting."""
+        super()._on_connected()
+        # The first connection is followed by the setup, which reads the state
+        if self.setup_times:
+            self.resync.start()
+
     @classmethod
     def parse_version(cls, version_str: str) -> tuple[int, ...]:
         """Parse a version string into a tuple of integers."""
@@ -95,28 +132,100 @@ class EXCSConfigClient(EXCSBaseClient):
         """Request the list of turnouts from the EX-CommandStation."""
         await self.turnouts_manager.get_turnouts()
 
+    @property
+    def definitions(self) -> EXCSDefinitions:
+        """Return the definitions of the current roster entries, routes and turnouts."""
+        return EXCSDefinitions(
+            self.system_info.build_number,
+            list(self.roster_manager.definitions),
+            list(self.routes_manager.definitions),
+            list(self.turnouts_manager.definitions),
+        )
+
+    def load_definitions(self, definitions: EXCSDefinitions) -> None:
+        """Create the roster entries, routes and turnouts from definitions."""
+        self.roster_manager.load_definitions(definitions.roster)
+        self.routes_manager.load_definitions(definitions.routes)
+        self.turnouts_manager.load_definitions(definitions.turnouts)
+
+    async def discover_definitions(self) -> EXCSDefinitions:
+        """
+        Discover the definitions of the station without replacing the current ones.
+
+        The roster entries, routes and turnouts in use are left untouched;
+        compare the result with ``definitions`` to find what changed, or pass
+        it to ``load_definitions``. They are discovered concurrently; if one
+        of them fails, the others are cancelled and its error is raised.
+        """
+        roster = EXCSRosterManager(self)
+        routes = EXCSRoutesManager(self)
+        turnouts = EXCSTurnoutsManager(self)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(roster.get_roster_entries())
+                group.create_task(routes.get_routes())
+                group.create_task(turnouts.get_turnouts())
+        except ExceptionGroup as err:
+            raise err.exceptions[0] from None
+        return EXCSDefinitions(
+            self.system_info.build_number,
+            roster.definitions,
+            routes.definitions,
+            turnouts.definitions,
+        )
+
+    def apply_turnout_states(self, definitions: EXCSDefinitions) -> bool:
+        """
+        Apply the turnout states of fresher definitions of the same turnouts.
+
+        Changed states are routed as ``<H id state>`` push updates, so
+        subscribers see them as ordinary state changes. Returns False,
+        without applying anything, if the definitions differ in more than
+        the turnout states.
+        """
+        if (
+            definitions.roster != self.roster_manager.definitions
+            or definitions.routes != self.routes_manager.definitions
+        ):
+            return False
+        fresh = [
+            EXCSTurnout.from_detail_response(item) for item in definitions.turnouts
+        ]
+        if [(t.id, t.description) for t in fresh] != [
+            (t.id, t.description) for t in self.turnouts
+        ]:
+            return False
+
+        for current, turnout in zip(self.turnouts, fresh, strict=True):
+            if turnout.state != current.state:
+                current.state = turnout.state
+                digit = int(turnout.state == EXCSTurnoutState.THROWN)
+                self.route_push(f"H {turnout.id} {digit}")
+        self.turnouts_manager.definitions = list(definitions.turnouts)
+        return True
+
     async def _create_initial_tracks_state_handler(self) -> None:
         """Create a one-time signal handler for the initial tracks state."""
         unsub_callback: Callable[..., Any]
 
-        def one_time_track_state_handler(message: str) -> None:
+        def one_time_track_state_handler(message: EXCSMessage) -> None:
             """Handle the initial tracks state message."""
             nonlocal unsub_callback
 
-            if message == RESP_TRACKS_ON:
-                LOGGER.debug("Initial tracks state: ON")
-                self.initial_tracks_state = True
-                unsub_callback()
-            elif message == RESP_TRACKS_OFF:
-                LOGGER.debug("Initial tracks state: OFF")
-                self.initial_tracks_state = False
-                unsub_callback()
-
-        # Register a one-time signal handler for the initial track state
-        unsub_callback = self.register_signal_handler(
-            SIGNAL_DATA_PUSHED, one_time_track_state_handler
+            match message.args:
+                case (1,):
+                    LOGGER.debug("Initial tracks state: ON")
+                    self.initial_tracks_state = True
+                    unsub_callback()
+                case (0,):
+                    LOGGER.debug("Initial tracks state: OFF")
+                    self.initial_tracks_state = False
+                    unsub_callback()
+
+        # Register a one-time push handler for the initial track state
+        unsub_callback = self.register_push_handler(
+            OPCODE_POWER, one_time_track_state_handler
         )
-        self.register_signal_handler(SIGNAL_DATA_PUSHED, one_time_track_state_handler)
 
     async def get_excs_system_info(self) -> None:
         """Request system information from the EX-CommandStation."""
@@ -1,9 +1,12 @@
-"""Exceptions for the EX-CommandStation integration."""
+"""
+Exceptions for the EX-CommandStation client.
 
-from homeassistant.exceptions import InvalidStateError
+They do not depend on Home Assistant; the integration raises them as Home
+Assistant errors where they leave its service handlers.
+"""
 
 
-class EXCSError(InvalidStateError):
+class EXCSError(Exception):
     """Base class for all exceptions raised by the EX-CommandStation integration."""
 
 
@@ -25,3 +28,7 @@ class EXCSValueError(EXCSError):
 
 class EXCSArgumentError(EXCSError):
     """Exception to indicate an invalid argument in the EX-CommandStation command."""
+
+
+class EXCSCommandFailedError(EXCSError):
+    """Exception to indicate the EX-CommandStation rejected a command with <X>."""
@@ -0,0 +1,67 @@
+"""Options of the EX-CommandStation client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    CONF_JOURNAL_TTL_S,
+    CONF_OFFLINE_JOURNAL,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONF_SOCKET_PROFILE,
+    CONF_THROTTLE_WINDOW_MS,
+    CONF_TRANSPORT_WORKER,
+    CONF_WRITE_WINDOW_US,
+    DEFAULT_JOURNAL_TTL_S,
+    DEFAULT_OFFLINE_JOURNAL,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_SOCKET_PROFILE,
+    DEFAULT_THROTTLE_WINDOW_MS,
+    DEFAULT_TRANSPORT_WORKER,
+    DEFAULT_WRITE_WINDOW_US,
+)
+from .socket_profile import EXCSSocketProfile
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+@dataclass(frozen=True)
+class EXCSClientOptions:
+    """Tunable options of the EX-CommandStation client."""
+
+    write_window_us: int = DEFAULT_WRITE_WINDOW_US
+    throttle_window_ms: int = DEFAULT_THROTTLE_WINDOW_MS
+    socket_profile: EXCSSocketProfile = EXCSSocketProfile.LOW_LATENCY
+    offline_journal: bool = DEFAULT_OFFLINE_JOURNAL
+    journal_ttl_s: int = DEFAULT_JOURNAL_TTL_S
+    proxy_port: int = DEFAULT_PROXY_PORT
+    proxy_host: str = DEFAULT_PROXY_HOST
+    transport_worker: bool = DEFAULT_TRANSPORT_WORKER
+
+    @classmethod
+    def from_entry_options(cls, options: Mapping[str, Any]) -> EXCSClientOptions:
+        """Create client options from the options of a config entry."""
+        return cls(
+            write_window_us=int(
+                options.get(CONF_WRITE_WINDOW_US, DEFAULT_WRITE_WINDOW_US)
+            ),
+            throttle_window_ms=int(
+                options.get(CONF_THROTTLE_WINDOW_MS, DEFAULT_THROTTLE_WINDOW_MS)
+            ),
+            socket_profile=EXCSSocketProfile(
+                options.get(CONF_SOCKET_PROFILE, DEFAULT_SOCKET_PROFILE)
+            ),
+            offline_journal=bool(
+                options.get(CONF_OFFLINE_JOURNAL, DEFAULT_OFFLINE_JOURNAL)
+            ),
+            journal_ttl_s=int(options.get(CONF_JOURNAL_TTL_S, DEFAULT_JOURNAL_TTL_S)),
+            proxy_port=int(options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)),
+            proxy_host=str(options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST)),
+            transport_worker=bool(
+                options.get(CONF_TRANSPORT_WORKER, DEFAULT_TRANSPORT_WORKER)
+            ),
+        )
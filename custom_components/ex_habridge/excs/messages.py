@@ -0,0 +1,76 @@
+"""Typed messages tokenized from EX-CommandStation frames."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+from .commands import OPCODE_THROTTLE, OPCODE_TURNOUT_STATE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Tokens of a frame: quoted strings or runs of non-whitespace characters
+TOKEN_REGEX: Final[re.Pattern] = re.compile(r'"([^"]*)"|(\S+)')
+
+
+@dataclass(slots=True, frozen=True)
+class EXCSMessage:
+    """
+    Message received from the EX-CommandStation, tokenized once.
+
+    The opcode is the first character of the frame. Arguments are the
+    whitespace-separated tokens that follow it, converted to ``int`` where
+    they are numeric; quoted strings are unquoted and kept as ``str``.
+    For example ``<l 3 0 130 0>`` becomes opcode ``l`` with the arguments
+    ``(3, 0, 130, 0)`` and ``<p1>`` becomes opcode ``p`` with ``(1,)``.
+    """
+
+    opcode: str
+    args: tuple[int | str, ...]
+    raw: str
+
+    def int_arg(self, index: int) -> int | None:
+        """Return the argument at the given index if it is an integer."""
+        if index < len(self.args) and isinstance(arg := self.args[index], int):
+            return arg
+        return None
+
+
+def _to_int(token: str) -> int | str:
+    """Convert a numeric token to an integer, keep other tokens as strings."""
+    if token.isdigit() or (token[0] == "-" and token[1:].isdigit()):
+        return int(token)
+    return token
+
+
+def _tokenize_generic(body: str) -> tuple[int | str, ...]:
+    """Tokenize arguments that may contain quoted strings."""
+    if '"' not in body:
+        return tuple(_to_int(token) for token in body.split())
+    return tuple(
+        _to_int(bare) if bare else quoted for quoted, bare in TOKEN_REGEX.findall(body)
+    )
+
+
+def _tokenize_numeric(body: str) -> tuple[int | str, ...]:
+    """Tokenize arguments that are expected to be all integers."""
+    try:
+        return tuple(map(int, body.split()))
+    except ValueError:
+        return _tokenize_generic(body)
+
+
+# Opcode dispatch table for the argument tokenizers of frequent messages
+_TOKENIZERS: Final[dict[str, Callable[[str], tuple[int | str, ...]]]] = {
+    OPCODE_THROTTLE: _tokenize_numeric,
+    OPCODE_TURNOUT_STATE: _tokenize_numeric,
+}
+
+
+def tokenize_message(message: str) -> EXCSMessage:
+    """Tokenize the content of a ``<...>`` frame into a typed message."""
+    opcode = message[0]
+    tokenizer = _TOKENIZERS.get(opcode, _tokenize_generic)
+    return EXCSMessage(opcode, tokenizer(message[1:]), message)
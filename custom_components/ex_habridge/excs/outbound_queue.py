@@ -0,0 +1,243 @@
+"""Coalescing outbound queue for commands sent to the EX-CommandStation."""
+
+from __future__ import annotations
+
+import asyncio
+from enum import IntEnum
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .stream_protocol import EXCSStreamProtocol
+
+    # Called with the wire sequence number of a frame once it is written
+    WrittenCallback = Callable[[int], None]
+
+# Maximum number of background frames sent with a single write, so bulk
+# traffic (discovery, CV access) cannot delay interactive commands
+MAX_BACKGROUND_FRAMES_PER_WRITE: Final[int] = 16
+
+
+class EXCSCommandPriority(IntEnum):
+    """Priority classes of outbound commands, highest first."""
+
+    EMERGENCY = 0  # Emergency stop and track power, written immediately
+    INTERACTIVE = 1  # Throttles, turnouts, functions, routes
+    BACKGROUND = 2  # Discovery, CV access, keep-alive
+
+
+class _Lane:
+    """
+    Frames of one priority class waiting for the next write.
+
+    Each frame carries the future of the batch it was queued in: the frames
+    queued between two writes share one batch future.
+    """
+
+    __slots__ = ("batch", "frames")
+
+    def __init__(self) -> None:
+        """Initialize an empty lane."""
+        self.frames: list[
+            tuple[bytes, WrittenCallback | None, asyncio.Future[None]]
+        ] = []
+        self.batch: asyncio.Future[None] | None = None
+
+
+class EXCSOutboundQueue:
+    """
+    Gather outbound frames and send them with a single write.
+
+    Frames queued within the same event loop iteration (or within the
+    configured window) are joined into one ``write`` and one drain. Every
+    sender awaits the future of its batch, so delivery can still be awaited;
+    a batch is resolved once all of its frames were written, however much
+    was queued behind them.
+
+    Frames are written in priority order: interactive frames first, then a
+    bounded number of background frames; remaining background frames go out
+    with the next write. Emergency frames bypass the queue entirely.
+
+    Frames are numbered in the order they are written to the transport;
+    senders may pass a callback receiving the number of their frame.
+    """
+
+    def __init__(self, window_us: int = 0) -> None:
+        """Initialize the queue with the coalescing window in microseconds."""
+        self._window = window_us / 1_000_000
+        self._protocol: EXCSStreamProtocol | None = None
+        self._interactive = _Lane()
+        self._background = _Lane()
+        self._flush_handle: asyncio.Handle | None = None
+        self._drain_tasks: set[asyncio.Task] = set()
+
+        # Counters to verify the batching
+        self.frames_written = 0
+        self.writes = 0
+
+    @property
+    def frames_per_write(self) -> float:
+        """Return the average number of frames per write."""
+        return self.frames_written / self.writes if self.writes else 0.0
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Return the batching counters."""
+        return {
+            "frames_written": self.frames_written,
+            "writes": self.writes,
+            "frames_per_write": round(self.frames_per_write, 2),
+        }
+
+    def attach(self, protocol: EXCSStreamProtocol) -> None:
+        """Start writing to the protocol of a new connection."""
+        self._protocol = protocol
+
+    def detach(self, exc: Exception) -> None:
+        """Stop writing and fail the frames that were not written yet."""
+        self._protocol = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for lane in (self._interactive, self._background):
+            batches = {batch for _, _, batch in lane.frames}
+            lane.frames.clear()
+            lane.batch = None
+            for batch in batches:
+                self._set_exception(batch, exc)
+
+    def write_now(self, frame: bytes, written: WrittenCallback | None = None) -> None:
+        """Write a pre-encoded frame immediately, ahead of all queued frames."""
+        if self._protocol is None:
+            msg = "Outbound queue is not attached to a connection"
+            raise ConnectionResetError(msg)
+
+        self._protocol.write(frame)
+        self.writes += 1
+        self.frames_written += 1
+        if written is not None:
+            written(self.frames_written)
+
+    async def drain(self) -> None:
+        """Wait until the transport buffer is below its high-water mark."""
+        if self._protocol is None:
+            msg = "Outbound queue is not attached to a connection"
+            raise ConnectionResetError(msg)
+        await self._protocol.drain()
+
+    async def send(
+        self,
+        frame: bytes,
+        priority: EXCSCommandPriority = EXCSCommandPriority.INTERACTIVE,
+        written: WrittenCallback | None = None,
+    ) -> None:
+        """
+        Queue a frame and wait until its batch has been written and drained.
+
+        ``written`` is called with the wire sequence number of the frame when
+        it is written. Emergency frames must be sent with ``write_now``
+        instead.
+        """
+        if self._protocol is None:
+            msg = "Outbound queue is not attached to a connection"
+            raise ConnectionResetError(msg)
+
+        lane = (
+            self._interactive
+            if priority is EXCSCommandPriority.INTERACTIVE
+            else self._background
+        )
+        if lane.batch is None:
+            lane.batch = asyncio.get_running_loop().create_future()
+        batch = lane.batch
+        lane.frames.append((frame, written, batch))
+        self._schedule_flush()
+
+        await asyncio.shield(batch)
+
+    def _schedule_flush(self) -> None:
+        """Schedule a write of the queued frames if none is scheduled yet."""
+        if self._flush_handle is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._window:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+        else:
+            self._flush_handle = loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        """Write the queued frames at once, highest priority first."""
+        self._flush_handle = None
+        if self._protocol is None:
+            return
+
+        interactive, background = self._interactive, self._background
+        frames = interactive.frames
+        frames += background.frames[:MAX_BACKGROUND_FRAMES_PER_WRITE]
+        del background.frames[:MAX_BACKGROUND_FRAMES_PER_WRITE]
+        interactive.frames = []
+
+        # Frames queued from now on start new batches
+        interactive.batch = background.batch = None
+        unfinished = None
+        if background.frames:
+            unfinished = background.frames[0][2]
+            self._schedule_flush()
+
+        # Resolve the batches of the written frames, except the background
+        # batch whose remaining frames go out with the next write
+        batches = [
+            batch
+            for batch in dict.fromkeys(batch for _, _, batch in frames)
+            if batch is not unfinished
+        ]
+        if not frames:
+            return
+
+        try:
+            self._protocol.write(b"".join(frame for frame, _, _ in frames))
+        except OSError as err:
+            for batch in batches:
+                self._set_exception(batch, err)
+            return
+
+        self.writes += 1
+        for sequence, (_, written, _) in enumerate(frames, self.frames_written + 1):
+            if written is not None:
+                written(sequence)
+        self.frames_written += len(frames)
+
+        if not self._protocol.writing_paused:
+            for batch in batches:
+                if not batch.done():
+                    batch.set_result(None)
+            return
+
+        # Transport buffer is full: release the senders once it drained
+        task = asyncio.get_running_loop().create_task(
+            self._drain(self._protocol, batches)
+        )
+        self._drain_tasks.add(task)
+        task.add_done_callback(self._drain_tasks.discard)
+
+    async def _drain(
+        self, protocol: EXCSStreamProtocol, batches: list[asyncio.Future[None]]
+    ) -> None:
+        """Wait for the protocol to drain and resolve the batches."""
+        try:
+            await protocol.drain()
+        except OSError as err:
+            for batch in batches:
+                self._set_exception(batch, err)
+        else:
+            for batch in batches:
+                if not batch.done():
+                    batch.set_result(None)
+
+    @staticmethod
+    def _set_exception(batch: asyncio.Future[None], exc: Exception) -> None:
+        """Fail a batch without warnings if none of its senders is waiting."""
+        if not batch.done():
+            batch.set_exception(exc)
+            batch.exception()
@@ -0,0 +1,232 @@
+"""Local DCC-EX server sharing the station connection with other throttles."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Final
+
+from .commands import EMERGENCY_STOP, EMERGENCY_STOP_FRAME, RESP_FAIL
+from .const import DEFAULT_PROXY_HOST, LOGGER, PROXY_CLIENT_BUFFER_SIZE
+from .excs_exceptions import EXCSError
+from .stream_protocol import EXCSFrameParser
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .excs_base import EXCSBaseClient
+
+# Answer to a command that cannot be forwarded, as the station itself sends
+REJECTED_FRAME: Final[bytes] = f"<{RESP_FAIL}>\n".encode("ascii")
+
+
+class _ProxySession:
+    """Connection of one downstream throttle."""
+
+    __slots__ = ("peer", "pending", "writer")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """Initialize the session without pending frames."""
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.pending: list[bytes] = []
+
+
+class EXCSProxyServer:
+    """
+    Fan the station connection of a client out to downstream throttles.
+
+    Downstream clients (JMRI, Engine Driver, ...) connect with the DCC-EX
+    protocol as if to the station itself. Their commands are forwarded
+    through the client's outbound queue, and every frame received from the
+    station is relayed to all of them, so the station serves one connection
+    instead of one per throttle. Responses cannot be matched to the
+    downstream client that asked, so they are relayed to all clients, which
+    ignore responses they did not expect.
+
+    An emergency stop is sent ahead of all queued commands. While the
+    station is unreachable, commands are answered with ``<X>`` instead of
+    being journaled: the throttle that sent them knows they failed, and they
+    cannot contradict what it did by the time the connection is back.
+
+    Frames relayed within one event loop iteration are written to each
+    client at once. A client whose unsent data exceeds ``buffer_size`` bytes
+    is disconnected rather than slowing down the others or buffering without
+    bound; it reconnects and requests the current state again.
+    """
+
+    def __init__(
+        self,
+        client: EXCSBaseClient,
+        port: int,
+        host: str = DEFAULT_PROXY_HOST,
+        buffer_size: int = PROXY_CLIENT_BUFFER_SIZE,
+    ) -> None:
+        """
+        Initialize the server listening on ``host``.
+
+        The server does not authenticate its clients, so it listens on the
+        loopback interface unless another address, e.g. ``0.0.0.0`` for all
+        interfaces, is given explicitly.
+        """
+        self._client = client
+        self._host = host
+        self._port = port
+        self._buffer_size = buffer_size
+        self._server: asyncio.Server | None = None
+        self._sessions: set[_ProxySession] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._flush_handle: asyncio.Handle | None = None
+        self._unsubscribe: Callable[[], None] | None = None
+
+        # Counters of the proxy activity
+        self.forwarded = 0
+        self.rejected = 0
+        self.relayed = 0
+        self.overflows = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the number of clients and the proxy counters."""
+        return {
+            "clients": len(self._sessions),
+            "forwarded": self.forwarded,
+            "rejected": self.rejected,
+            "relayed": self.relayed,
+            "overflows": self.overflows,
+        }
+
+    async def start(self) -> None:
+        """Start listening and relaying the frames received from the station."""
+        self._server = await asyncio.start_server(
+            self._handle_client, self._host, self._port
+        )
+        self._unsubscribe = self._client.register_frame_tap(self._relay)
+        LOGGER.info("Proxy server listening on %s port %d", self._host, self._port)
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect all downstream clients."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._server is not None:
+            self._server.close()
+        for session in list(self._sessions):
+            session.writer.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def _relay(self, message: str) -> None:
+        """Queue a frame received from the station for every downstream client."""
+        if not self._sessions:
+            return
+        frame = f"<{message}>\n".encode("ascii", errors="replace")
+        for session in self._sessions:
+            session.pending.append(frame)
+        self.relayed += 1
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        """Write the pending frames to every client that keeps up with them."""
+        self._flush_handle = None
+        for session in list(self._sessions):
+            data = b"".join(session.pending)
+            session.pending.clear()
+            transport = session.writer.transport
+            if transport.get_write_buffer_size() + len(data) > self._buffer_size:
+                LOGGER.warning(
+                    "Disconnecting proxy client %s: too slow to read the stream",
+                    session.peer,
+                )
+                self.overflows += 1
+                self._sessions.discard(session)
+                transport.abort()
+            elif data:
+                transport.write(data)
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Forward the commands of a downstream client until it disconnects."""
+        session = _ProxySession(writer)
+        self._sessions.add(session)
+        if (task := asyncio.current_task()) is not None:
+            self._handlers.add(task)
+        LOGGER.debug("Proxy client connected: %s", session.peer)
+
+        parser = EXCSFrameParser()
+        try:
+            while data := await reader.read(4096):
+                for commands in _split_at_emergency_stops(parser.feed(data)):
+                    await self._forward_all(session, commands)
+        except ConnectionError:
+            pass
+        finally:
+            self._sessions.discard(session)
+            if task is not None:
+                self._handlers.discard(task)
+            writer.close()
+            LOGGER.debug("Proxy client disconnected: %s", session.peer)
+
+    async def _forward_all(self, session: _ProxySession, commands: list[str]) -> None:
+        """Forward commands together, so they share a write."""
+        results = await asyncio.gather(
+            *(self._forward(session, command) for command in commands),
+            return_exceptions=True,
+        )
+        # A command that fails is dropped without ending the session
+        for command, result in zip(commands, results, strict=True):
+            if isinstance(result, EXCSError):
+                LOGGER.debug("Proxy could not forward <%s>: %s", command, result)
+            elif isinstance(result, Exception):
+                LOGGER.error(
+                    "Proxy could not forward <%s> from %s",
+                    command,
+                    session.peer,
+                    exc_info=result,
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            elif result:
+                self.forwarded += 1
+            else:
+                LOGGER.debug("Proxy rejected <%s> while disconnected", command)
+                self.rejected += 1
+
+    async def _forward(self, session: _ProxySession, command: str) -> bool:
+        """Send a downstream command; return False if it was rejected."""
+        if not self._client.connected:
+            session.writer.write(REJECTED_FRAME)
+            return False
+        if command == EMERGENCY_STOP:
+            await self._client.send_emergency(EMERGENCY_STOP_FRAME)
+        else:
+            await self._client.send_command(command)
+        return True
+
+
+def _split_at_emergency_stops(commands: list[str]) -> list[list[str]]:
+    """
+    Split the commands of one read into groups forwarded one after the other.
+
+    Every emergency stop gets a group of its own: sent ahead of the queue, it
+    would otherwise overtake the commands received before it, which could
+    set a cab in motion again after the stop.
+    """
+    groups: list[list[str]] = []
+    group: list[str] = []
+    for command in commands:
+        if command == EMERGENCY_STOP:
+            groups += [group, [command]] if group else [[command]]
+            group = []
+        else:
+            group.append(command)
+    if group:
+        groups.append(group)
+    return groups
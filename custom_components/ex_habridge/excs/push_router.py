@@ -0,0 +1,86 @@
+"""Opcode-indexed router for messages pushed by the EX-CommandStation."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from .commands import OPCODE_THROTTLE, OPCODE_TURNOUT_STATE
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .messages import EXCSMessage
+
+    PushCallback = Callable[[EXCSMessage], None]
+
+# Opcodes whose first argument identifies the object the message belongs to
+KEYED_OPCODES: Final[frozenset[str]] = frozenset(
+    {OPCODE_THROTTLE, OPCODE_TURNOUT_STATE}
+)
+
+
+class EXCSPushRouter:
+    """
+    Route pushed messages to subscribers by opcode and object ID.
+
+    Subscriptions are indexed as ``opcode -> object ID -> callbacks`` so a
+    message only reaches the callbacks registered for its own object (plus
+    wildcard subscribers of the opcode) instead of being broadcast to every
+    entity. Callback tuples are rebuilt on (un)subscribe, which keeps dispatch
+    free of copies and safe against callbacks that unsubscribe themselves.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty routing table."""
+        self._routes: dict[str, dict[int | None, tuple[PushCallback, ...]]] = {}
+
+    def subscribe(
+        self, opcode: str, callback: PushCallback, object_id: int | None = None
+    ) -> Callable[[], None]:
+        """
+        Subscribe a callback to messages with the given opcode and object ID.
+
+        With ``object_id`` set to None the callback receives every message
+        of the opcode. Returns a function that removes the subscription.
+        """
+        routes = self._routes.setdefault(opcode, {})
+        routes[object_id] = (*routes.get(object_id, ()), callback)
+
+        def unsubscribe() -> None:
+            """Remove the subscription from the routing table."""
+            callbacks = routes.get(object_id, ())
+            if callback not in callbacks:
+                return
+            remaining = tuple(cb for cb in callbacks if cb is not callback)
+            if remaining:
+                routes[object_id] = remaining
+            else:
+                routes.pop(object_id, None)
+
+        return unsubscribe
+
+    def dispatch(self, message: EXCSMessage) -> bool:
+        """
+        Deliver a message to its subscribers.
+
+        Returns True if at least one subscriber received the message.
+        """
+        opcode = message.opcode
+        routes = self._routes.get(opcode)
+        if not routes:
+            return False
+
+        callbacks = routes.get(None, ())
+        if opcode in KEYED_OPCODES:
+            object_id = message.int_arg(0)
+            if object_id is not None:
+                callbacks = routes.get(object_id, ()) + callbacks
+
+        for callback in callbacks:
+            try:
+                callback(message)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Error in push handler for message: %s", message.raw)
+
+        return bool(callbacks)
@@ -0,0 +1,44 @@
+"""Reconnect backoff for the connection to the EX-CommandStation."""
+
+from __future__ import annotations
+
+import random
+
+from .const import MAX_BACKOFF_TIME, RECONNECT_BASE_DELAY
+
+
+class EXCSReconnectBackoff:
+    """
+    Decorrelated jitter backoff with an immediate first retry.
+
+    The first reconnect after a successful connection is attempted right
+    away; every further delay is drawn between the base delay and three
+    times the previous delay, capped at ``MAX_BACKOFF_TIME``. The jitter
+    keeps several clients from reconnecting in lockstep.
+    """
+
+    def __init__(
+        self, base: float = RECONNECT_BASE_DELAY, cap: float = MAX_BACKOFF_TIME
+    ) -> None:
+        """Initialize the backoff."""
+        self._base = base
+        self._cap = cap
+        self._delay = 0.0
+        self.attempts = 0
+
+    def reset(self) -> None:
+        """Start over after a successful connection."""
+        self._delay = 0.0
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """Return the delay in seconds before the next connection attempt."""
+        self.attempts += 1
+        if self.attempts == 1:
+            return 0.0
+        # Not used for cryptographic purposes
+        self._delay = min(
+            self._cap,
+            random.uniform(self._base, max(self._base, self._delay * 3)),  # noqa: S311
+        )
+        return self._delay
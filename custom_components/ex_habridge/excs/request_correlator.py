@@ -0,0 +1,176 @@
+"""Correlator matching EX-CommandStation responses to pending requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+from .const import LOGGER
+
+
+class EXCSRequestCorrelator:
+    """
+    Match responses to pending requests by their expected prefix.
+
+    Every prefix keeps a FIFO queue of waiting futures, so several requests
+    with the same prefix can be in flight at once and are answered in the
+    order they were sent. Responses are looked up by their leading tokens
+    (e.g. ``jR 3`` and then ``jR``) instead of scanning all prefixes.
+
+    The EX-CommandStation answers commands in the order it receives them,
+    so a bare ``<X>`` failure is matched to the oldest pending request, as
+    long as no command without a response may still be unprocessed ahead of
+    it. Commands are numbered in the order they are written to the wire
+    (see ``EXCSOutboundQueue``), which can differ from the order they were
+    issued in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the correlator without pending requests."""
+        self._waiters: dict[str, deque[asyncio.Future[str]]] = {}
+        # Pending prefixes indexed by their first character
+        self._index: dict[str, set[str]] = {}
+
+        # Written requests in wire order, with their sequence numbers and the
+        # sequence number of the last command without a response written
+        # before them
+        self._order: deque[tuple[int, int, str, asyncio.Future[str]]] = deque()
+        # Sequence number of the last command written without awaiting a
+        # response
+        self._uncorrelated_sequence = 0
+        # Sequence number of the last request answered by the station; all
+        # commands written before it have been processed
+        self._answered_sequence = 0
+
+    def __len__(self) -> int:
+        """Return the number of pending requests."""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def register(self, prefix: str) -> asyncio.Future[str]:
+        """Register a request and return a future resolved with its response."""
+        future = asyncio.get_running_loop().create_future()
+        if (waiters := self._waiters.get(prefix)) is None:
+            waiters = self._waiters[prefix] = deque()
+            self._index.setdefault(prefix[0], set()).add(prefix)
+        waiters.append(future)
+        return future
+
+    def note_written(
+        self, prefix: str, future: asyncio.Future[str], sequence: int
+    ) -> None:
+        """Record the wire sequence number of a registered request."""
+        if not future.done():
+            self._order.append((sequence, self._uncorrelated_sequence, prefix, future))
+
+    def note_uncorrelated(self, sequence: int) -> None:
+        """Record the wire sequence number of a command without a response."""
+        self._uncorrelated_sequence = sequence
+
+    def discard(self, prefix: str, future: asyncio.Future[str]) -> None:
+        """Remove a request that is no longer awaited (e.g. after a timeout)."""
+        future.cancel()
+        waiters = self._waiters.get(prefix)
+        if waiters is None:
+            return
+        try:
+            waiters.remove(future)
+        except ValueError:
+            return  # Already resolved and removed
+        if not waiters:
+            self._remove_prefix(prefix)
+        self._prune_order()
+
+    def resolve(self, message: str) -> bool:
+        """
+        Resolve the oldest request waiting for the given message.
+
+        Returns True if the message was consumed as a response.
+        """
+        if not self._waiters:
+            return False
+
+        prefix = self._match_prefix(message)
+        if prefix is None:
+            return False
+
+        waiters = self._waiters[prefix]
+        resolved = False
+        while waiters and not resolved:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(message)
+                resolved = True
+
+        if not waiters:
+            self._remove_prefix(prefix)
+
+        if resolved:
+            self._mark_answered(future)
+        return resolved
+
+    def fail_oldest(self, exc: Exception) -> bool:
+        """
+        Fail the oldest pending request with the given exception.
+
+        Returns False if no written request is pending, or if a command
+        without a response was written after the last answered request and
+        before the oldest pending one, in which case the failure may belong
+        to that command and cannot be attributed.
+        """
+        self._prune_order()
+        if not self._order:
+            return False
+        if self._order[0][1] > self._answered_sequence:
+            return False
+
+        sequence, _, prefix, future = self._order.popleft()
+        self._answered_sequence = max(self._answered_sequence, sequence)
+        self._waiters[prefix].remove(future)
+        if not self._waiters[prefix]:
+            self._remove_prefix(prefix)
+
+        future.set_exception(exc)
+        LOGGER.debug("Failing awaited response with prefix: '%s'", prefix)
+        return True
+
+    def _mark_answered(self, future: asyncio.Future[str]) -> None:
+        """Advance the answered sequence number to a resolved request."""
+        for sequence, _, _, pending in self._order:
+            if pending is future:
+                self._answered_sequence = max(self._answered_sequence, sequence)
+                break
+        self._prune_order()
+
+    def _prune_order(self) -> None:
+        """Drop resolved, failed or abandoned requests from the wire order."""
+        order = self._order
+        while order and order[0][3].done():
+            order.popleft()
+
+    def _remove_prefix(self, prefix: str) -> None:
+        """Drop a prefix without pending requests from the lookup tables."""
+        del self._waiters[prefix]
+        prefixes = self._index[prefix[0]]
+        prefixes.discard(prefix)
+        if not prefixes:
+            del self._index[prefix[0]]
+
+    def _match_prefix(self, message: str) -> str | None:
+        """Find the longest registered prefix matching the message."""
+        tokens = message.split(maxsplit=2)
+
+        # Fast path: prefixes made of whole tokens, longest first
+        if len(tokens) > 1 and (key := f"{tokens[0]} {tokens[1]}") in self._waiters:
+            return key
+        if tokens and tokens[0] in self._waiters:
+            return tokens[0]
+
+        # Slow path: prefixes that do not end on a token boundary (e.g. "jA."),
+        # limited to the prefixes sharing the first character of the message
+        candidates = [
+            prefix
+            for prefix in self._index.get(message[0], ())
+            if message.startswith(prefix)
+            and not message[len(prefix) : len(prefix) + 1].isalnum()
+        ]
+        return max(candidates, key=len, default=None)
@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import re
 from enum import Enum
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from .excs_exceptions import EXCSInvalidResponseError, EXCSValueError
 
+if TYPE_CHECKING:
+    from .messages import EXCSMessage
+
 
 class EXCSRosterConsts:
     """Constants for EX-CommandStation roster."""
@@ -37,9 +40,6 @@ class EXCSRosterConsts:
     )
 
     RESP_THROTTLE_PREFIX_FMT: Final[str] = "l {cab_id}"
-    RESP_THROTTLE_REGEX: Final[re.Pattern] = re.compile(
-        r"l\s+(?P<cab>\d+)\s+(?:[+-]?\d+)\s+(?P<speed_byte>\d+)\s+(?P<function_map>\d+)"
-    )
 
 
 class EXCSLocoDirection(Enum):
@@ -89,11 +89,6 @@ class EXCSRosterEntry:
         self.direction = EXCSLocoDirection.FORWARD
         self.emergency_stop = False
 
-        # Prefix to find out loco state in incoming messages
-        self.recv_prefix = EXCSRosterConsts.RESP_THROTTLE_PREFIX_FMT.format(
-            cab_id=self.id
-        )
-
         # Parse functions from the functions string
         if functions_str:
             self._parse_functions(functions_str)
@@ -113,27 +108,10 @@ class EXCSRosterEntry:
         """Get the current speed as a percentage."""
         return round((self.speed / EXCSRosterConsts.SPEED_STEPS) * 100)
 
-    def set_speed_pct_cmd(self, speed_pct: float) -> str:
-        """Construct a command to set the locomotive speed using percentage."""
-        # Convert percentage to speed steps (0-126)
-        speed_steps = round((speed_pct / 100.0) * EXCSRosterConsts.SPEED_STEPS)
-        return EXCSRosterConsts.CMD_SET_LOCO_SPEED_FMT.format(
-            cab_id=self.id, speed=speed_steps, direction=self.direction.value
-        )
-
-    def set_speed_step_cmd(self, speed_step: int) -> str:
-        """Construct a command to set the locomotive speed using step value."""
-        # Clamp speed_step to valid range
-        speed_step = max(0, min(EXCSRosterConsts.SPEED_STEPS, speed_step))
-        return EXCSRosterConsts.CMD_SET_LOCO_SPEED_FMT.format(
-            cab_id=self.id, speed=speed_step, direction=self.direction.value
-        )
-
-    def set_direction_cmd(self, direction: EXCSLocoDirection) -> str:
-        """Construct a command to set the locomotive direction."""
-        return EXCSRosterConsts.CMD_SET_LOCO_SPEED_FMT.format(
-            cab_id=self.id, speed=self.speed, direction=direction.value
-        )
+    @staticmethod
+    def speed_steps_from_pct(speed_pct: float) -> int:
+        """Convert a speed percentage to speed steps (0-126)."""
+        return round((speed_pct / 100.0) * EXCSRosterConsts.SPEED_STEPS)
 
     def toggle_function_cmd(self, function_id: int, state: EXCSLocoFunctionCmd) -> str:
         """Construct a command to set the function state."""
@@ -162,9 +140,10 @@ class EXCSRosterEntry:
             # Create the function object and add it to the functions dictionary
             self.functions[function_id] = EXCSLocoFunction(function_id, label)
 
-    def _parse_speed_byte(self, speed_byte: int) -> None:
+    @staticmethod
+    def decode_speed_byte(speed_byte: int) -> tuple[int, EXCSLocoDirection, bool]:
         """
-        Parse the speed byte from the throttle response and update variables.
+        Decode the speed byte of a throttle response.
 
         Docs: https://dcc-ex.com/reference/software/command-summary-consolidated.html#t-cab-speed-dir-set-cab-loco-speed
 
@@ -177,35 +156,40 @@ class EXCSRosterEntry:
           - 129 = emergency stop
           - 130-255 = reverse speed (1-126)
         - Bit 7: Direction (0 = reverse, 1 = forward)
+
+        Returns the speed, direction and emergency stop state.
         """
         # Extract direction from bit 7
-        self.direction = EXCSLocoDirection((speed_byte & 0x80) != 0)
-
-        # Determine if emergency stop is active (speed_byte 1 or 129)
-        self.emergency_stop = bool(speed_byte in {1, 129})
+        direction = EXCSLocoDirection((speed_byte & 0x80) != 0)
 
-        # If emergency stop is active, set speed to 0 and skip further processing
-        if self.emergency_stop:
-            self.speed = 0
-            return
+        # If emergency stop is active (speed_byte 1 or 129), the speed is 0
+        if speed_byte in {1, 129}:
+            return 0, direction, True
 
         # Extract and calculate speed from bits 0-6
         raw_speed_value = speed_byte & 0x7F  # Mask to get bits 0-6
         if raw_speed_value == 0:
-            self.speed = 0  # Normal stop
-        else:
-            self.speed = raw_speed_value - 1  # Adjust to 1-126 range
-
-    def process_throttle_response(self, message: str) -> None:
-        """Update the roster entry from a throttle response."""
-        match = EXCSRosterConsts.RESP_THROTTLE_REGEX.match(message)
-        if not match:
-            msg = f"Invalid throttle response: {message}"
-            raise EXCSInvalidResponseError(msg)
-
-        cab_id = int(match.group("cab"))
-        speed_byte = int(match.group("speed_byte"))
-        function_map = int(match.group("function_map"))
+            return 0, direction, False  # Normal stop
+        return raw_speed_value - 1, direction, False  # Adjust to 1-126 range
+
+    def _parse_speed_byte(self, speed_byte: int) -> None:
+        """Parse the speed byte from the throttle response and update variables."""
+        self.speed, self.direction, self.emergency_stop = self.decode_speed_byte(
+            speed_byte
+        )
+
+    def process_throttle_response(self, message: EXCSMessage) -> None:
+        """
+        Update the roster entry from a tokenized throttle response.
+
+        Format: ``<l cab reg speedByte functMap>``
+        """
+        match message.args:
+            case (int(cab_id), int(), int(speed_byte), int(function_map)):
+                pass  # Arguments bound by the pattern
+            case _:
+                msg = f"Invalid throttle response: {message.raw}"
+                raise EXCSInvalidResponseError(msg)
 
         # Check if the cab ID matches the roster entry ID
         if cab_id != self.id:
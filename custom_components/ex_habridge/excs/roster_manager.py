@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from .const import LOGGER
-from .excs_exceptions import EXCSConnectionError, EXCSError, EXCSInvalidResponseError
+from .excs_exceptions import (
+    EXCSCommandFailedError,
+    EXCSConnectionError,
+    EXCSError,
+    EXCSInvalidResponseError,
+)
 from .roster import EXCSRosterConsts, EXCSRosterEntry
 
 if TYPE_CHECKING:
@@ -19,6 +25,8 @@ class EXCSRosterManager:
         """Initialize the roster manager with the EX-CommandStation client."""
         self.client = client
         self.entries: list[EXCSRosterEntry] = []
+        # Detail responses the entries were created from, for the definition cache
+        self.definitions: list[str] = []
 
     async def get_roster_entries(self) -> list[EXCSRosterEntry]:
         """Request and return list of roster entries from the EX-CommandStation."""
@@ -28,30 +36,52 @@ class EXCSRosterManager:
 
         LOGGER.debug("Requesting list of roster entries from EX-CommandStation")
 
-        # Clear existing roster entries
-        self.entries.clear()
-
         # Get list of roster entry IDs
         roster_ids = await self._get_roster_ids()
 
         if not roster_ids:
             LOGGER.debug("No roster entries found")
+            self.entries, self.definitions = [], []
             return self.entries
 
         LOGGER.debug("Found roster entry IDs: %s", ",".join(roster_ids))
 
-        # Get details for each roster entry ID
+        # Skip empty roster entry IDs
+        valid_ids = []
         for raw_roster_id in roster_ids:
-            roster_id = raw_roster_id.strip()
-            if not roster_id:
+            if roster_id := raw_roster_id.strip():
+                valid_ids.append(roster_id)
+            else:
                 LOGGER.warning("Empty roster ID found, skipping")
-                continue
 
-            # Get details for the roster entry
-            entry = await self._get_roster_entry_details(roster_id)
-            self.entries.append(entry)
+        # Get details for all roster entry IDs, pipelined within the discovery window
+        results = await asyncio.gather(
+            *(self._get_roster_entry_details(roster_id) for roster_id in valid_ids),
+            return_exceptions=True,
+        )
+        # Replace the current entries only once every detail was read
+        entries: list[EXCSRosterEntry] = []
+        definitions: list[str] = []
+        for roster_id, result in zip(valid_ids, results, strict=True):
+            if isinstance(result, EXCSCommandFailedError):
+                LOGGER.warning("Roster entry %s rejected, skipping", roster_id)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            entry, response = result
+            entries.append(entry)
+            definitions.append(response)
             LOGGER.debug("Roster entry detail: %s", entry)
 
+        self.entries, self.definitions = entries, definitions
+        return self.entries
+
+    def load_definitions(self, definitions: list[str]) -> list[EXCSRosterEntry]:
+        """Create the roster entries from previously discovered detail responses."""
+        self.entries = [
+            EXCSRosterEntry.from_detail_response(item) for item in definitions
+        ]
+        self.definitions = list(definitions)
         return self.entries
 
     async def _get_roster_ids(self) -> list[str]:
@@ -89,18 +119,25 @@ class EXCSRosterManager:
         msg = f"Invalid response for roster list: {response}"
         raise EXCSInvalidResponseError(msg)
 
-    async def _get_roster_entry_details(self, roster_id: str) -> EXCSRosterEntry:
-        """Get details for a specific roster entry ID."""
+    async def _get_roster_entry_details(
+        self, roster_id: str
+    ) -> tuple[EXCSRosterEntry, str]:
+        """Get details and the detail response for a specific roster entry ID."""
         try:
-            response = await self.client.await_command_response(
-                EXCSRosterConsts.CMD_GET_ROSTER_DETAILS_FMT.format(cab_id=roster_id),
-                EXCSRosterConsts.RESP_DETAILS_PREFIX_FMT.format(cab_id=roster_id),
-            )
-            return EXCSRosterEntry.from_detail_response(response)
+            async with self.client.discovery_window:
+                response = await self.client.await_command_response(
+                    EXCSRosterConsts.CMD_GET_ROSTER_DETAILS_FMT.format(
+                        cab_id=roster_id
+                    ),
+                    EXCSRosterConsts.RESP_DETAILS_PREFIX_FMT.format(cab_id=roster_id),
+                )
+            return EXCSRosterEntry.from_detail_response(response), response
         except TimeoutError:
             msg = f"Timeout waiting for roster details for ID {roster_id}"
             LOGGER.error(msg)
             raise EXCSConnectionError(msg) from None
+        except EXCSCommandFailedError:
+            raise  # Rejected IDs are skipped by the caller
         except EXCSError as err:
             LOGGER.error("Error getting roster detail: %s", err)
             raise
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from .const import LOGGER
 from .excs_exceptions import (
+    EXCSCommandFailedError,
     EXCSConnectionError,
     EXCSError,
     EXCSInvalidResponseError,
@@ -23,6 +25,8 @@ class EXCSRoutesManager:
         """Initialize the routes manager with the EX-CommandStation client."""
         self.client = client
         self.routes: list[EXCSRoute] = []
+        # Detail responses the routes were created from, for the definition cache
+        self.definitions: list[str] = []
 
     async def get_routes(self) -> list[EXCSRoute]:
         """Request and return list of routes from the EX-CommandStation."""
@@ -32,26 +36,44 @@ class EXCSRoutesManager:
 
         LOGGER.debug("Requesting list of routes from EX-CommandStation")
 
-        # Clear existing routes
-        self.routes.clear()
-
         # Get list of route IDs
         route_ids = await self._get_routes_list()
 
         if not route_ids:
             LOGGER.debug("No routes found")
+            self.routes, self.definitions = [], []
             return self.routes
 
         LOGGER.debug("Found route IDs: %s", " ".join(route_ids))
 
-        # Get details for each route ID
-        for route_id in route_ids:
-            route = await self._get_route_details(route_id)
+        # Get details for all route IDs, pipelined within the discovery window
+        results = await asyncio.gather(
+            *(self._get_route_details(route_id) for route_id in route_ids),
+            return_exceptions=True,
+        )
+        # Collected aside, so a failed discovery keeps the current routes
+        routes: list[EXCSRoute] = []
+        definitions: list[str] = []
+        for route_id, result in zip(route_ids, results, strict=True):
+            if isinstance(result, EXCSCommandFailedError):
+                LOGGER.warning("Route %s rejected, skipping", route_id)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            route, response = result
             # Ignore if type is X (unknown/undefined)
             if route.type != EXCSRouteType.UNKNOWN:
-                self.routes.append(route)
+                routes.append(route)
+                definitions.append(response)
             LOGGER.debug("Route detail: %s", route)
 
+        self.routes, self.definitions = routes, definitions
+        return self.routes
+
+    def load_definitions(self, definitions: list[str]) -> list[EXCSRoute]:
+        """Create the routes from previously discovered detail responses."""
+        self.routes = [EXCSRoute.from_detail_response(item) for item in definitions]
+        self.definitions = list(definitions)
         return self.routes
 
     async def _get_routes_list(self) -> list[str]:
@@ -86,18 +108,21 @@ class EXCSRoutesManager:
         msg = f"Invalid response for route list: {response}"
         raise EXCSInvalidResponseError(msg)
 
-    async def _get_route_details(self, route_id: str) -> EXCSRoute:
-        """Get details for a specific route ID."""
+    async def _get_route_details(self, route_id: str) -> tuple[EXCSRoute, str]:
+        """Get details and the detail response for a specific route ID."""
         try:
-            response = await self.client.await_command_response(
-                EXCSRouteConsts.CMD_GET_ROUTE_DETAILS_FMT.format(id=route_id),
-                EXCSRouteConsts.RESP_DETAILS_PREFIX_FMT.format(id=route_id),
-            )
-            return EXCSRoute.from_detail_response(response)
+            async with self.client.discovery_window:
+                response = await self.client.await_command_response(
+                    EXCSRouteConsts.CMD_GET_ROUTE_DETAILS_FMT.format(id=route_id),
+                    EXCSRouteConsts.RESP_DETAILS_PREFIX_FMT.format(id=route_id),
+                )
+            return EXCSRoute.from_detail_response(response), response
         except TimeoutError:
             msg = f"Timeout waiting for route detail response for ID {route_id}"
             LOGGER.error(msg)
             raise EXCSConnectionError(msg) from None
+        except EXCSCommandFailedError:
+            raise  # Rejected IDs are skipped by the caller
         except EXCSError as err:
             msg = f"Error getting route detail for ID {route_id}: {err}"
             LOGGER.error(msg)
@@ -0,0 +1,118 @@
+"""Round-trip time estimator for requests sent to the EX-CommandStation."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Final
+
+from .const import (
+    MAX_RESPONSE_TIMEOUT,
+    MIN_RESPONSE_TIMEOUT,
+    RESPONSE_TIMEOUT,
+)
+
+# Gains and variance factor from RFC 6298 (Jacobson/Karels)
+ALPHA: Final[float] = 1 / 8
+BETA: Final[float] = 1 / 4
+K: Final[int] = 4
+
+
+class EXCSRttEstimator:
+    """
+    Smoothed round-trip time and variance of request/response pairs.
+
+    The response timeout is ``srtt + 4 * rttvar``, clamped to sane bounds,
+    and doubles after every timeout until the next measurement (RFC 6298).
+    Only requests answered on their first attempt are measured, so a late
+    response to a retried request cannot be mistaken for a fast one.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the estimator without measurements."""
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.samples = 0
+        self.timeouts = 0
+        self.retries = 0
+        self._backoff = 1
+
+    @property
+    def response_timeout(self) -> float:
+        """Return the timeout of the next request in seconds."""
+        if self.srtt is None or self.rttvar is None:
+            timeout = RESPONSE_TIMEOUT
+        else:
+            timeout = max(MIN_RESPONSE_TIMEOUT, self.srtt + K * self.rttvar)
+        return min(MAX_RESPONSE_TIMEOUT, timeout * self._backoff)
+
+    @property
+    def stats(self) -> dict[str, float | int | None]:
+        """Return the current estimate in milliseconds and the counters."""
+        return {
+            "srtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+            "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000, 1),
+            "timeout_ms": round(self.response_timeout * 1000),
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+        }
+
+    def sample(self, rtt: float) -> None:
+        """Update the estimate with a measured round-trip time in seconds."""
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.samples += 1
+        self._backoff = 1
+
+    def timed_out(self) -> None:
+        """Back off the response timeout after an unanswered request."""
+        self.timeouts += 1
+        self._backoff = min(self._backoff * 2, 64)
+
+
+class EXCSLatencyWindow:
+    """Percentiles of the most recent latency samples."""
+
+    def __init__(self, size: int = 100) -> None:
+        """Initialize an empty window keeping the given number of samples."""
+        self._samples: deque[float] = deque(maxlen=size)
+        self.timeouts = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        """Add a latency sample in seconds."""
+        self._samples.append(latency)
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the given percentile in seconds (nearest rank)."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def stats(self) -> dict[str, float | int | None]:
+        """Return the last sample and percentiles in milliseconds."""
+        samples = self._samples
+
+        def to_ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "last_ms": to_ms(samples[-1] if samples else None),
+            "p50_ms": to_ms(self.percentile(50)),
+            "p95_ms": to_ms(self.percentile(95)),
+            "p99_ms": to_ms(self.percentile(99)),
+            "max_ms": to_ms(max(samples, default=None)),
+            "samples": len(samples),
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,57 @@
+"""Socket options applied to the connection to the EX-CommandStation."""
+
+from __future__ import annotations
+
+import socket
+from enum import StrEnum
+from typing import Final
+
+from .const import LOGGER
+
+# TCP keepalive: first probe after 10 s idle, then every 5 s, dead after 3 misses
+KEEPALIVE_IDLE: Final[int] = 10
+KEEPALIVE_INTERVAL: Final[int] = 5
+KEEPALIVE_COUNT: Final[int] = 3
+
+# Commands and responses are tiny; small buffers keep queued data from
+# building up latency behind a congested link
+SEND_BUFFER_SIZE: Final[int] = 16 * 1024
+RECEIVE_BUFFER_SIZE: Final[int] = 64 * 1024
+
+
+class EXCSSocketProfile(StrEnum):
+    """Socket option profiles for the station connection."""
+
+    SYSTEM = "system"  # Leave the socket as created by the event loop
+    LOW_LATENCY = "low_latency"  # No Nagle delay, fast dead-peer detection
+
+
+def apply_socket_profile(sock: socket.socket, profile: EXCSSocketProfile) -> None:
+    """
+    Apply the socket options of a profile to a connected TCP socket.
+
+    Options missing on the platform (e.g. ``TCP_KEEPIDLE`` on macOS) are
+    skipped.
+    """
+    if profile is EXCSSocketProfile.SYSTEM:
+        return
+
+    options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE),
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE),
+    ]
+    for name, value in (
+        ("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+        ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+        ("TCP_KEEPCNT", KEEPALIVE_COUNT),
+    ):
+        if (option := getattr(socket, name, None)) is not None:
+            options.append((socket.IPPROTO_TCP, option, value))
+
+    for level, option, value in options:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError as err:
+            LOGGER.debug("Could not set socket option %s: %s", option, err)
@@ -0,0 +1,144 @@
+"""Resynchronization of the loco and turnout states after reconnecting."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from .const import LOGGER, SIGNAL_RESYNCED
+from .excs_exceptions import EXCSError
+from .outbound_queue import EXCSCommandPriority
+from .roster import EXCSRosterConsts
+from .turnout import EXCSTurnout, EXCSTurnoutConsts, EXCSTurnoutState
+
+if TYPE_CHECKING:
+    from .excs_config import EXCSConfigClient
+    from .roster import EXCSRosterEntry
+
+
+class EXCSStateResync:
+    """
+    Read the state of every known loco and turnout again in a single pass.
+
+    The requests are sent as background commands, so they share writes, and
+    at most ``DISCOVERY_WINDOW`` of them are in flight at once. Loco states
+    are delivered as pushed throttle updates; turnouts whose state differs
+    from the known one are pushed as state updates. ``SIGNAL_RESYNCED`` is
+    dispatched once the pass ends.
+    """
+
+    def __init__(self, client: EXCSConfigClient) -> None:
+        """Initialize the resync of a client."""
+        self._client = client
+        self._task: asyncio.Task | None = None
+        self.passes = 0
+        self.last_duration_s: float | None = None
+        self.last_changed = 0
+        # Objects whose state could not be read in the last pass
+        self.last_failed: list[str] = []
+
+    @property
+    def stats(self) -> dict[str, float | int | list[str] | None]:
+        """Return the counters of the resync passes."""
+        return {
+            "passes": self.passes,
+            "last_duration_s": self.last_duration_s,
+            "last_changed": self.last_changed,
+            "last_failed": self.last_failed,
+        }
+
+    def start(self) -> None:
+        """Start a pass, cancelling a pass still running."""
+        self.cancel()
+        self._task = self._client.create_background_task(
+            self.run(), "EXCS State Resync"
+        )
+
+    def cancel(self) -> None:
+        """Cancel a pass still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def run(self) -> None:
+        """
+        Read the state of every loco and turnout and report what failed.
+
+        ``SIGNAL_RESYNCED`` is dispatched however the pass ends, as long as
+        the client is connected, so entities do not stay unavailable.
+        """
+        try:
+            await self._resync()
+        finally:
+            if self._client.connected:
+                self._client.dispatch_signal(SIGNAL_RESYNCED)
+
+    async def _resync(self) -> None:
+        """Run a pass and record its duration and results."""
+        client = self._client
+        started_at = time.monotonic()
+        locos = list(client.roster_entries)
+        turnouts = list(client.turnouts)
+
+        results = await asyncio.gather(
+            *(self._resync_loco(loco) for loco in locos),
+            *(self._resync_turnout(turnout) for turnout in turnouts),
+            return_exceptions=True,
+        )
+        names = [f"loco {loco.id}" for loco in locos] + [
+            f"turnout {turnout.id}" for turnout in turnouts
+        ]
+        failed = []
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, EXCSError | TimeoutError):
+                failed.append(name)
+            elif isinstance(result, BaseException):
+                raise result
+
+        self.passes += 1
+        self.last_duration_s = round(time.monotonic() - started_at, 3)
+        self.last_changed = sum(result is True for result in results)
+        self.last_failed = failed
+        if failed:
+            LOGGER.warning(
+                "Could not resync the state of %d of %d objects: %s",
+                len(failed),
+                len(names),
+                ", ".join(failed),
+            )
+        else:
+            LOGGER.info(
+                "Resynced %d locos and %d turnouts in %.2f s (%d turnouts changed)",
+                len(locos),
+                len(turnouts),
+                self.last_duration_s,
+                self.last_changed,
+            )
+
+    async def _resync_loco(self, loco: EXCSRosterEntry) -> bool:
+        """Request the throttle state of a loco and push it to its subscribers."""
+        async with self._client.discovery_window:
+            response = await self._client.await_command_response(
+                loco.get_status_cmd(),
+                EXCSRosterConsts.RESP_THROTTLE_PREFIX_FMT.format(cab_id=loco.id),
+                EXCSCommandPriority.BACKGROUND,
+            )
+        self._client.route_push(response)
+        return False
+
+    async def _resync_turnout(self, turnout: EXCSTurnout) -> bool:
+        """Request the state of a turnout; return True if it changed."""
+        async with self._client.discovery_window:
+            response = await self._client.await_command_response(
+                EXCSTurnoutConsts.CMD_GET_TURNOUT_DETAILS_FMT.format(id=turnout.id),
+                EXCSTurnoutConsts.RESP_DETAILS_PREFIX_FMT.format(id=turnout.id),
+                EXCSCommandPriority.BACKGROUND,
+            )
+        state = EXCSTurnout.from_detail_response(response).state
+        if state == turnout.state:
+            return False
+        turnout.state = state
+        digit = int(state == EXCSTurnoutState.THROWN)
+        self._client.route_push(f"H {turnout.id} {digit}")
+        return True
@@ -0,0 +1,269 @@
+"""Streaming protocol and frame parser for the EX-CommandStation connection."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, Final
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+FRAME_START: Final[int] = ord("<")
+FRAME_END: Final[int] = ord(">")
+QUOTE: Final[int] = ord('"')
+NEWLINE: Final[int] = ord("\n")
+
+# Complete frame without quoted text, which is not a diagnostic frame
+PLAIN_FRAME_REGEX: Final[re.Pattern[bytes]] = re.compile(rb'<(?!\*)([^<>"]*)>')
+# Bytes ending or truncating a frame (outside quoted text) or toggling quotes
+FRAME_TOKEN_REGEX: Final[re.Pattern[bytes]] = re.compile(rb'["<>\n]')
+# Diagnostic frames ("<* ... *>") hold free text and end with "*>"
+DIAGNOSTIC_START: Final[bytes] = b"<*"
+DIAGNOSTIC_END_REGEX: Final[re.Pattern[bytes]] = re.compile(rb"\*>|\n")
+
+# Upper bound for an unterminated frame before the buffer is discarded
+MAX_FRAME_SIZE: Final[int] = 4096
+
+
+class EXCSFrameParser:
+    """
+    Extract ``<...>`` frames from a byte stream.
+
+    Frame boundaries are found by scanning the buffer, so any number of frames
+    per read is supported, as well as frames split across several reads or
+    packed on a single line. Bytes outside of frames (line breaks, diagnostic
+    output) are dropped.
+
+    ``<`` and ``>`` inside quoted text (roster and turnout descriptions) and
+    inside diagnostic frames (``<* ... *>``) belong to the frame. Otherwise a
+    ``<`` within a frame means it was truncated: the parser resynchronizes on
+    the frame that follows. A line break inside quoted text or a diagnostic
+    frame also ends a truncated frame, so a lost closing quote cannot swallow
+    the frames after it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser with an empty buffer."""
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[str]:
+        """Add received bytes and return the contents of all complete frames."""
+        buffer = self._buffer
+        buffer += data
+        frames: list[str] = []
+
+        start = buffer.find(FRAME_START)
+        while start >= 0:
+            # Most frames hold neither quoted nor diagnostic text
+            if match := PLAIN_FRAME_REGEX.match(buffer, start):
+                frames.append(match[1].decode("ascii", errors="replace"))
+                start = buffer.find(FRAME_START, match.end())
+                continue
+
+            end = self._frame_end(buffer, start)
+            if end < 0:
+                break
+            if buffer[end] == FRAME_END:
+                frames.append(buffer[start + 1 : end].decode("ascii", errors="replace"))
+                start = buffer.find(FRAME_START, end + 1)
+            elif buffer[end] == FRAME_START:
+                # Resynchronize on the frame following a truncated one
+                start = end
+            else:
+                # A line break ended quoted text left open by a truncated frame
+                start = buffer.find(FRAME_START, end + 1)
+        else:
+            start = len(buffer)
+
+        # Keep only the unterminated frame (if any) for the next read
+        del buffer[:start]
+        if len(buffer) > MAX_FRAME_SIZE:
+            LOGGER.warning("Discarding %d bytes of unterminated frame", len(buffer))
+            buffer.clear()
+
+        return frames
+
+    @staticmethod
+    def _frame_end(buffer: bytearray, start: int) -> int:
+        """
+        Return the position of the byte ending the frame starting at ``start``.
+
+        That is the closing ``>`` of a complete frame, or the ``<`` or line
+        break truncating it; -1 if the frame is still incomplete.
+        """
+        if buffer.startswith(DIAGNOSTIC_START, start):
+            if match := DIAGNOSTIC_END_REGEX.search(buffer, start + 1):
+                return match.end() - 1
+            return -1
+
+        quoted = False
+        pos = start + 1
+        while match := FRAME_TOKEN_REGEX.search(buffer, pos):
+            pos = match.start()
+            byte = buffer[pos]
+            if byte == QUOTE:
+                quoted = not quoted
+            elif byte == NEWLINE:
+                if quoted:
+                    return pos
+            elif not quoted:
+                return pos
+            pos += 1
+        return -1
+
+
+class EXCSStreamProtocol(asyncio.Protocol):
+    """
+    Protocol delivering EX-CommandStation frames to a callback.
+
+    Liveness is enforced by a single connection-level watchdog: each read
+    only stores its timestamp, and one timer checks the link when it expires,
+    rescheduling itself if data arrived in the meantime. After
+    ``probe_interval`` without received data the probe callback is invoked
+    (again after every further interval); the connection is aborted once
+    nothing was received for ``idle_timeout``.
+    """
+
+    def __init__(
+        self,
+        frame_callback: Callable[[str], None],
+        idle_timeout: float,
+        probe_callback: Callable[[], None] | None = None,
+        probe_interval: float | None = None,
+    ) -> None:
+        """Initialize the protocol."""
+        self._frame_callback = frame_callback
+        self._idle_timeout = idle_timeout
+        self._probe_callback = probe_callback
+        self._probe_interval = probe_interval
+        self._last_probe = 0.0
+        self._parser = EXCSFrameParser()
+        self._loop = asyncio.get_running_loop()
+        self._transport: asyncio.Transport | None = None
+        self._closed: asyncio.Future[None] = self._loop.create_future()
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._idle_expired = False
+        self._last_received = 0.0
+        self._drain_waiter: asyncio.Future[None] | None = None
+        self._paused = False
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the transport is open."""
+        return self._transport is not None and not self._transport.is_closing()
+
+    @property
+    def writing_paused(self) -> bool:
+        """Return True while the transport buffer is above its high-water mark."""
+        return self._paused
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport and arm the watchdog."""
+        self._transport = transport  # type: ignore[assignment]
+        self._last_received = self._loop.time()
+        self._idle_handle = self._loop.call_at(self._next_deadline(), self._check_idle)
+
+    def data_received(self, data: bytes) -> None:
+        """Parse received bytes and deliver every complete frame."""
+        self.frames_received(self._parser.feed(data))
+
+    def frames_received(self, frames: list[str]) -> None:
+        """Deliver frames extracted from the stream (e.g. by a transport worker)."""
+        self._last_received = self._loop.time()
+        for frame in frames:
+            try:
+                self._frame_callback(frame)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Error while processing frame: %s", frame)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Resolve the close future with the reason of the disconnect."""
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        if self._idle_expired:
+            exc = TimeoutError("Idle deadline expired")
+        if not self._closed.done():
+            if exc is None:
+                self._closed.set_result(None)
+            else:
+                self._closed.set_exception(exc)
+                # Mark as retrieved to avoid warnings if nobody is waiting
+                self._closed.exception()
+        self._wake_drain_waiter(exc or ConnectionResetError("Connection lost"))
+
+    def pause_writing(self) -> None:
+        """Pause writers when the transport buffer is full."""
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        """Resume writers once the transport buffer has drained."""
+        self._paused = False
+        self._wake_drain_waiter(None)
+
+    def write(self, data: bytes) -> None:
+        """Write data to the transport."""
+        if self._transport is None or self._transport.is_closing():
+            msg = "Transport is closed"
+            raise ConnectionResetError(msg)
+        self._transport.write(data)
+
+    async def drain(self) -> None:
+        """Wait until the transport buffer is below its high-water mark."""
+        if self._transport is None or self._transport.is_closing():
+            msg = "Transport is closed"
+            raise ConnectionResetError(msg)
+        if not self._paused:
+            return
+        if self._drain_waiter is None:
+            self._drain_waiter = self._loop.create_future()
+        await asyncio.shield(self._drain_waiter)
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection is lost; raise the reason if any."""
+        await asyncio.shield(self._closed)
+
+    def close(self) -> None:
+        """Close the transport."""
+        if self._transport is not None:
+            self._transport.close()
+
+    def _next_deadline(self) -> float:
+        """Return the time of the next probe or of the idle deadline."""
+        deadline = self._last_received + self._idle_timeout
+        if self._probe_callback is None or self._probe_interval is None:
+            return deadline
+        probe_at = max(self._last_received, self._last_probe) + self._probe_interval
+        return min(probe_at, deadline)
+
+    def _check_idle(self) -> None:
+        """Probe an idle link and abort it once the idle deadline expired."""
+        now = self._loop.time()
+        if now >= self._last_received + self._idle_timeout:
+            self._idle_handle = None
+            self._idle_expired = True
+            if self._transport is not None:
+                self._transport.abort()
+            return
+
+        deadline = self._next_deadline()
+        if now >= deadline and self._probe_callback is not None:
+            # Nothing received for a full probe interval
+            self._last_probe = now
+            self._probe_callback()
+            deadline = self._next_deadline()
+        self._idle_handle = self._loop.call_at(deadline, self._check_idle)
+
+    def _wake_drain_waiter(self, exc: Exception | None) -> None:
+        """Release a writer waiting in drain()."""
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is None or waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
+            waiter.exception()
@@ -0,0 +1,201 @@
+"""Latest-wins coalescing of speed and direction commands per cab."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from .commands import OPCODE_THROTTLE
+from .excs_exceptions import EXCSConnectionError
+from .roster import EXCSLocoDirection, EXCSRosterConsts, EXCSRosterEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .excs_base import EXCSBaseClient
+    from .messages import EXCSMessage
+
+
+class _ThrottleTarget:
+    """Newest speed and direction requested for a cab within the window."""
+
+    __slots__ = ("direction", "future", "loco", "speed")
+
+    def __init__(self, loco: EXCSRosterEntry, future: asyncio.Future[None]) -> None:
+        """Initialize the target without requested values."""
+        self.loco = loco
+        self.future = future
+        self.speed: int | None = None
+        self.direction: EXCSLocoDirection | None = None
+
+
+class EXCSThrottleCoalescer:
+    """
+    Coalesce throttle commands so only the newest target per cab is sent.
+
+    The first command for a cab is sent right away; further commands for
+    the same cab within its window only update the pending target, which is
+    sent when the window ends. Each cab has its own window, so a busy cab
+    does not delay the others. A target equal to the state acknowledged by
+    the station is not sent at all, unless a different command is still
+    awaiting its acknowledgement. Every caller awaits the send of the target
+    that superseded its own request.
+    """
+
+    def __init__(self, client: EXCSBaseClient, window_ms: int) -> None:
+        """Initialize the coalescer with the window in milliseconds."""
+        self._client = client
+        self._window = window_ms / 1000
+        self._pending: dict[int, _ThrottleTarget] = {}
+        # Sent targets per cab not answered by a throttle update yet
+        self._in_flight: dict[int, tuple[int, EXCSLocoDirection]] = {}
+        self._unsubscribers: dict[int, Callable[[], None]] = {}
+        self._flush_handles: dict[int, asyncio.TimerHandle] = {}
+        self._last_flush: dict[int, float] = {}
+        self._send_tasks: set[asyncio.Task] = set()
+
+        # Suppressed commands per cab (superseded or already acknowledged)
+        self.suppressed: Counter[int] = Counter()
+        self.sent = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the number of sent and suppressed throttle commands."""
+        return {"sent": self.sent, "suppressed": self.suppressed.total()}
+
+    async def set_speed(
+        self,
+        loco: EXCSRosterEntry,
+        speed: int | None = None,
+        direction: EXCSLocoDirection | None = None,
+    ) -> None:
+        """
+        Request a new speed and/or direction for a locomotive.
+
+        Values that are not given keep the pending target, the command still
+        awaiting its acknowledgement, or the current state of the locomotive.
+        """
+        loop = asyncio.get_running_loop()
+        if (target := self._pending.get(loco.id)) is None:
+            target = self._pending[loco.id] = _ThrottleTarget(
+                loco, loop.create_future()
+            )
+        else:
+            self.suppressed[loco.id] += 1  # Superseded by this request
+
+        if speed is not None:
+            target.speed = max(0, min(EXCSRosterConsts.SPEED_STEPS, speed))
+        if direction is not None:
+            target.direction = direction
+
+        if loco.id not in self._flush_handles:
+            self._flush_handles[loco.id] = loop.call_at(
+                max(loop.time(), self._last_flush.get(loco.id, 0.0) + self._window),
+                self._flush,
+                loco.id,
+            )
+
+        await asyncio.shield(target.future)
+
+    def reset(self) -> None:
+        """
+        Forget the commands awaiting their acknowledgement.
+
+        Called when the link drops, since their acknowledgements may never
+        arrive, so later targets start from the state known to the client.
+        """
+        self._in_flight.clear()
+
+    def emergency_stop(self) -> None:
+        """
+        Drop the pending targets and the commands in flight of all cabs.
+
+        A target requested before the emergency stop must not set a cab in
+        motion after it; its callers return without it being sent.
+        """
+        self.reset()
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+        for cab_id, target in self._pending.items():
+            self.suppressed[cab_id] += 1
+            target.future.set_result(None)
+        self._pending.clear()
+
+    def shutdown(self) -> None:
+        """Fail the pending targets and unsubscribe from throttle updates."""
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+        for target in self._pending.values():
+            target.future.set_exception(EXCSConnectionError("Client shut down"))
+            target.future.exception()  # Callers may have been cancelled
+        self._pending.clear()
+        for unsubscribe in self._unsubscribers.values():
+            unsubscribe()
+        self._unsubscribers.clear()
+        self._in_flight.clear()
+
+    def _flush(self, cab_id: int) -> None:
+        """Send the pending target of a cab."""
+        del self._flush_handles[cab_id]
+        self._last_flush[cab_id] = asyncio.get_running_loop().time()
+        target = self._pending.pop(cab_id)
+
+        task = asyncio.get_running_loop().create_task(self._send(target))
+        self._send_tasks.add(task)
+        task.add_done_callback(self._send_tasks.discard)
+
+    async def _send(self, target: _ThrottleTarget) -> None:
+        """Send the target of a cab unless it equals the acknowledged state."""
+        loco = target.loco
+        acknowledged = (loco.speed, loco.direction)
+        in_flight = self._in_flight.get(loco.id)
+        speed, direction = in_flight or acknowledged
+        if target.speed is not None:
+            speed = target.speed
+        if target.direction is not None:
+            direction = target.direction
+
+        # Skip targets the station already acknowledged
+        if in_flight is None and (speed, direction) == acknowledged:
+            self.suppressed[loco.id] += 1
+            target.future.set_result(None)
+            return
+
+        # Commands journaled while disconnected are not awaiting an answer
+        if self._client.connected:
+            self._in_flight[loco.id] = (speed, direction)
+        if loco.id not in self._unsubscribers:
+            self._unsubscribers[loco.id] = self._client.register_push_handler(
+                OPCODE_THROTTLE, self._handle_throttle_update, loco.id
+            )
+
+        # Targets of cabs flushed together are sent in the same loop iteration
+        # and share a write
+        try:
+            await self._client.send_command(
+                EXCSRosterConsts.CMD_SET_LOCO_SPEED_FMT.format(
+                    cab_id=loco.id, speed=speed, direction=direction.value
+                )
+            )
+        except Exception as err:  # noqa: BLE001
+            self._in_flight.pop(loco.id, None)
+            target.future.set_exception(err)
+            target.future.exception()  # Callers may have been cancelled
+        else:
+            self.sent += 1
+            target.future.set_result(None)
+
+    def _handle_throttle_update(self, message: EXCSMessage) -> None:
+        """
+        Clear the command in flight on any throttle update of its cab.
+
+        The update may acknowledge the command, report a speed clamped by the
+        station, or a change by another controller; in each case the state
+        of the locomotive is current again.
+        """
+        match message.args:
+            case (int(cab_id), *_):
+                self._in_flight.pop(cab_id, None)
@@ -0,0 +1,107 @@
+"""
+Transport worker process owning the TCP connection to the EX-CommandStation.
+
+Started by ``EXCSWorkerConnector`` with the host, port, socket profile and
+connect timeout as arguments. Only this client package is imported, not
+the integration or Home Assistant. The worker connects, reports the outcome as
+the first line on stdout (``OK`` or ``ERR <reason>``) and then:
+
+- extracts the frames received from the station and writes their contents
+  to stdout, one per line and all frames of a read in a single write;
+- writes everything read from stdin (encoded commands) to the socket.
+
+It exits when the station closes the connection or stdin is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sys
+from typing import Final
+
+from .socket_profile import EXCSSocketProfile, apply_socket_profile
+from .stream_protocol import EXCSFrameParser
+
+WORKER_READY: Final = "OK"
+WORKER_ERROR: Final = "ERR"
+
+
+async def _pump_frames(
+    reader: asyncio.StreamReader, stdout: asyncio.StreamWriter
+) -> None:
+    """Forward the frames received from the station to stdout."""
+    parser = EXCSFrameParser()
+    with contextlib.suppress(ConnectionError):
+        while data := await reader.read(65536):
+            if frames := parser.feed(data):
+                lines = "\n".join(frame.replace("\n", " ") for frame in frames)
+                stdout.write(lines.encode("ascii", errors="replace") + b"\n")
+                await stdout.drain()
+
+
+async def _pump_commands(
+    stdin: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Forward the encoded commands read from stdin to the station."""
+    with contextlib.suppress(ConnectionError):
+        while data := await stdin.read(65536):
+            writer.write(data)
+            await writer.drain()
+
+
+async def run(
+    host: str, port: int, profile: EXCSSocketProfile, connect_timeout: float
+) -> int:
+    """Run the worker until either side of the connection is closed."""
+    loop = asyncio.get_running_loop()
+    stdin = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin.buffer
+    )
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout.buffer
+    )
+    stdout = asyncio.StreamWriter(transport, protocol, None, loop)
+
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=connect_timeout
+        )
+    except (OSError, TimeoutError) as err:
+        stdout.write(f"{WORKER_ERROR} {err or 'Timeout'}\n".encode())
+        await stdout.drain()
+        return 1
+
+    if (sock := writer.get_extra_info("socket")) is not None:
+        apply_socket_profile(sock, profile)
+    stdout.write(f"{WORKER_READY}\n".encode())
+    await stdout.drain()
+
+    tasks = [
+        asyncio.create_task(_pump_frames(reader, stdout)),
+        asyncio.create_task(_pump_commands(stdin, writer)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        writer.close()
+    return 0
+
+
+def main() -> int:
+    """Run the worker with the arguments given on the command line."""
+    return asyncio.run(
+        run(
+            sys.argv[1],
+            int(sys.argv[2]),
+            EXCSSocketProfile(sys.argv[3]),
+            float(sys.argv[4]),
+        )
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import re
 from enum import Enum
-from typing import Final
+from typing import TYPE_CHECKING, Final
 
 from .excs_exceptions import EXCSInvalidResponseError, EXCSValueError
 
+if TYPE_CHECKING:
+    from .messages import EXCSMessage
+
 
 class EXCSTurnoutConsts:
     """Constants for EX-CommandStation turnout."""
@@ -18,9 +21,6 @@ class EXCSTurnoutConsts:
     CMD_TOGGLE_TURNOUT_FMT: Final[str] = "T {id} {state}"
 
     # Regular expressions and corresponding prefixes for parsing responses
-    RESP_STATE_PREFIX_FMT: Final[str] = "H {id}"
-    RESP_STATE_REGEX: Final[re.Pattern] = re.compile(r"H\s+(?P<id>\d+)\s+(?P<state>\d)")
-
     RESP_LIST_PREFIX: Final[str] = "jT"
     RESP_LIST_REGEX: Final[re.Pattern] = re.compile(r"jT\s+(?P<ids>(?:\d+(?:\s+\d+)*))")
 
@@ -39,32 +39,35 @@ class EXCSTurnoutState(Enum):
     @classmethod
     def from_char(cls, value: str) -> EXCSTurnoutState:
         """Convert a character value (C or T) to a EXCSTurnoutState enum."""
-        for state in cls:
-            if state.value == value:
-                return state
-        # If no match found, raise an error
-        msg = (
-            f"Invalid turnout state: {value}. Expected one of: {[s.value for s in cls]}"
-        )
-        raise EXCSValueError(msg)
+        try:
+            return cls(value)
+        except ValueError as err:
+            # If no match found, raise an error
+            msg = (
+                f"Invalid turnout state: {value}. "
+                f"Expected one of: {[s.value for s in cls]}"
+            )
+            raise EXCSValueError(msg) from err
 
     @classmethod
-    def from_digit(cls, value: str) -> EXCSTurnoutState:
+    def from_digit(cls, value: int) -> EXCSTurnoutState:
         """Convert a digit value (0 or 1) to a EXCSTurnoutState enum."""
-        if value.isdigit():
-            value_int = int(value)
-            if value_int == 0:
-                return cls.CLOSED
-            if value_int == 1:
-                return cls.THROWN
+        if (state := TURNOUT_STATE_BY_DIGIT.get(value)) is not None:
+            return state
 
         msg = (
-            f"Invalid turnout state value: {value_int}. "
-            f"Expected 0 (CLOSED) or 1 (THROWN)."
+            f"Invalid turnout state value: {value}. Expected 0 (CLOSED) or 1 (THROWN)."
         )
         raise EXCSValueError(msg)
 
 
+# Turnout states as reported in <H id state> messages
+TURNOUT_STATE_BY_DIGIT: Final[dict[int, EXCSTurnoutState]] = {
+    0: EXCSTurnoutState.CLOSED,
+    1: EXCSTurnoutState.THROWN,
+}
+
+
 class EXCSTurnout:
     """Representation of a turnout in the EX-CommandStation."""
 
@@ -76,9 +79,6 @@ class EXCSTurnout:
         # Normalize state to enum
         self.state = EXCSTurnoutState.from_char(state)
 
-        # Prefix to find out the turnout state in incoming messages
-        self.recv_prefix = EXCSTurnoutConsts.RESP_STATE_PREFIX_FMT.format(id=self.id)
-
     def __repr__(self) -> str:
         """Return a string representation of the turnout."""
         return (
@@ -95,17 +95,15 @@ class EXCSTurnout:
         )
 
     @classmethod
-    def parse_turnout_state(cls, message: str) -> tuple[int, EXCSTurnoutState]:
-        """Parse the turnout state from a message."""
-        match = EXCSTurnoutConsts.RESP_STATE_REGEX.match(message)
-        if not match:
-            msg = f"Invalid turnout state message: {message}"
-            raise EXCSInvalidResponseError(msg)
-        turnout_id = int(match.group("id"))
-
-        # Here the state is expected to be a digit
-        state = EXCSTurnoutState.from_digit(match.group("state"))
-        return turnout_id, state
+    def parse_turnout_state(cls, message: EXCSMessage) -> tuple[int, EXCSTurnoutState]:
+        """Parse the turnout state from a tokenized <H id state> message."""
+        match message.args:
+            case (int(turnout_id), int(state_digit)):
+                # Here the state is expected to be a digit
+                return turnout_id, EXCSTurnoutState.from_digit(state_digit)
+            case _:
+                msg = f"Invalid turnout state message: {message.raw}"
+                raise EXCSInvalidResponseError(msg)
 
     @classmethod
     def from_detail_response(cls, response: str) -> EXCSTurnout:
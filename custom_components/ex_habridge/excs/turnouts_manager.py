@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
 from .const import LOGGER
-from .excs_exceptions import EXCSConnectionError, EXCSError, EXCSInvalidResponseError
+from .excs_exceptions import (
+    EXCSCommandFailedError,
+    EXCSConnectionError,
+    EXCSError,
+    EXCSInvalidResponseError,
+)
 from .turnout import EXCSTurnout, EXCSTurnoutConsts
 
 if TYPE_CHECKING:
@@ -19,6 +25,8 @@ class EXCSTurnoutsManager:
         """Initialize the turnouts manager with the EX-CommandStation client."""
         self.client = client
         self.turnouts: list[EXCSTurnout] = []
+        # Detail responses the turnouts were created from, for the definition cache
+        self.definitions: list[str] = []
 
     async def get_turnouts(self) -> list[EXCSTurnout]:
         """Request and return list of turnouts from the EX-CommandStation."""
@@ -28,24 +36,42 @@ class EXCSTurnoutsManager:
 
         LOGGER.debug("Requesting list of turnouts from EX-CommandStation")
 
-        # Clear existing turnouts
-        self.turnouts.clear()
-
         # Get list of turnout IDs
         turnout_ids = await self._get_turnouts_list()
 
         if not turnout_ids:
             LOGGER.debug("No turnouts found")
+            self.turnouts, self.definitions = [], []
             return self.turnouts
 
         LOGGER.debug("Found turnout IDs: %s", " ".join(turnout_ids))
 
-        # Get details for each turnout ID
-        for turnout_id in turnout_ids:
-            turnout = await self._get_turnout_details(turnout_id)
-            self.turnouts.append(turnout)
+        # Get details for all turnout IDs, pipelined within the discovery window
+        results = await asyncio.gather(
+            *(self._get_turnout_details(turnout_id) for turnout_id in turnout_ids),
+            return_exceptions=True,
+        )
+        # Collected aside, so a failed discovery keeps the current turnouts
+        turnouts: list[EXCSTurnout] = []
+        definitions: list[str] = []
+        for turnout_id, result in zip(turnout_ids, results, strict=True):
+            if isinstance(result, EXCSCommandFailedError):
+                LOGGER.warning("Turnout %s rejected, skipping", turnout_id)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            turnout, response = result
+            turnouts.append(turnout)
+            definitions.append(response)
             LOGGER.debug("Turnout detail: %s", turnout)
 
+        self.turnouts, self.definitions = turnouts, definitions
+        return self.turnouts
+
+    def load_definitions(self, definitions: list[str]) -> list[EXCSTurnout]:
+        """Create the turnouts from previously discovered detail responses."""
+        self.turnouts = [EXCSTurnout.from_detail_response(item) for item in definitions]
+        self.definitions = list(definitions)
         return self.turnouts
 
     async def _get_turnouts_list(self) -> list[str]:
@@ -83,18 +109,21 @@ class EXCSTurnoutsManager:
         msg = f"Invalid response for turnout list: {response}"
         raise EXCSInvalidResponseError(msg)
 
-    async def _get_turnout_details(self, turnout_id: str) -> EXCSTurnout:
-        """Get details for a specific turnout ID."""
+    async def _get_turnout_details(self, turnout_id: str) -> tuple[EXCSTurnout, str]:
+        """Get details and the detail response for a specific turnout ID."""
         try:
-            response = await self.client.await_command_response(
-                EXCSTurnoutConsts.CMD_GET_TURNOUT_DETAILS_FMT.format(id=turnout_id),
-                EXCSTurnoutConsts.RESP_DETAILS_PREFIX_FMT.format(id=turnout_id),
-            )
-            return EXCSTurnout.from_detail_response(response)
+            async with self.client.discovery_window:
+                response = await self.client.await_command_response(
+                    EXCSTurnoutConsts.CMD_GET_TURNOUT_DETAILS_FMT.format(id=turnout_id),
+                    EXCSTurnoutConsts.RESP_DETAILS_PREFIX_FMT.format(id=turnout_id),
+                )
+            return EXCSTurnout.from_detail_response(response), response
         except TimeoutError:
             msg = f"Timeout waiting for turnout details for ID {turnout_id}"
             LOGGER.error(msg)
             raise EXCSConnectionError(msg) from None
+        except EXCSCommandFailedError:
+            raise  # Rejected IDs are skipped by the caller
         except EXCSError as err:
             LOGGER.error("Error getting turnout detail: %s", err)
             raise
@@ -0,0 +1,187 @@
+"""Recording of the wire traffic to a file and replaying it through a client."""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import struct
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, BinaryIO, Final
+
+from .const import LOGGER, RECORDING_FLUSH_SIZE
+from .wire_trace import EXCSWireDirection
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from .excs_base import EXCSBaseClient
+
+# File header, then one record per frame: microseconds since the previous
+# frame, direction (0 = TX, 1 = RX) and length, followed by the frame bytes
+RECORDING_MAGIC: Final = b"EXCSREC\x01"
+RECORD_HEADER: Final = struct.Struct("<IBH")
+
+_DIRECTION_CODES: Final = {EXCSWireDirection.TX: 0, EXCSWireDirection.RX: 1}
+_CODE_DIRECTIONS: Final = {
+    code: direction for direction, code in _DIRECTION_CODES.items()
+}
+
+
+class EXCSWireRecorder:
+    """
+    Record the frames exchanged with the station to a compact file.
+
+    Records are collected in memory and written by a single background
+    thread once ``RECORDING_FLUSH_SIZE`` bytes have accumulated, so the
+    event loop never waits for the disk.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the recorder writing to ``path``."""
+        self.path = path
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="EXCSRecorder")
+        self._file: BinaryIO | None = None
+        self._buffer = bytearray(RECORDING_MAGIC)
+        self._last_time = 0.0
+        self.recorded = 0
+
+    async def start(self) -> None:
+        """Create the file."""
+        loop = asyncio.get_running_loop()
+        self._file = await loop.run_in_executor(self._executor, self.path.open, "wb")
+        self._last_time = time.monotonic()
+        LOGGER.info("Recording wire traffic to %s", self.path)
+
+    def record(self, direction: EXCSWireDirection, frame: str) -> None:
+        """Append a frame to the recording."""
+        now = time.monotonic()
+        delta = min(round((now - self._last_time) * 1_000_000), 0xFFFFFFFF)
+        self._last_time = now
+        data = frame.encode("ascii", errors="replace")
+        self._buffer += RECORD_HEADER.pack(
+            delta, _DIRECTION_CODES[direction], len(data)
+        )
+        self._buffer += data
+        self.recorded += 1
+        if len(self._buffer) >= RECORDING_FLUSH_SIZE:
+            self._flush()
+
+    async def stop(self) -> None:
+        """Write the remaining records and close the file."""
+        self._flush()
+        if self._file is not None:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._file.close
+                )
+            except OSError as err:
+                LOGGER.error("Could not close the recording %s: %s", self.path, err)
+            self._file = None
+        self._executor.shutdown(wait=False)
+        LOGGER.info("Recorded %d frames to %s", self.recorded, self.path)
+
+    def _flush(self) -> None:
+        """Hand the collected records to the writer thread."""
+        if self._file is None or not self._buffer:
+            return
+        data, self._buffer = bytes(self._buffer), bytearray()
+        self._executor.submit(self._file.write, data).add_done_callback(
+            self._check_write
+        )
+
+    def _check_write(self, future: Future[int]) -> None:
+        """Log a failed write; called from the writer thread."""
+        if (err := future.exception()) is not None:
+            LOGGER.error("Could not write the recording to %s: %s", self.path, err)
+
+
+def read_recording(path: Path) -> list[tuple[float, EXCSWireDirection, str]]:
+    """
+    Read a recording as ``(time, direction, frame)`` tuples.
+
+    Times are in seconds since the recording started. This does blocking
+    file I/O; run it in an executor from the event loop.
+    """
+    data = path.read_bytes()
+    if not data.startswith(RECORDING_MAGIC):
+        msg = f"{path} is not a wire traffic recording"
+        raise ValueError(msg)
+
+    records = []
+    offset, elapsed = len(RECORDING_MAGIC), 0
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= len(data):
+        delta, code, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += header_size
+        elapsed += delta
+        frame = data[offset : offset + length].decode("ascii", errors="replace")
+        offset += length
+        records.append((elapsed / 1_000_000, _CODE_DIRECTIONS[code], frame))
+    return records
+
+
+@dataclass
+class EXCSReplayStats:
+    """Metrics of a replayed recording."""
+
+    frames: int = 0  # Received frames fed through the client
+    skipped: int = 0  # Sent frames, which are not replayed
+    elapsed_s: float = 0.0
+    frames_per_s: float = 0.0
+    callback_total_ms: float = 0.0
+    callback_p50_us: float = 0.0
+    callback_p99_us: float = 0.0
+    callback_max_us: float = 0.0
+
+
+async def replay_recording(
+    client: EXCSBaseClient,
+    records: Iterable[tuple[float, EXCSWireDirection, str]],
+    speed: float | None = None,
+) -> EXCSReplayStats:
+    """
+    Feed the received frames of a recording through a client.
+
+    The frames only reach the subscribers of pushed updates (see
+    ``EXCSBaseClient.feed_frame``). They are delivered at their recorded
+    times divided by ``speed``, or as fast as possible if ``speed`` is None
+    (or 0); the event loop runs between frames either way, so tasks and
+    callbacks scheduled by a frame run before the next one. Sent frames are
+    skipped. The time spent in the client's frame handling is measured per
+    frame.
+    """
+    loop = asyncio.get_running_loop()
+    stats = EXCSReplayStats()
+    durations: list[float] = []
+    start = loop.time()
+
+    for at, direction, frame in records:
+        if direction is not EXCSWireDirection.RX:
+            stats.skipped += 1
+            continue
+        if speed:
+            await asyncio.sleep(max(0.0, start + at / speed - loop.time()))
+        else:
+            await asyncio.sleep(0)
+        handled_at = time.perf_counter()
+        client.feed_frame(frame)
+        durations.append(time.perf_counter() - handled_at)
+
+    elapsed = loop.time() - start
+    stats.frames = len(durations)
+    stats.elapsed_s = round(elapsed, 3)
+    if durations:
+        p99 = (
+            statistics.quantiles(durations, n=100, method="inclusive")[-1]
+            if len(durations) > 1
+            else durations[0]
+        )
+        stats.frames_per_s = round(stats.frames / max(elapsed, 1e-6), 1)
+        stats.callback_total_ms = round(sum(durations) * 1e3, 3)
+        stats.callback_p50_us = round(statistics.median(durations) * 1e6, 1)
+        stats.callback_p99_us = round(p99 * 1e6, 1)
+        stats.callback_max_us = round(max(durations) * 1e6, 1)
+    return stats
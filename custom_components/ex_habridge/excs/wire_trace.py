@@ -0,0 +1,71 @@
+"""Ring buffer of the frames exchanged with the EX-CommandStation."""
+
+from __future__ import annotations
+
+import time
+from enum import StrEnum
+from typing import Any
+
+
+class EXCSWireDirection(StrEnum):
+    """Direction of a traced frame."""
+
+    TX = "tx"  # Sent to the station
+    RX = "rx"  # Received from the station
+
+
+class EXCSWireTrace:
+    """
+    Fixed-size trace of the most recent frames sent and received.
+
+    The slots are allocated up front and overwritten in a circle, so
+    recording a frame only stores a timestamp and two references; nothing
+    is formatted or written anywhere until the trace is dumped. This keeps
+    the wire protocol visible in production at a fraction of the cost of
+    debug logging every frame.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the trace with room for ``capacity`` frames."""
+        self._capacity = capacity
+        self._times = [0.0] * capacity
+        self._directions: list[EXCSWireDirection | None] = [None] * capacity
+        self._frames = [""] * capacity
+        self._next = 0
+        # Frames recorded since the client was created
+        self.recorded = 0
+
+    def __len__(self) -> int:
+        """Return the number of frames held by the trace."""
+        return min(self.recorded, self._capacity)
+
+    def record(self, direction: EXCSWireDirection, frame: str) -> None:
+        """Record a frame, overwriting the oldest one once the trace is full."""
+        index = self._next
+        self._times[index] = time.monotonic()
+        self._directions[index] = direction
+        self._frames[index] = frame
+        self._next = index + 1 if index + 1 < self._capacity else 0
+        self.recorded += 1
+
+    def dump(self) -> list[dict[str, Any]]:
+        """
+        Return the traced frames, oldest first.
+
+        Timestamps are given in seconds relative to the newest frame, so
+        the last entry is at 0.
+        """
+        count = len(self)
+        if not count:
+            return []
+        start = (self._next - count) % self._capacity
+        indexes = [(start + offset) % self._capacity for offset in range(count)]
+        newest = self._times[indexes[-1]]
+        return [
+            {
+                "t": round(self._times[index] - newest, 6),
+                "dir": str(self._directions[index]),
+                "frame": self._frames[index],
+            }
+            for index in indexes
+        ]
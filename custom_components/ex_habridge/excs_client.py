@@ -1,54 +1,123 @@
-"""EX-CommandStation Client for Home Assistant integration."""
+"""Home Assistant adapter of the EX-CommandStation client."""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from .commands import command_write_cv
-from .const import LOGGER
-from .excs_config import EXCSConfigClient
-from .excs_exceptions import EXCSError, EXCSValueError
+from homeassistant.const import (
+    CONF_DEVICE,
+    CONF_HOST,
+    CONF_PORT,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+
+from .const import (
+    CONF_BAUDRATE,
+    CONF_TRANSPORT,
+    DOMAIN,
+    LOGGER,
+    RECORDINGS_DIR,
+    SIGNAL_READY,
+    TRANSPORT_SERIAL,
+)
+from .excs.connectors import EXCSSerialConnector, EXCSWorkerConnector
+from .excs.excs_client import EXCSClient
+from .excs.excs_exceptions import EXCSValueError
+from .excs.wire_recording import read_recording, replay_recording
 
 if TYPE_CHECKING:
-    from homeassistant.core import ServiceCall
-
-
-class EXCSClient(EXCSConfigClient):
-    """Client for communicating with the EX-CommandStation."""
-
-    async def async_validate_config(self) -> None:
-        """Validate the configuration of the EX-CommandStation client."""
-        if not self.connected:
-            await self.connect()
-
-        # Validate system info
-        LOGGER.debug("Validating EX-CommandStation client configuration")
-        await self.get_excs_system_info()
-        await self.validate_excs_version()
-
-    async def async_setup(self) -> None:
-        """Set up the EX-CommandStation client."""
-        if not self.connected:
-            await self.connect()
-
-        # Fetch EX-CommandStation system info and validate version
-        LOGGER.debug("Configuring EX-CommandStation client")
-        await self.get_excs_system_info()
-        await self.validate_excs_version()
-        # Fetch the list of roster entries
-        await self.get_roster_entries()
-        # Fetch the list of routes
-        await self.get_routes()
-        # Fetch the list of turnouts
-        await self.get_turnouts()
-
-    async def async_shutdown(self) -> None:
-        """Shutdown the EX-CommandStation client."""
-        LOGGER.debug("Shutting down EX-CommandStation client")
-        try:
-            await self.disconnect()
-        except EXCSError:
-            LOGGER.exception("Error during shutdown of EX-CommandStation client")
+    from collections.abc import Callable, Coroutine, Mapping
+
+    from homeassistant.core import Event, HomeAssistant, ServiceCall, ServiceResponse
+
+    from .excs.connectors import EXCSConnector
+    from .excs.excs_options import EXCSClientOptions
+
+
+class EXCSHassEvents:
+    """Client events mapped to Home Assistant tasks and dispatcher signals."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the events for a Home Assistant instance."""
+        self._hass = hass
+
+    def create_background_task(
+        self, coro: Coroutine[Any, Any, Any], name: str
+    ) -> asyncio.Task:
+        """Run a coroutine in a Home Assistant background task."""
+        return self._hass.async_create_background_task(coro, name=name)
+
+    def dispatch(self, signal: str, *args: Any) -> None:
+        """Send a dispatcher signal of the integration."""
+        async_dispatcher_send(self._hass, f"{DOMAIN}_{signal}", *args)
+
+    def connect(self, signal: str, callback: Callable[..., Any]) -> Callable[[], None]:
+        """Connect a callback to a dispatcher signal of the integration."""
+        return async_dispatcher_connect(self._hass, f"{DOMAIN}_{signal}", callback)
+
+
+class EXCSHassClient(EXCSClient):
+    """EX-CommandStation client running in Home Assistant."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        host: str,
+        port: int,
+        entry_id: str = "",
+        options: EXCSClientOptions | None = None,
+        connector: EXCSConnector | None = None,
+    ) -> None:
+        """Initialize the client with Home Assistant tasks and signals."""
+        super().__init__(host, port, entry_id, options, connector, EXCSHassEvents(hass))
+        self.hass = hass
+        # Set once the client is set up and the coordinators exist
+        self.ready = asyncio.Event()
+
+    @classmethod
+    def from_config(
+        cls,
+        hass: HomeAssistant,
+        data: Mapping[str, Any],
+        entry_id: str = "",
+        options: EXCSClientOptions | None = None,
+    ) -> EXCSHassClient:
+        """Create a client for the transport selected in the config entry data."""
+        if data.get(CONF_TRANSPORT) == TRANSPORT_SERIAL:
+            device, baudrate = data[CONF_DEVICE], data[CONF_BAUDRATE]
+            return cls(
+                hass,
+                device,
+                baudrate,
+                entry_id,
+                options,
+                EXCSSerialConnector(device, baudrate),
+            )
+        if options is not None and options.transport_worker:
+            host, port = data[CONF_HOST], data[CONF_PORT]
+            return cls(
+                hass,
+                host,
+                port,
+                entry_id,
+                options,
+                EXCSWorkerConnector(host.strip(), port, options.socket_profile),
+            )
+        return cls(hass, data[CONF_HOST], data[CONF_PORT], entry_id, options)
+
+    def set_ready(self) -> None:
+        """Mark the client as ready and signal it to the platforms."""
+        self.ready.set()
+        self.dispatch_signal(SIGNAL_READY)
 
     async def handle_write_cv(self, call: ServiceCall) -> None:
         """Handle the write CV service call."""
@@ -56,13 +125,89 @@ class EXCSClient(EXCSConfigClient):
             address = int(call.data["address"])
             cv = int(call.data["cv"])
             value = int(call.data["value"])
-            command = command_write_cv(address, cv, value)
-            LOGGER.debug("Writing CV: address=%d, cv=%d, value=%d", address, cv, value)
-            await self.send_command(command)
         except ValueError as err:
-            msg = "Invalid CV write parameters: %s", err
+            msg = f"Invalid CV write parameters: {err}"
             LOGGER.error(msg)
             raise EXCSValueError(msg) from err
-        except EXCSError as err:
-            LOGGER.error("Error writing CV: %s", err)
-            raise
+        await self.write_cv(address, cv, value)
+
+    async def handle_dump_wire_trace(
+        self,
+        call: ServiceCall,  # noqa: ARG002
+    ) -> ServiceResponse:
+        """Handle the dump wire trace service call."""
+        return {
+            "recorded": self.wire_trace.recorded,
+            "frames": self.wire_trace.dump(),
+        }
+
+    async def handle_start_recording(self, call: ServiceCall) -> None:
+        """Handle the start recording service call."""
+        filename = (
+            call.data.get("filename")
+            or f"{DOMAIN}_{time.strftime('%Y%m%d_%H%M%S')}.excsrec"
+        )
+        await self.start_recording(await self._async_recording_path(filename))
+
+    async def handle_stop_recording(
+        self,
+        call: ServiceCall,  # noqa: ARG002
+    ) -> ServiceResponse:
+        """Handle the stop recording service call."""
+        path = self.recorder.path if self.recorder else None
+        frames = await self.stop_recording()
+        return {"path": str(path) if path else None, "frames": frames}
+
+    async def handle_replay_recording(self, call: ServiceCall) -> ServiceResponse:
+        """
+        Handle the replay recording service call.
+
+        The received frames of the recording are fed through the client and
+        the entities at the requested speed, counting the state writes they
+        cause.
+        """
+        path = await self._async_recording_path(call.data["filename"])
+        try:
+            records = await self.hass.async_add_executor_job(read_recording, path)
+        except (OSError, ValueError) as err:
+            msg = f"Cannot read recording {path}: {err}"
+            raise EXCSValueError(msg) from err
+
+        state_writes = 0
+
+        @callback
+        def count_state_write(event: Event) -> None:  # noqa: ARG001
+            nonlocal state_writes
+            state_writes += 1
+
+        unsubscribe = self.hass.bus.async_listen(EVENT_STATE_CHANGED, count_state_write)
+        try:
+            stats = await replay_recording(self, records, call.data.get("speed"))
+        finally:
+            unsubscribe()
+        LOGGER.info("Replayed %s: %s, %d state writes", path, stats, state_writes)
+        return {**asdict(stats), "state_writes": state_writes}
+
+    async def _async_recording_path(self, filename: str) -> Path:
+        """
+        Return the path of a recording file.
+
+        Relative file names are resolved in the recordings directory of the
+        integration, which is created if needed. Paths outside of it must be
+        in a directory allowed by the Home Assistant configuration.
+        """
+        directory = Path(self.hass.config.path(RECORDINGS_DIR))
+        path = directory / filename
+
+        def is_allowed() -> bool:
+            # Resolving the path and the allowlist check access the disk
+            directory.mkdir(exist_ok=True)
+            resolved = path.resolve()
+            return resolved.is_relative_to(
+                directory.resolve()
+            ) or self.hass.config.is_allowed_path(str(resolved))
+
+        if not await self.hass.async_add_executor_job(is_allowed):
+            msg = f"Access to recording {path} is not allowed"
+            raise EXCSValueError(msg)
+        return path
@@ -10,11 +10,11 @@ from homeassistant.components.number import (
     NumberMode,
 )
 from homeassistant.const import PERCENTAGE
-
-from custom_components.ex_habridge.roster import EXCSRosterConsts
+from homeassistant.core import callback
 
 from .const import DOMAIN, LOGGER
-from .entity import EXCSRosterEntity
+from .entity import EXCSRosterEntity, async_add_when_ready
+from .excs.roster import EXCSRosterConsts
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -22,10 +22,10 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import LocoUpdateCoordinator
-    from .excs_client import EXCSClient
-    from .roster import EXCSRosterEntry
+    from .excs.roster import EXCSRosterEntry
+    from .excs_client import EXCSHassClient
 
-from .excs_client import EXCSError
+from .excs.excs_exceptions import EXCSError
 
 
 async def async_setup_entry(
@@ -36,22 +36,28 @@ async def async_setup_entry(
     client = data["client"]
     coordinators = data["coordinators"]
 
-    # Add locomotive speed number entities
-    entities = []
-    for loco in client.roster_entries:
-        coordinator = coordinators[loco.id]
-        entities.append(LocoSpeedNumber(client, coordinator, loco))
-        entities.append(LocoSpeedStepNumber(client, coordinator, loco))
-    if entities:
-        async_add_entities(entities)
+    @callback
+    def async_add_loco_entities() -> None:
+        """Add locomotive speed number entities once the roster is discovered."""
+        entities = []
+        for loco in client.roster_entries:
+            coordinator = coordinators[loco.id]
+            entities.append(LocoSpeedNumber(client, coordinator, loco))
+            entities.append(LocoSpeedStepNumber(client, coordinator, loco))
+        if entities:
+            async_add_entities(entities)
+
+    async_add_when_ready(entry, client, async_add_loco_entities)
 
 
 class LocoSpeedNumber(EXCSRosterEntity, NumberEntity):
     """Representation of a locomotive speed control."""
 
+    _journaled_commands = True
+
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         loco: EXCSRosterEntry,
     ) -> None:
@@ -74,7 +80,10 @@ class LocoSpeedNumber(EXCSRosterEntity, NumberEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return the additional state attributes of the number entity."""
-        return {"dcc_id": self._loco.id}
+        return {
+            "dcc_id": self._loco.id,
+            "suppressed_commands": self._client.throttle.suppressed[self._loco.id],
+        }
 
     @property
     def native_value(self) -> float:
@@ -84,7 +93,9 @@ class LocoSpeedNumber(EXCSRosterEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the locomotive speed using percentage."""
         try:
-            await self._client.send_command(self._loco.set_speed_pct_cmd(value))
+            await self._client.throttle.set_speed(
+                self._loco, speed=self._loco.speed_steps_from_pct(value)
+            )
         except EXCSError:
             # Handle the error if needed
             LOGGER.exception(
@@ -95,9 +106,11 @@ class LocoSpeedNumber(EXCSRosterEntity, NumberEntity):
 class LocoSpeedStepNumber(EXCSRosterEntity, NumberEntity):
     """Representation of a locomotive speed step control."""
 
+    _journaled_commands = True
+
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         loco: EXCSRosterEntry,
     ) -> None:
@@ -118,7 +131,10 @@ class LocoSpeedStepNumber(EXCSRosterEntity, NumberEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Return the additional state attributes of the number entity."""
-        return {"dcc_id": self._loco.id}
+        return {
+            "dcc_id": self._loco.id,
+            "suppressed_commands": self._client.throttle.suppressed[self._loco.id],
+        }
 
     @property
     def native_value(self) -> int:
@@ -128,7 +144,7 @@ class LocoSpeedStepNumber(EXCSRosterEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Set the locomotive speed using raw step value."""
         try:
-            await self._client.send_command(self._loco.set_speed_step_cmd(int(value)))
+            await self._client.throttle.set_speed(self._loco, speed=int(value))
         except EXCSError:
             LOGGER.exception(
                 "Failed to set speed step to %d for loco %d", value, self._loco.id
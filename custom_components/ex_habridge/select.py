@@ -5,10 +5,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Final
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.core import callback
 
 from .const import DOMAIN, LOGGER
-from .entity import EXCSRosterEntity
-from .roster import EXCSLocoDirection, EXCSRosterEntry
+from .entity import EXCSRosterEntity, async_add_when_ready
+from .excs.roster import EXCSLocoDirection, EXCSRosterEntry
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -16,9 +17,9 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import LocoUpdateCoordinator
-    from .excs_client import EXCSClient
+    from .excs_client import EXCSHassClient
 
-from .excs_client import EXCSError
+from .excs.excs_exceptions import EXCSError
 
 DIRECTION_FORWARD: Final[str] = str(EXCSLocoDirection.FORWARD)
 DIRECTION_REVERSE: Final[str] = str(EXCSLocoDirection.REVERSE)
@@ -32,21 +33,27 @@ async def async_setup_entry(
     client = data["client"]
     coordinators = data["coordinators"]
 
-    # Add locomotive direction select entities
-    entities = []
-    for loco in client.roster_entries:
-        coordinator = coordinators[loco.id]
-        entities.append(LocoDirectionSelect(client, coordinator, loco))
-    if entities:
-        async_add_entities(entities)
+    @callback
+    def async_add_loco_entities() -> None:
+        """Add locomotive direction select entities once the roster is discovered."""
+        entities = [
+            LocoDirectionSelect(client, coordinators[loco.id], loco)
+            for loco in client.roster_entries
+        ]
+        if entities:
+            async_add_entities(entities)
+
+    async_add_when_ready(entry, client, async_add_loco_entities)
 
 
 class LocoDirectionSelect(EXCSRosterEntity, SelectEntity):
     """Representation of a locomotive direction control."""
 
+    _journaled_commands = True
+
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         loco: EXCSRosterEntry,
     ) -> None:
@@ -78,12 +85,12 @@ class LocoDirectionSelect(EXCSRosterEntity, SelectEntity):
         """Set the locomotive direction."""
         try:
             if option == DIRECTION_FORWARD:
-                await self._client.send_command(
-                    self._loco.set_direction_cmd(EXCSLocoDirection.FORWARD)
+                await self._client.throttle.set_speed(
+                    self._loco, direction=EXCSLocoDirection.FORWARD
                 )
             elif option == DIRECTION_REVERSE:
-                await self._client.send_command(
-                    self._loco.set_direction_cmd(EXCSLocoDirection.REVERSE)
+                await self._client.throttle.set_speed(
+                    self._loco, direction=EXCSLocoDirection.REVERSE
                 )
             else:
                 LOGGER.error("Invalid direction option: %s", option)
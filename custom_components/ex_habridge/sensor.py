@@ -1,18 +1,21 @@
-"""Sensor platform for EX-CommandStation speed and direction feedback."""
+"""Sensor platform for EX-CommandStation speed feedback and link diagnostics."""
 
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import callback
 
 from .const import DOMAIN
-from .entity import EXCSRosterEntity
+from .entity import EXCSEntity, EXCSRosterEntity, async_add_when_ready
+from .excs.const import SIGNAL_HEARTBEAT
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -20,8 +23,8 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import LocoUpdateCoordinator
-    from .excs_client import EXCSClient
-    from .roster import EXCSRosterEntry
+    from .excs.roster import EXCSRosterEntry
+    from .excs_client import EXCSHassClient
 
 
 async def async_setup_entry(
@@ -31,14 +34,26 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     client = data["client"]
     coordinators = data["coordinators"]
-    entities = []
+    async_add_entities(
+        [
+            EXCSResponseTimeSensor(client),
+            EXCSLinkLatencySensor(client),
+            EXCSLocoSlotsSensor(client),
+            EXCSRecoveryTimeSensor(client),
+        ]
+    )
 
-    # Add locomotive speed/direction sensor entities
-    for loco in client.roster_entries:
-        coordinator = coordinators[loco.id]
-        entities.append(LocoSpeedSensor(client, coordinator, loco))
-    if entities:
-        async_add_entities(entities)
+    @callback
+    def async_add_loco_entities() -> None:
+        """Add locomotive speed/direction sensors once the roster is discovered."""
+        entities = [
+            LocoSpeedSensor(client, coordinators[loco.id], loco)
+            for loco in client.roster_entries
+        ]
+        if entities:
+            async_add_entities(entities)
+
+    async_add_when_ready(entry, client, async_add_loco_entities)
 
 
 class LocoSpeedSensor(EXCSRosterEntity, SensorEntity):
@@ -46,7 +61,7 @@ class LocoSpeedSensor(EXCSRosterEntity, SensorEntity):
 
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         loco: EXCSRosterEntry,
     ) -> None:
@@ -76,3 +91,131 @@ class LocoSpeedSensor(EXCSRosterEntity, SensorEntity):
             "direction": str(self._loco.direction),
             "description": self._loco.description,
         }
+
+
+class EXCSResponseTimeSensor(EXCSEntity, SensorEntity):
+    """Smoothed round-trip time of requests to the EX-CommandStation."""
+
+    # The estimate changes with every response, so it is sampled periodically
+    _attr_should_poll = True
+
+    def __init__(self, client: EXCSHassClient) -> None:
+        """Initialize the response time sensor entity."""
+        super().__init__(client)
+        self._attr_name = "Response time"
+
+        # Set entity properties
+        self.entity_description = SensorEntityDescription(
+            key="response_time",
+            icon="mdi:timer-sync-outline",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._attr_unique_id = f"{client.entry_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the smoothed round-trip time in milliseconds."""
+        return self._client.rtt.stats["srtt_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the variance, current timeout and retry counters."""
+        return self._client.rtt.stats
+
+
+class EXCSHeartbeatSensor(EXCSEntity, SensorEntity):
+    """Base class for sensors updated by keep-alive probes."""
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        await super().async_added_to_hass()
+        self._unsub_callbacks.append(
+            self._client.register_signal_handler(
+                SIGNAL_HEARTBEAT, self.async_write_ha_state
+            )
+        )
+
+
+class EXCSLinkLatencySensor(EXCSHeartbeatSensor):
+    """Median round-trip time of keep-alive probes."""
+
+    def __init__(self, client: EXCSHassClient) -> None:
+        """Initialize the link latency sensor entity."""
+        super().__init__(client)
+        self._attr_name = "Link latency"
+
+        # Set entity properties
+        self.entity_description = SensorEntityDescription(
+            key="link_latency",
+            icon="mdi:lan-pending",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._attr_unique_id = f"{client.entry_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median probe round-trip time in milliseconds."""
+        return self._client.heartbeat_latencies.stats["p50_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the latest sample, percentiles and unanswered probes."""
+        return self._client.heartbeat_latencies.stats
+
+
+class EXCSLocoSlotsSensor(EXCSHeartbeatSensor):
+    """Number of loco slots reported by the EX-CommandStation."""
+
+    def __init__(self, client: EXCSHassClient) -> None:
+        """Initialize the loco slots sensor entity."""
+        super().__init__(client)
+        self._attr_name = "Loco slots"
+
+        # Set entity properties
+        self.entity_description = SensorEntityDescription(
+            key="loco_slots",
+            icon="mdi:train-car",
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._attr_unique_id = f"{client.entry_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of loco slots."""
+        return self._client.loco_slots
+
+
+class EXCSRecoveryTimeSensor(EXCSEntity, SensorEntity):
+    """Time it took to reconnect after the last loss of the link."""
+
+    def __init__(self, client: EXCSHassClient) -> None:
+        """Initialize the recovery time sensor entity."""
+        super().__init__(client)
+        self._attr_name = "Recovery time"
+
+        # Set entity properties
+        self.entity_description = SensorEntityDescription(
+            key="recovery_time",
+            icon="mdi:lan-connect",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+        self._attr_unique_id = f"{client.entry_id}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the last time to recover in seconds."""
+        return self._client.reconnect_stats["last_recovery_s"]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the worst time to recover and the number of reconnects."""
+        return self._client.reconnect_stats
@@ -7,11 +7,11 @@ from typing import TYPE_CHECKING, Any
 from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
 from homeassistant.core import callback
 
-from .const import DOMAIN, LOGGER, SIGNAL_DATA_PUSHED
-from .entity import EXCSEntity, EXCSRosterEntity
+from .const import DOMAIN, LOGGER
+from .entity import EXCSEntity, EXCSRosterEntity, async_add_when_ready
+from .excs.roster import EXCSLocoFunction, EXCSLocoFunctionCmd, EXCSRosterEntry
+from .excs.turnout import EXCSTurnout, EXCSTurnoutState
 from .icons_helper import get_function_icon
-from .roster import EXCSLocoFunction, EXCSLocoFunctionCmd, EXCSRosterEntry
-from .turnout import EXCSTurnout, EXCSTurnoutState
 
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
@@ -19,16 +19,17 @@ if TYPE_CHECKING:
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from .coordinator import LocoUpdateCoordinator
-    from .excs_client import EXCSClient
+    from .excs.messages import EXCSMessage
+    from .excs_client import EXCSHassClient
 
 
-from .commands import (
-    CMD_TRACKS_OFF,
-    CMD_TRACKS_ON,
-    RESP_TRACKS_OFF,
-    RESP_TRACKS_ON,
+from .excs.commands import (
+    OPCODE_POWER,
+    OPCODE_TURNOUT_STATE,
+    TRACKS_OFF_FRAME,
+    TRACKS_ON_FRAME,
 )
-from .excs_client import EXCSError
+from .excs.excs_exceptions import EXCSError
 
 
 async def async_setup_entry(
@@ -42,32 +43,44 @@ async def async_setup_entry(
     # Add tracks power switch
     async_add_entities([TracksPowerSwitch(client)])
 
-    # Add turnout switches
-    if client.turnouts:
-        turnout_switches = [
-            TurnoutSwitch(client, turnout) for turnout in client.turnouts
-        ]
-        async_add_entities(turnout_switches)
-
-    # Add locomotive function switches
-    entities = []
-    for loco in client.roster_entries:
-        coordinator = coordinators[loco.id]
-        entities.extend(
-            [
-                LocoFunctionSwitch(client, coordinator, loco, function)
-                for function in loco.functions.values()
+    @callback
+    def async_add_object_entities() -> None:
+        """Add turnout and function switches once the station is discovered."""
+        # Add turnout switches
+        if client.turnouts:
+            turnout_switches = [
+                TurnoutSwitch(client, turnout) for turnout in client.turnouts
             ]
-        )
-    if entities:
-        async_add_entities(entities)
+            async_add_entities(turnout_switches)
+
+        # Add locomotive function switches
+        entities = []
+        for loco in client.roster_entries:
+            coordinator = coordinators[loco.id]
+            entities.extend(
+                [
+                    LocoFunctionSwitch(client, coordinator, loco, function)
+                    for function in loco.functions.values()
+                ]
+            )
+        if entities:
+            async_add_entities(entities)
+
+    async_add_when_ready(entry, client, async_add_object_entities)
 
 
 class EXCSSwitchEntity(EXCSEntity, SwitchEntity):
     """Base class for EX-CommandStation switch entities."""
 
+    # Power and turnout commands are journaled while disconnected
+    _journaled_commands = True
+
+    # Opcode and object ID of the pushed messages this entity subscribes to
+    _push_opcode: str
+    _push_object_id: int | None = None
+
     @callback
-    def _handle_push(self, message: str) -> None:
+    def _handle_push(self, message: EXCSMessage) -> None:
         """Abstract method to handle incoming messages from the EX-CommandStation."""
         raise NotImplementedError
 
@@ -75,14 +88,18 @@ class EXCSSwitchEntity(EXCSEntity, SwitchEntity):
         """Register data push callbacks."""
         await super().async_added_to_hass()
         self._unsub_callbacks.append(
-            self._client.register_signal_handler(SIGNAL_DATA_PUSHED, self._handle_push)
+            self._client.register_push_handler(
+                self._push_opcode, self._handle_push, self._push_object_id
+            )
         )
 
 
 class TracksPowerSwitch(EXCSSwitchEntity):
     """Representation of the EX-CommandStation tracks power switch."""
 
-    def __init__(self, client: EXCSClient) -> None:
+    _push_opcode = OPCODE_POWER
+
+    def __init__(self, client: EXCSHassClient) -> None:
         """Initialize the switch."""
         super().__init__(client)
 
@@ -98,28 +115,29 @@ class TracksPowerSwitch(EXCSSwitchEntity):
         self._attr_is_on = client.initial_tracks_state
 
     @callback
-    def _handle_push(self, message: str) -> None:
-        """Handle incoming messages from the EX-CommandStation."""
-        if message == RESP_TRACKS_ON:
-            LOGGER.debug("Tracks power ON")
-            self._attr_is_on = True
-            self.async_write_ha_state()
-        elif message == RESP_TRACKS_OFF:
-            LOGGER.debug("Tracks power OFF")
-            self._attr_is_on = False
-            self.async_write_ha_state()
+    def _handle_push(self, message: EXCSMessage) -> None:
+        """Handle power messages from the EX-CommandStation."""
+        match message.args:
+            case (1,):
+                LOGGER.debug("Tracks power ON")
+                self._attr_is_on = True
+                self.async_write_ha_state()
+            case (0,):
+                LOGGER.debug("Tracks power OFF")
+                self._attr_is_on = False
+                self.async_write_ha_state()
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch."""
         try:
-            await self._client.send_command(CMD_TRACKS_ON)
+            await self._client.send_emergency(TRACKS_ON_FRAME)
         except EXCSError:
             LOGGER.exception("Failed to turn ON tracks power")
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off the switch."""
         try:
-            await self._client.send_command(CMD_TRACKS_OFF)
+            await self._client.send_emergency(TRACKS_OFF_FRAME)
         except EXCSError:
             # Handle the error if needed
             LOGGER.exception("Failed to turn OFF tracks power")
@@ -128,10 +146,13 @@ class TracksPowerSwitch(EXCSSwitchEntity):
 class TurnoutSwitch(EXCSSwitchEntity):
     """Representation of a turnout switch."""
 
-    def __init__(self, client: EXCSClient, turnout: EXCSTurnout) -> None:
+    _push_opcode = OPCODE_TURNOUT_STATE
+
+    def __init__(self, client: EXCSHassClient, turnout: EXCSTurnout) -> None:
         """Initialize the switch."""
         super().__init__(client)
         self._turnout = turnout
+        self._push_object_id = turnout.id
 
         # Set entity properties
         self._attr_name = turnout.description
@@ -150,15 +171,15 @@ class TurnoutSwitch(EXCSSwitchEntity):
         return {"dcc_id": self._turnout.id}
 
     @callback
-    def _handle_push(self, message: str) -> None:
-        """Handle incoming messages from the EX-CommandStation."""
-        if message.startswith(self._turnout.recv_prefix):
-            turnout_id, state = EXCSTurnout.parse_turnout_state(message)
-            if turnout_id == self._turnout.id:  # Double-check the turnout ID
-                LOGGER.debug("Turnout %d %s", turnout_id, state.name)
-                # Update the state of the switch
-                self._attr_is_on = state == EXCSTurnoutState.THROWN
-                self.async_write_ha_state()
+    def _handle_push(self, message: EXCSMessage) -> None:
+        """Handle state messages routed to this turnout."""
+        turnout_id, state = EXCSTurnout.parse_turnout_state(message)
+        if turnout_id == self._turnout.id:  # Double-check the turnout ID
+            LOGGER.debug("Turnout %d %s", turnout_id, state.name)
+            # Update the state of the turnout and the switch
+            self._turnout.state = state
+            self._attr_is_on = state == EXCSTurnoutState.THROWN
+            self.async_write_ha_state()
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the switch (set turnout to THROWN)."""
@@ -188,9 +209,11 @@ class TurnoutSwitch(EXCSSwitchEntity):
 class LocoFunctionSwitch(EXCSRosterEntity, SwitchEntity):
     """Representation of a locomotive function switch."""
 
+    _journaled_commands = True
+
     def __init__(
         self,
-        client: EXCSClient,
+        client: EXCSHassClient,
         coordinator: LocoUpdateCoordinator,
         loco: EXCSRosterEntry,
         function: EXCSLocoFunction,
@@ -0,0 +1 @@
+"""Tests of the EX-HABridge integration and its protocol stack."""
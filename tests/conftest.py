@@ -0,0 +1,23 @@
+"""
+Shared setup of the EX-HABridge tests.
+
+The tests of the protocol stack import the Home Assistant independent
+``excs`` package on its own, like the benchmarks do, so they run without
+Home Assistant installed. The integration tests need
+``pytest-homeassistant-custom-component`` and are skipped without it.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "custom_components" / "ex_habridge"))
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Run coroutine tests and fixtures, as Home Assistant tests expect."""
+    config.option.asyncio_mode = "auto"
@@ -0,0 +1 @@
+"""Tests of the Home Assistant independent protocol stack."""
@@ -0,0 +1,13 @@
+"""Fixtures of the protocol stack tests."""
+
+import contextlib
+
+import pytest
+
+
+@pytest.fixture
+def loopback(request: pytest.FixtureRequest) -> None:
+    """Allow connections to the stand-in station where sockets are blocked."""
+    # Only the Home Assistant test plugin blocks sockets
+    with contextlib.suppress(pytest.FixtureLookupError):
+        request.getfixturevalue("socket_enabled")
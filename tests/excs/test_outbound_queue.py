@@ -0,0 +1,62 @@
+"""Tests of the coalescing outbound queue."""
+
+import asyncio
+
+from excs.outbound_queue import (
+    MAX_BACKGROUND_FRAMES_PER_WRITE,
+    EXCSCommandPriority,
+    EXCSOutboundQueue,
+)
+
+
+class _Protocol:
+    """Stream protocol recording the writes, whose transport never fills up."""
+
+    writing_paused = False
+
+    def __init__(self) -> None:
+        """Initialize without writes."""
+        self.writes: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        """Record a write."""
+        self.writes.append(data)
+
+    async def drain(self) -> None:
+        """Return at once, the transport buffer is never full."""
+
+
+def test_background_sender_released_under_continuous_traffic() -> None:
+    """A background sender returns once its frame is written, not the whole lane."""
+
+    async def run() -> None:
+        queue = EXCSOutboundQueue()
+        protocol = _Protocol()
+        queue.attach(protocol)  # type: ignore[arg-type]
+        senders: set[asyncio.Future[None]] = set()
+
+        async def flood() -> None:
+            # Queue more than one write worth of frames every iteration
+            while True:
+                for _ in range(2 * MAX_BACKGROUND_FRAMES_PER_WRITE):
+                    sender = asyncio.ensure_future(
+                        queue.send(b"<R 1>", EXCSCommandPriority.BACKGROUND)
+                    )
+                    senders.add(sender)
+                    sender.add_done_callback(senders.discard)
+                await asyncio.sleep(0)
+
+        flooding = asyncio.create_task(flood())
+        await asyncio.sleep(0.01)
+        try:
+            await asyncio.wait_for(
+                queue.send(b"<R 3>", EXCSCommandPriority.BACKGROUND), 1
+            )
+        finally:
+            flooding.cancel()
+            queue.detach(ConnectionResetError())
+
+        assert any(b"<R 3>" in data for data in protocol.writes)
+        assert queue.frames_per_write == MAX_BACKGROUND_FRAMES_PER_WRITE
+
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+"""Tests of the round-trip time measured for requests."""
+
+import asyncio
+
+import pytest
+from excs.const import MIN_RESPONSE_TIMEOUT
+from excs.excs_client import EXCSClient
+
+from benchmarks.standin import StandInStation
+
+LATENCY = 0.05
+REQUESTS = 40
+
+
+@pytest.mark.usefixtures("loopback")
+def test_rto_follows_station_latency_under_batched_load() -> None:
+    """Time spent draining a full transport buffer is not measured as round trip."""
+
+    async def run() -> None:
+        station = StandInStation(locos=REQUESTS, latency=LATENCY)
+        server = await station.start()
+        client = EXCSClient("127.0.0.1", server.sockets[0].getsockname()[1])
+        try:
+            await client.connect()
+            async with asyncio.timeout(10):
+                while client.rtt.samples == 0:  # noqa: ASYNC110
+                    await asyncio.sleep(0.01)
+
+            # Hold the writers as if the transport buffer were full: the
+            # requests are written and answered, but their senders are only
+            # released once it drained
+            protocol = client._protocol  # noqa: SLF001
+            protocol.pause_writing()
+            requests = asyncio.gather(
+                *(
+                    client.await_command_response(f"JR {cab}", "jR", retries=0)
+                    for cab in station.roster
+                )
+            )
+            await asyncio.sleep(4 * MIN_RESPONSE_TIMEOUT)
+            protocol.resume_writing()
+            await requests
+
+            assert client.rtt.timeouts == 0
+            assert LATENCY <= client.rtt.srtt < MIN_RESPONSE_TIMEOUT
+            assert client.rtt.response_timeout < 2 * MIN_RESPONSE_TIMEOUT
+        finally:
+            await client.disconnect()
+            await station.stop(server)
+
+    asyncio.run(run())
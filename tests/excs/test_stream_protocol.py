@@ -0,0 +1,67 @@
+"""Tests of the frame parser of the EX-CommandStation stream."""
+
+import pytest
+from excs.stream_protocol import EXCSFrameParser
+
+from benchmarks.standin import StandInStation
+
+ROSTER_FRAME = b'<jR 3 "Loco <3>" "Lights/*Horn/Bell > Whistle">\n'
+TURNOUT_FRAME = b'<jT 1 C "Yard > main <north>">\n'
+DIAGNOSTIC_FRAME = b"<* Turnout <T 1 C> changed > 1 ms *>\n"
+
+
+@pytest.mark.parametrize(
+    ("data", "frames"),
+    [
+        (ROSTER_FRAME, ['jR 3 "Loco <3>" "Lights/*Horn/Bell > Whistle"']),
+        (TURNOUT_FRAME, ['jT 1 C "Yard > main <north>"']),
+        (DIAGNOSTIC_FRAME, ["* Turnout <T 1 C> changed > 1 ms *"]),
+        (
+            b"<p1>" + TURNOUT_FRAME.strip() + DIAGNOSTIC_FRAME + b"<H 1 0>",
+            [
+                "p1",
+                'jT 1 C "Yard > main <north>"',
+                "* Turnout <T 1 C> changed > 1 ms *",
+                "H 1 0",
+            ],
+        ),
+    ],
+)
+def test_quoted_and_diagnostic_text(data: bytes, frames: list[str]) -> None:
+    """Angle brackets in quoted or diagnostic text do not end the frame."""
+    assert EXCSFrameParser().feed(data) == frames
+
+
+def test_frames_split_inside_quoted_text() -> None:
+    """The quote state survives reads ending inside quoted text."""
+    parser = EXCSFrameParser()
+    data = ROSTER_FRAME + TURNOUT_FRAME + DIAGNOSTIC_FRAME
+    frames = [frame for byte in data for frame in parser.feed(bytes([byte]))]
+    assert frames == EXCSFrameParser().feed(data)
+    assert len(frames) == 3  # noqa: PLR2004
+
+
+def test_standin_roster_frames() -> None:
+    """Roster frames as sent by a station parse into their quoted fields."""
+    station = StandInStation(locos=2)
+    replies = [
+        reply for cab in station.roster for reply in station.reply(f"JR {cab}")[0]
+    ]
+    data = "".join(f"<{reply}>\n" for reply in replies).encode()
+    assert EXCSFrameParser().feed(data) == replies
+
+
+@pytest.mark.parametrize(
+    ("data", "frames"),
+    [
+        # A frame truncated before its end is dropped for the next one
+        (b"<H 1<p1>\n", ["p1"]),
+        # A frame truncated inside quoted text ends with its line
+        (b'<jR 3 "Loco\n<p1>\n<H 1 0>\n', ["p1", "H 1 0"]),
+        # So does a truncated diagnostic frame
+        (b"<* Turnout <T 1 C>\n<p1>\n", ["p1"]),
+    ],
+)
+def test_resynchronize_after_truncated_frame(data: bytes, frames: list[str]) -> None:
+    """A truncated frame cannot swallow the frames following it."""
+    assert EXCSFrameParser().feed(data) == frames
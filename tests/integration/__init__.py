@@ -0,0 +1 @@
+"""Tests of the integration running in Home Assistant."""
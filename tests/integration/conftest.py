@@ -0,0 +1,9 @@
+"""Fixtures of the integration tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:  # noqa: ARG001
+    """Load the integration from the custom_components directory."""
+    return
@@ -0,0 +1,77 @@
+"""Tests of commands issued through entities while the station is unreachable."""
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_HOST,
+    CONF_PORT,
+    SERVICE_TURN_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from benchmarks.standin import StandInStation
+from custom_components.ex_habridge.const import DOMAIN
+from custom_components.ex_habridge.excs.const import CONF_OFFLINE_JOURNAL
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    """Wait until the condition holds, polling the state of the stand-in station."""
+    async with asyncio.timeout(10):
+        while not condition():  # noqa: ASYNC110
+            await asyncio.sleep(0.05)
+
+
+async def test_turnout_command_during_drop_is_replayed(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+) -> None:
+    """A turnout thrown while the link is down is thrown once it is back."""
+    station = StandInStation(locos=1, turnouts=1, routes=0)
+    server = await station.start()
+    port = server.sockets[0].getsockname()[1]
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: port},
+        options={CONF_OFFLINE_JOURNAL: True},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    await _wait_for(client.ready.is_set)
+    await hass.async_block_till_done()
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        SWITCH_DOMAIN, DOMAIN, f"{entry.entry_id}_turnout_1"
+    )
+    assert entity_id is not None
+
+    # Drop the link and keep the station unreachable
+    await station.stop(server)
+    await _wait_for(lambda: not client.connected)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_id).state != STATE_UNAVAILABLE
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN, SERVICE_TURN_ON, {ATTR_ENTITY_ID: entity_id}, blocking=True
+    )
+    assert station.turnouts[1] == 0
+    assert client.journal.stats["pending"] == 1
+
+    # The journaled command is sent once the client reconnects
+    server = await station.start(port=port)
+    await _wait_for(lambda: station.turnouts[1] == 1)
+    assert client.journal.stats["replayed"] == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await station.stop(server)